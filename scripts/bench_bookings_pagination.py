@@ -0,0 +1,107 @@
+"""
+Page latency for GET /bookings: OFFSET (legacy) vs keyset cursor, at increasing depth.
+
+Usage:
+    python scripts/bench_bookings_pagination.py --rows 1000000 --depths 0 1000 10000 100000 500000
+
+Seeds synthetic bookings (tagged with a bench email domain) into the configured
+Postgres with one INSERT ... SELECT generate_series, runs the same statements
+the route builds, and deletes the rows afterwards unless --keep is given.
+"""
+
+import argparse
+import asyncio
+import pathlib
+import sys
+import time
+
+import numpy as np
+from sqlalchemy import text
+
+# Make imports work whether run as `python -m scripts.bench_bookings_pagination` or directly
+sys.path.append(str(pathlib.Path(__file__).resolve().parents[1]))
+
+from src.api.routes.bookings import page_query  # noqa: E402
+from src.db.session import AsyncSessionLocal, engine  # noqa: E402
+
+BENCH_DOMAIN = "@pagination-bench.invalid"
+
+_SEED = text(f"""
+    INSERT INTO bookings (id, customer_name, customer_email, starts_at, ends_at, status,
+                          created_at, updated_at)
+    SELECT gen_random_uuid(), 'bench', 'u' || (g % 1000) || '{BENCH_DOMAIN}',
+           now() + g * interval '1 hour', now() + g * interval '1 hour' + interval '30 minutes',
+           'pending', now() - g * interval '1 second', now()
+    FROM generate_series(:first, :last) AS g
+    """)
+
+
+async def _seed(rows: int) -> None:
+    async with AsyncSessionLocal() as db:
+        existing = await db.scalar(
+            text("SELECT count(*) FROM bookings WHERE customer_email LIKE :d"),
+            {"d": f"%{BENCH_DOMAIN}"},
+        )
+        if existing < rows:
+            started = time.perf_counter()
+            # Hour-spaced 30-minute slots continue after any earlier seed, so they never
+            # trip ex_bookings_no_overlap
+            await db.execute(_SEED, {"first": existing + 1, "last": rows})
+            await db.execute(text("ANALYZE bookings"))
+            await db.commit()
+            print(f"seeded {rows - existing} rows in {time.perf_counter() - started:.1f}s")
+
+
+async def _time_page(stmt, repeat: int) -> tuple[np.ndarray, list]:
+    lat, rows = [], []
+    async with AsyncSessionLocal() as db:
+        for _ in range(repeat):
+            started = time.perf_counter()
+            rows = list((await db.execute(stmt)).scalars())
+            lat.append((time.perf_counter() - started) * 1000.0)
+    return np.array(lat), rows
+
+
+async def _cursor_at(depth: int, limit: int):
+    """(created_at, id) of the row just before `depth` (found once, outside the timing)."""
+    if depth == 0:
+        return None
+    async with AsyncSessionLocal() as db:
+        row = (await db.execute(page_query(0, offset=depth - 1).limit(1))).scalars().one()
+        return row.created_at, row.id
+
+
+async def main() -> None:
+    ap = argparse.ArgumentParser(description=__doc__)
+    ap.add_argument("--rows", type=int, default=1_000_000)
+    ap.add_argument("--limit", type=int, default=50)
+    ap.add_argument("--depths", type=int, nargs="+", default=[0, 1_000, 10_000, 100_000, 500_000])
+    ap.add_argument("--repeat", type=int, default=20)
+    ap.add_argument("--keep", action="store_true", help="leave the seeded rows in place")
+    args = ap.parse_args()
+
+    try:
+        await _seed(args.rows)
+        print(f"{'depth':>9}  {'offset p50':>11} {'p99':>9}  {'cursor p50':>11} {'p99':>9}")
+        for depth in [d for d in args.depths if d < args.rows]:
+            off_lat, off_rows = await _time_page(page_query(args.limit, offset=depth), args.repeat)
+            cur_lat, cur_rows = await _time_page(
+                page_query(args.limit, await _cursor_at(depth, args.limit)), args.repeat
+            )
+            assert [r.id for r in off_rows] == [r.id for r in cur_rows], "pages differ"
+            o50, o99 = np.percentile(off_lat, [50, 99])
+            c50, c99 = np.percentile(cur_lat, [50, 99])
+            print(f"{depth:>9}  {o50:>9.2f}ms {o99:>7.2f}ms  {c50:>9.2f}ms {c99:>7.2f}ms")
+    finally:
+        if not args.keep:
+            async with AsyncSessionLocal() as db:
+                await db.execute(
+                    text("DELETE FROM bookings WHERE customer_email LIKE :d"),
+                    {"d": f"%{BENCH_DOMAIN}"},
+                )
+                await db.commit()
+        await engine.dispose()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
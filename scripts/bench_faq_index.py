@@ -0,0 +1,84 @@
+"""
+Recall-vs-latency benchmark: exact dense matmul vs the IVF ANN index.
+
+Usage:
+    python scripts/bench_faq_index.py --docs 50000 --dim 384 --queries 200 --k 5
+"""
+
+import argparse
+import pathlib
+import sys
+import time
+
+import numpy as np
+
+# Make imports work whether run as `python -m scripts.bench_faq_index` or directly
+sys.path.append(str(pathlib.Path(__file__).resolve().parents[1]))
+
+from src.ai.faq.index import ExactIndex, IVFIndex  # noqa: E402
+
+
+def _normalise(x: np.ndarray) -> np.ndarray:
+    return x / np.linalg.norm(x, axis=1, keepdims=True)
+
+
+def _synthetic_corpus(n: int, dim: int, topics: int, rng) -> np.ndarray:
+    # Clustered data behaves more like real FAQ/knowledge-base embeddings than pure noise
+    centres = rng.normal(size=(topics, dim))
+    docs = centres[rng.integers(0, topics, size=n)] + 0.6 * rng.normal(size=(n, dim))
+    return _normalise(docs).astype("float32")
+
+
+def _timed(index, queries: np.ndarray, k: int, **kw) -> tuple[list, np.ndarray]:
+    results, lat = [], []
+    for q in queries:
+        started = time.perf_counter()
+        results.append(index.search(q[None, :], [k], **kw)[0])
+        lat.append((time.perf_counter() - started) * 1000.0)
+    return results, np.array(lat)
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description=__doc__)
+    ap.add_argument("--docs", type=int, default=50_000)
+    ap.add_argument("--dim", type=int, default=384)
+    ap.add_argument("--topics", type=int, default=500)
+    ap.add_argument("--queries", type=int, default=200)
+    ap.add_argument("--k", type=int, default=5)
+    ap.add_argument("--lists", type=int, default=None)
+    ap.add_argument("--probes", type=int, nargs="+", default=[1, 2, 4, 8, 16, 32])
+    ap.add_argument("--seed", type=int, default=0)
+    args = ap.parse_args()
+
+    rng = np.random.default_rng(args.seed)
+    docs = _synthetic_corpus(args.docs, args.dim, args.topics, rng)
+    picks = rng.integers(0, args.docs, size=args.queries)
+    queries = _normalise(docs[picks] + 0.3 * rng.normal(size=(args.queries, args.dim)))
+    queries = queries.astype("float32")
+
+    started = time.perf_counter()
+    ivf = IVFIndex.build(docs, n_lists=args.lists)
+    build_s = time.perf_counter() - started
+    print(f"Docs: {args.docs}  dim: {args.dim}  queries: {args.queries}  k: {args.k}")
+    print(f"IVF build: {build_s:.2f}s  lists: {ivf.n_lists}")
+
+    exact_hits, exact_lat = _timed(ExactIndex(docs), queries, args.k)
+    truth = [{i for i, _ in hits} for hits in exact_hits]
+    print(f"\n{'backend':<14}{'recall@k':>10}{'p50 ms':>10}{'p95 ms':>10}")
+    print(
+        f"{'exact':<14}{1.0:>10.3f}"
+        f"{np.percentile(exact_lat, 50):>10.3f}{np.percentile(exact_lat, 95):>10.3f}"
+    )
+    for probe in args.probes:
+        hits, lat = _timed(ivf, queries, args.k, n_probe=probe)
+        recall = np.mean(
+            [len({i for i, _ in h} & t) / len(t) for h, t in zip(hits, truth, strict=True)]
+        )
+        print(
+            f"{f'ivf/probe={probe}':<14}{recall:>10.3f}"
+            f"{np.percentile(lat, 50):>10.3f}{np.percentile(lat, 95):>10.3f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
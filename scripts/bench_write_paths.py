@@ -0,0 +1,117 @@
+"""
+Write-path latency against a local Postgres: old pattern (flush + commit + refresh)
+vs the current one (INSERT/UPDATE ... RETURNING via eager_defaults, no refresh).
+
+Usage:
+    python scripts/bench_write_paths.py --n 500
+
+Uses the app's DB settings (.env / APP_DB_*). Rows it creates are deleted at the end.
+"""
+
+import argparse
+import asyncio
+import pathlib
+import sys
+import time
+import uuid
+from datetime import UTC, datetime, timedelta
+
+import numpy as np
+from sqlalchemy import delete, event
+
+# Make imports work whether run as `python -m scripts.bench_write_paths` or directly
+sys.path.append(str(pathlib.Path(__file__).resolve().parents[1]))
+
+from src.ai.sentiment import classify  # noqa: E402
+from src.db.models.booking import Booking  # noqa: E402
+from src.db.models.sentiment import Sentiment  # noqa: E402
+from src.db.session import AsyncSessionLocal, engine  # noqa: E402
+
+_STATEMENTS = 0
+
+
+def _count(*_args) -> None:
+    global _STATEMENTS
+    _STATEMENTS += 1
+
+
+async def _sentiment(legacy: bool, created: list) -> None:
+    text = "Support was helpful and great value."
+    result = classify(text)
+    async with AsyncSessionLocal() as db:
+        row = Sentiment(text=text, score=result.score, label=result.label)
+        db.add(row)
+        if legacy:
+            await db.flush()
+        await db.commit()
+        if legacy:
+            await db.refresh(row)
+        created.append(row.id)
+
+
+async def _booking(legacy: bool, created: list) -> None:
+    starts = datetime.now(UTC) + timedelta(days=365, seconds=len(created))
+    async with AsyncSessionLocal() as db:
+        obj = Booking(
+            customer_name="Bench",
+            customer_email="bench@example.com",
+            starts_at=starts,
+            ends_at=starts + timedelta(minutes=1),
+        )
+        db.add(obj)
+        await db.flush()
+        if legacy:
+            await db.refresh(obj)
+        obj.notes = "updated"
+        await db.flush()
+        if legacy:
+            await db.refresh(obj)
+        await db.commit()
+        created.append(obj.id)
+
+
+async def _run(name: str, op, n: int, warmup: int) -> list:
+    global _STATEMENTS
+    created: list = []
+    print(f"{name}")
+    for legacy in (True, False):
+        for _ in range(warmup):
+            await op(legacy, created)
+        lat = []
+        _STATEMENTS = 0
+        for _ in range(n):
+            started = time.perf_counter()
+            await op(legacy, created)
+            lat.append((time.perf_counter() - started) * 1000.0)
+        p50, p99 = np.percentile(lat, [50, 99])
+        label = "flush+refresh (before)" if legacy else "RETURNING (after)    "
+        print(
+            f"  {label}  p50={p50:6.2f} ms  p99={p99:6.2f} ms  "
+            f"statements/op={_STATEMENTS / n:.1f}"
+        )
+    return created
+
+
+async def main() -> None:
+    ap = argparse.ArgumentParser(description=__doc__)
+    ap.add_argument("--n", type=int, default=500)
+    ap.add_argument("--warmup", type=int, default=20)
+    args = ap.parse_args()
+
+    event.listen(engine.sync_engine, "before_cursor_execute", _count)
+    sentiment_ids: list[uuid.UUID] = []
+    booking_ids: list[uuid.UUID] = []
+    try:
+        sentiment_ids = await _run("POST /sentiment", _sentiment, args.n, args.warmup)
+        booking_ids = await _run("POST + PATCH /bookings", _booking, args.n, args.warmup)
+    finally:
+        event.remove(engine.sync_engine, "before_cursor_execute", _count)
+        async with AsyncSessionLocal() as db:
+            await db.execute(delete(Sentiment).where(Sentiment.id.in_(sentiment_ids)))
+            await db.execute(delete(Booking).where(Booking.id.in_(booking_ids)))
+            await db.commit()
+        await engine.dispose()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -1,13 +1,42 @@
 # scripts/check_indexes.py
+"""
+List indexes on the hot tables, then EXPLAIN (ANALYZE, BUFFERS) every query the
+bookings endpoints issue and fail if any of them sequentially scans more than
+--max-seq-rows rows (i.e. an access path lost its index). Each query is checked
+twice: with its parameter values visible to the planner (custom plan), and as
+the generic plan asyncpg's prepared statements switch to after a few runs.
+
+Usage:
+    python scripts/check_indexes.py                     # list + check, exit 1 on a bad plan
+    python scripts/check_indexes.py --max-seq-rows 5000
+    python scripts/check_indexes.py --list-only
+
+Plans depend on table size and statistics: run it against a database with
+realistic volume (e.g. after scripts/bench_bookings_pagination.py --keep).
+"""
+
 from __future__ import annotations
 
+import argparse
 import asyncio
 import os
+import pathlib
+import sys
+import uuid
+from datetime import UTC, datetime
 
 import sqlalchemy as sa
-from sqlalchemy.ext.asyncio import create_async_engine
+from sqlalchemy.ext.asyncio import AsyncConnection, create_async_engine
 
-TABLE = "sentiment"
+# Make imports work whether run as `python -m scripts.check_indexes` or directly
+sys.path.append(str(pathlib.Path(__file__).resolve().parents[1]))
+
+from src.api.routes.bookings import page_query  # noqa: E402
+from src.db.models.booking import Booking, BookingStatus  # noqa: E402
+from src.db.query_plans import explain, explain_generic, scans, seq_scans_over  # noqa: E402
+
+TABLES = ("sentiment", "bookings")
+PAGE = 50
 
 
 def _resolve_db_url() -> str:
@@ -25,7 +54,60 @@ def _resolve_db_url() -> str:
     return f"postgresql+asyncpg://{user}:{pw}@{host}:{port}/{name}"
 
 
-async def main() -> None:
+async def _booking_queries(conn: AsyncConnection) -> dict[str, sa.Select]:
+    """The statements GET /bookings[/{id}] runs, with parameters taken from real rows."""
+    sample = (
+        await conn.execute(
+            sa.select(Booking.id, Booking.customer_email, Booking.created_at)
+            .order_by(Booking.created_at.desc(), Booking.id.desc())
+            .offset(PAGE)
+            .limit(1)
+        )
+    ).first()
+    if sample is None:  # (almost) empty table: any plan is fine, but still exercise them
+        sample = (uuid.uuid4(), "nobody@example.com", datetime.now(UTC))
+    booking_id, email, created_at = sample
+    cursor = (created_at, booking_id)
+
+    queries = {
+        "get by id": sa.select(Booking).where(Booking.id == booking_id),
+        "list": page_query(PAGE),
+        "list, cursor": page_query(PAGE, cursor),
+        "list ?email": page_query(PAGE, email=email),
+        "list ?email, cursor": page_query(PAGE, cursor, email=email),
+    }
+    for s in BookingStatus:
+        queries[f"list ?status={s.value}"] = page_query(PAGE, status_=s)
+        queries[f"list ?status={s.value}, cursor"] = page_query(PAGE, cursor, status_=s)
+        queries[f"list ?email&status={s.value}"] = page_query(PAGE, email=email, status_=s)
+    return queries
+
+
+async def _check_plans(conn: AsyncConnection, max_seq_rows: int) -> int:
+    failures = 0
+    print(f"\nPlans (seq scans over {max_seq_rows} rows fail):")
+    checks = [
+        (f"{name} [{mode}]", stmt, run)
+        for name, stmt in (await _booking_queries(conn)).items()
+        for mode, run in (("custom", explain), ("generic", explain_generic))
+    ]
+    for name, stmt, run in checks:
+        doc = await run(conn, stmt)
+        plan = doc["Plan"]
+        bad = seq_scans_over(plan, max_seq_rows)
+        failures += bool(bad)
+        used = ", ".join(
+            f"{s.node_type}({s.index or s.relation}) rows={s.rows}" for s in scans(plan)
+        )
+        buffers = plan.get("Shared Hit Blocks", 0) + plan.get("Shared Read Blocks", 0)
+        print(
+            f"{'FAIL' if bad else 'ok':<4} {name:<42} {doc.get('Execution Time', 0.0):>8.2f}ms "
+            f"buffers={buffers:<6} {used}"
+        )
+    return failures
+
+
+async def main(max_seq_rows: int, list_only: bool) -> int:
     db_url = _resolve_db_url()
     engine = create_async_engine(db_url, future=True)
     try:
@@ -33,15 +115,33 @@ async def main() -> None:
 
             def _inspect(sync_conn):
                 insp = sa.inspect(sync_conn)
-                return insp.get_indexes(TABLE)
+                return {table: insp.get_indexes(table) for table in TABLES}
 
             indexes = await conn.run_sync(_inspect)
-        print(f"Indexes on '{TABLE}':")
-        for idx in indexes:
-            print(f"- name={idx.get('name')} columns={idx.get('column_names')}")
+            for table, idxs in indexes.items():
+                print(f"Indexes on '{table}':")
+                for idx in idxs:
+                    where = idx.get("dialect_options", {}).get("postgresql_where")
+                    print(
+                        f"- name={idx.get('name')} columns={idx.get('column_names')}"
+                        + (f" where={where}" if where is not None else "")
+                    )
+            if list_only:
+                return 0
+
+            failures = await _check_plans(conn, max_seq_rows)
+            await conn.rollback()  # EXPLAIN ANALYZE ran the queries; leave nothing behind
     finally:
         await engine.dispose()
 
+    if failures:
+        print(f"\n{failures} quer{'y' if failures == 1 else 'ies'} fell back to a seq scan")
+    return 1 if failures else 0
+
 
 if __name__ == "__main__":
-    asyncio.run(main())
+    ap = argparse.ArgumentParser(description=__doc__)
+    ap.add_argument("--max-seq-rows", type=int, default=1_000)
+    ap.add_argument("--list-only", action="store_true", help="only list indexes")
+    args = ap.parse_args()
+    raise SystemExit(asyncio.run(main(args.max_seq_rows, args.list_only)))
@@ -1,15 +1,105 @@
+import argparse
 import csv
 import pathlib
+import re
 import sys
 import time
 
 # Make imports work whether run as `python -m scripts.eval_rule_based` or directly
 sys.path.append(str(pathlib.Path(__file__).resolve().parents[1]))
 
-from src.ai.sentiment.rule_based import classify  # noqa: E402
+from src.ai.sentiment.preprocess import prepare  # noqa: E402
+from src.ai.sentiment.rule_based import (  # noqa: E402
+    NEG,
+    NEUTRAL_HINTS,
+    POS,
+    SentimentResult,
+    classify,
+)
+
+
+# --- Baseline: classify() as it was before the lexicon matcher / PreparedText work ---
+# Vendored so --repeat can show before/after; it reads the live lexicons, so both
+# sides score the same phrases. Not used anywhere else.
+def _baseline_normalise(text: str) -> str:
+    return " ".join(text.lower().split())
+
+
+def _baseline_tokenise(text: str) -> list[str]:
+    return re.findall(r"[a-z']+", text.lower())
+
+
+def _baseline_windowed_negation(text: str, window: int = 4) -> int:
+    t = _baseline_normalise(text)
+    tokens = _baseline_tokenise(text)
+    flips = sum(1 for w in POS if f"not {w}" in t)
+    try:
+        last_not_idx = max(i for i, tok in enumerate(tokens) if tok == "not")
+    except ValueError:
+        last_not_idx = -1
+    if last_not_idx != -1:
+        window_tokens = " ".join(tokens[max(0, last_not_idx - window) : last_not_idx])
+        if any(w in window_tokens for w in POS):
+            flips += 1
+    return flips
+
+
+def baseline_classify(text: str, neutral_band: float = 0.15) -> SentimentResult:
+    """The pre-change pipeline, default weights."""
+    t = _baseline_normalise(text)
+    pos_hits = sum(1 for w in POS if w in t)
+    neg_hits = sum(1 for w in NEG if w in t)
+    score = float(pos_hits - neg_hits)
+    flips = _baseline_windowed_negation(text)
+    if flips:
+        score -= flips + max(0.25, neutral_band + 0.05)
+    hedges = sum(1 for w in NEUTRAL_HINTS if w in t)
+    if " but " in f" {t} " or ", but" in t or "… but" in t:
+        hedges += 1
+    if hedges:
+        score *= 0.6
+    if pos_hits and neg_hits and abs(score) <= 2.0 * 0.6:
+        score *= 0.7
+    label = "neutral"
+    if score > neutral_band:
+        label = "positive"
+    elif score < -neutral_band:
+        label = "negative"
+    return SentimentResult(score=score, label=label)
+
+
+def _per_sample_us(fn, inputs, repeat: int) -> float:
+    """Best of 5 rounds (each `repeat` passes over `inputs`), in microseconds per sample."""
+    best = float("inf")
+    for _ in range(5):
+        start = time.perf_counter()
+        for _ in range(repeat):
+            for x in inputs:
+                fn(x)
+        best = min(best, time.perf_counter() - start)
+    return best * 1e6 / (len(inputs) * repeat)
+
+
+def bench(texts, repeat: int) -> dict[str, float]:
+    """Per-sample latency in microseconds: baseline, current on raw text, on prepared text."""
+    prepared = [prepare(t) for t in texts]
+    return {
+        "baseline": _per_sample_us(baseline_classify, texts, repeat),
+        "text": _per_sample_us(classify, texts, repeat),
+        "prepared": _per_sample_us(classify, prepared, repeat),
+    }
 
 
 def main():
+    parser = argparse.ArgumentParser(description="Evaluate the rule-based classifier.")
+    parser.add_argument(
+        "--repeat",
+        type=int,
+        default=0,
+        help="also run a microbenchmark over the devset this many times",
+    )
+    args = parser.parse_args()
+
     rows = list(csv.DictReader(open("data/sentiment/devset.csv")))
     start = time.perf_counter()
     correct = 0
@@ -32,6 +122,22 @@ def main():
         for mid, gold, pred, txt in mistakes:
             print(f"- id={mid} gold={gold} pred={pred} :: {txt}")
 
+    if args.repeat > 0:
+        texts = [r["text"] for r in rows]
+        differ = sum(baseline_classify(t) != classify(t) for t in texts)
+        us = bench(texts, args.repeat)
+        print(f"\nMicrobenchmark ({args.repeat} x {len(rows)} samples, best of 5):")
+        print(f"  before: baseline classify(text)  {us['baseline']:.2f} us/sample")
+        print(
+            f"  after:  classify(text)           {us['text']:.2f} us/sample "
+            f"({us['baseline'] / us['text']:.2f}x)"
+        )
+        print(
+            f"  after:  classify(PreparedText)   {us['prepared']:.2f} us/sample "
+            f"({us['baseline'] / us['prepared']:.2f}x, normalise/tokenise reused)"
+        )
+        print(f"  samples scored differently from the baseline: {differ}")
+
 
 if __name__ == "__main__":
     main()
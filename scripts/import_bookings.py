@@ -0,0 +1,78 @@
+"""
+Bulk-load bookings from an NDJSON or CSV export (same path as POST /bookings:bulk).
+
+Usage:
+    python scripts/import_bookings.py legacy_bookings.csv
+    python scripts/import_bookings.py legacy.jsonl --chunk-rows 20000 --errors-out rejected.jsonl
+
+Each row needs customer_name, customer_email, starts_at and ends_at; id, status and
+notes are optional. Rows with an id that already exists are skipped, so an
+interrupted import can simply be run again. Exit code 1 if any row was rejected.
+"""
+
+import argparse
+import asyncio
+import json
+import pathlib
+import sys
+import time
+from collections.abc import AsyncIterator
+
+# Make imports work whether run as `python -m scripts.import_bookings` or directly
+sys.path.append(str(pathlib.Path(__file__).resolve().parents[1]))
+
+from src.api.booking_import import aiter_lines, import_bookings, parse_records  # noqa: E402
+from src.api.schemas.booking import BookingImportResult  # noqa: E402
+from src.db.session import AsyncSessionLocal, dispose_engine  # noqa: E402
+
+
+async def _read_chunks(path: pathlib.Path, size: int = 1 << 20) -> AsyncIterator[bytes]:
+    with path.open("rb") as f:
+        while chunk := f.read(size):
+            yield chunk
+
+
+async def main(args: argparse.Namespace) -> int:
+    path = pathlib.Path(args.input)
+    fmt = args.format or ("csv" if path.suffix.lower() == ".csv" else "ndjson")
+    result = BookingImportResult()
+    started = time.perf_counter()
+    try:
+        async with AsyncSessionLocal() as db:
+            await import_bookings(
+                db,
+                parse_records(aiter_lines(_read_chunks(path)), fmt),
+                chunk_rows=args.chunk_rows,
+                max_errors=args.max_errors,
+                result=result,
+            )
+    finally:
+        await dispose_engine()
+        elapsed = time.perf_counter() - started
+        print(
+            f"received={result.received} inserted={result.inserted} "
+            f"rejected={result.rejected} in {elapsed:.1f}s "
+            f"({result.inserted / elapsed if elapsed else 0:.0f} rows/s)",
+            file=sys.stderr,
+        )
+
+    if args.errors_out:
+        with open(args.errors_out, "w", encoding="utf-8") as out:
+            for e in result.errors:
+                out.write(json.dumps(e.model_dump()) + "\n")
+    else:
+        for e in result.errors[:20]:
+            print(f"  line {e.line}: {e.error}", file=sys.stderr)
+    if result.errors_truncated or (not args.errors_out and len(result.errors) > 20):
+        print("  (more errors not shown; raise --max-errors / use --errors-out)", file=sys.stderr)
+    return 1 if result.rejected else 0
+
+
+if __name__ == "__main__":
+    ap = argparse.ArgumentParser(description=__doc__)
+    ap.add_argument("input", help=".csv (with header) or .jsonl/.ndjson file")
+    ap.add_argument("--format", choices=["csv", "ndjson"], help="default: from the extension")
+    ap.add_argument("--chunk-rows", type=int, default=5_000, help="rows per COPY + commit")
+    ap.add_argument("--max-errors", type=int, default=1_000, help="row errors to keep")
+    ap.add_argument("--errors-out", help="write rejected lines as JSONL here")
+    raise SystemExit(asyncio.run(main(ap.parse_args())))
@@ -0,0 +1,50 @@
+"""
+Rebuild sentiment_label_counts from the raw sentiment table.
+
+The counters are maintained by triggers and should never drift; run this after
+restoring data, bulk edits with triggers disabled, or as a periodic check.
+
+Usage:
+    python scripts/reconcile_sentiment_counts.py            # fix and report drift
+    python scripts/reconcile_sentiment_counts.py --dry-run  # report only (exit 1 on drift)
+"""
+
+import argparse
+import asyncio
+import pathlib
+import sys
+
+# Make imports work whether run as `python -m scripts.reconcile_sentiment_counts` or directly
+sys.path.append(str(pathlib.Path(__file__).resolve().parents[1]))
+
+from src.db.sentiment_counts import reconcile_label_counts  # noqa: E402
+from src.db.session import AsyncSessionLocal, dispose_engine  # noqa: E402
+
+
+async def main(dry_run: bool) -> int:
+    try:
+        async with AsyncSessionLocal() as db:
+            report = await reconcile_label_counts(db, apply=not dry_run)
+            if dry_run:
+                await db.rollback()
+            else:
+                await db.commit()
+    finally:
+        await dispose_engine()
+
+    drift = False
+    for label, r in report.items():
+        delta = r["actual"] - r["counter"]
+        drift |= delta != 0
+        print(f"{label:<10} counter={r['counter']:>10} actual={r['actual']:>10} drift={delta:+d}")
+    if not drift:
+        print("counters match")
+    elif not dry_run:
+        print("counters rebuilt")
+    return 1 if drift and dry_run else 0
+
+
+if __name__ == "__main__":
+    ap = argparse.ArgumentParser(description=__doc__)
+    ap.add_argument("--dry-run", action="store_true", help="report drift without fixing it")
+    raise SystemExit(asyncio.run(main(ap.parse_args().dry_run)))
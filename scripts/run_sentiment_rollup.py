@@ -0,0 +1,46 @@
+"""
+Run the sentiment_rollup job behind GET /sentiment/timeseries.
+
+Run it from one scheduler/job process; API processes only start the job
+themselves when SENTIMENT_ROLLUP_INTERVAL_S is set. Concurrent runs are safe
+(the watermark row is locked), just wasted work.
+
+Usage:
+    python scripts/run_sentiment_rollup.py                 # catch up once, then exit (cron)
+    python scripts/run_sentiment_rollup.py --interval 60   # keep running every 60 s
+"""
+
+import argparse
+import asyncio
+import pathlib
+import sys
+
+# Make imports work whether run as `python -m scripts.run_sentiment_rollup` or directly
+sys.path.append(str(pathlib.Path(__file__).resolve().parents[1]))
+
+from src.config.settings import get_settings  # noqa: E402
+from src.db.sentiment_rollup import RollupWorker  # noqa: E402
+from src.db.session import AsyncSessionLocal, dispose_engine  # noqa: E402
+
+
+async def main(interval_s: float | None) -> int:
+    worker = RollupWorker(AsyncSessionLocal, settle_s=get_settings().sentiment_rollup_settle_s)
+    try:
+        while True:
+            groups = await worker.run_once()
+            snap = worker.snapshot()
+            print(
+                f"rollup: {groups} (hour, label) rows upserted, "
+                f"watermark={snap['watermark']} in {snap['last_run_ms']:.0f}ms"
+            )
+            if interval_s is None:
+                return 0
+            await asyncio.sleep(interval_s)
+    finally:
+        await dispose_engine()
+
+
+if __name__ == "__main__":
+    ap = argparse.ArgumentParser(description=__doc__)
+    ap.add_argument("--interval", type=float, default=None, help="seconds between runs")
+    raise SystemExit(asyncio.run(main(ap.parse_args().interval)))
@@ -0,0 +1,109 @@
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass
+from typing import Any, Generic, TypeVar
+
+from src.common.metrics import Histogram
+
+P = TypeVar("P")
+R = TypeVar("R")
+
+_BATCH_SIZE_BUCKETS = (1, 2, 4, 8, 16, 32, 64)
+_QUEUE_WAIT_MS_BUCKETS = (0.5, 1, 2, 5, 10, 25, 50, 100)
+
+
+@dataclass
+class _Pending(Generic[P]):
+    item: P
+    future: asyncio.Future
+    enqueued_at: float
+
+
+class MicroBatcher(Generic[P, R]):
+    """
+    Coalesce concurrent single-item calls into one batched call.
+
+    A batch is flushed when `max_batch` items are waiting or `max_wait_ms` has
+    passed since the first item arrived, whichever comes first. `process` gets the
+    items in arrival order and must return one result per item; an exception
+    fails every caller in that batch.
+    """
+
+    def __init__(
+        self,
+        process: Callable[[list[P]], Awaitable[list[R]]],
+        max_batch: int = 16,
+        max_wait_ms: float = 2.0,
+    ) -> None:
+        self._process = process
+        self.max_batch = max(1, int(max_batch))
+        self.max_wait_s = max(0.0, float(max_wait_ms)) / 1000.0
+        self.batch_sizes = Histogram(_BATCH_SIZE_BUCKETS)
+        self.queue_wait_ms = Histogram(_QUEUE_WAIT_MS_BUCKETS)
+        self._pending: list[_Pending[P]] = []
+        self._timer: asyncio.TimerHandle | None = None
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._inflight: set[asyncio.Task] = set()
+
+    async def submit(self, item: P) -> R:
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop:
+            # New event loop (e.g. app restarted in tests): drop state bound to the old one
+            self._loop, self._pending, self._timer = loop, [], None
+            self._inflight = set()
+
+        fut = loop.create_future()
+        self._pending.append(_Pending(item, fut, loop.time()))
+        if len(self._pending) >= self.max_batch:
+            self._flush()
+        elif self._timer is None:
+            self._timer = loop.call_later(self.max_wait_s, self._flush)
+        return await fut
+
+    def _flush(self) -> None:
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        batch, self._pending = self._pending, []
+        if not batch:
+            return
+        task = asyncio.get_running_loop().create_task(self._dispatch(batch))
+        self._inflight.add(task)
+        task.add_done_callback(self._inflight.discard)
+
+    async def _dispatch(self, batch: list[_Pending[P]]) -> None:
+        now = asyncio.get_running_loop().time()
+        self.batch_sizes.observe(len(batch))
+        for p in batch:
+            self.queue_wait_ms.observe((now - p.enqueued_at) * 1000.0)
+
+        try:
+            results = await self._process([p.item for p in batch])
+        except Exception as exc:
+            for p in batch:
+                if not p.future.done():
+                    p.future.set_exception(exc)
+            return
+
+        for p, res in zip(batch, results, strict=True):
+            if not p.future.done():  # caller may have gone away
+                p.future.set_result(res)
+
+    async def aclose(self) -> None:
+        """Flush anything still waiting and let in-flight batches finish."""
+        if self._loop is asyncio.get_running_loop():
+            self._flush()
+            if self._inflight:
+                await asyncio.gather(*self._inflight, return_exceptions=True)
+        self._loop, self._pending, self._timer = None, [], None
+        self._inflight = set()
+
+    def stats(self) -> dict[str, Any]:
+        return {
+            "max_batch": self.max_batch,
+            "max_wait_ms": self.max_wait_s * 1000.0,
+            "batch_size": self.batch_sizes.snapshot(),
+            "queue_wait_ms": self.queue_wait_ms.snapshot(),
+        }
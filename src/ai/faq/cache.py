@@ -0,0 +1,119 @@
+from __future__ import annotations
+
+import re
+import sys
+import time
+from collections import OrderedDict
+from collections.abc import Callable, Hashable
+from dataclasses import dataclass
+from typing import Any, Generic, TypeVar
+
+import numpy as np
+
+V = TypeVar("V")
+
+_WS = re.compile(r"\s+")
+
+
+def normalize_question(text: str) -> str:
+    """Cache key for a question: case-folded, whitespace collapsed and trimmed."""
+    return _WS.sub(" ", text.casefold()).strip()
+
+
+def approx_nbytes(value: Any) -> int:
+    """Rough memory footprint used for the cache's byte cap."""
+    if isinstance(value, np.ndarray):
+        return int(value.nbytes)
+    if isinstance(value, list | tuple):
+        return sys.getsizeof(value) + sum(approx_nbytes(v) for v in value)
+    return sys.getsizeof(value)
+
+
+@dataclass
+class _Entry(Generic[V]):
+    value: V
+    nbytes: int
+    expires_at: float | None
+
+
+class LRUCache(Generic[V]):
+    """
+    Bounded LRU map with optional TTL.
+
+    Entries are evicted least-recently-used first once either `max_entries` or
+    `max_bytes` (sum of `size_of(value)` + key length) would be exceeded.
+    Not thread-safe: use from the event loop only.
+    """
+
+    def __init__(
+        self,
+        max_entries: int = 10_000,
+        max_bytes: int = 64 * 1024 * 1024,
+        ttl_s: float | None = None,
+        size_of: Callable[[Any], int] = approx_nbytes,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.max_entries = max(0, int(max_entries))
+        self.max_bytes = max(0, int(max_bytes))
+        self.ttl_s = ttl_s
+        self._size_of = size_of
+        self._clock = clock
+        self._data: OrderedDict[Hashable, _Entry[V]] = OrderedDict()
+        self.nbytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def get(self, key: Hashable) -> V | None:
+        entry = self._data.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+        if entry.expires_at is not None and entry.expires_at <= self._clock():
+            self._drop(key)
+            self.expirations += 1
+            self.misses += 1
+            return None
+        self._data.move_to_end(key)
+        self.hits += 1
+        return entry.value
+
+    def put(self, key: Hashable, value: V) -> None:
+        nbytes = self._size_of(value) + (len(key) if isinstance(key, str) else 0)
+        if key in self._data:
+            self._drop(key)
+        if nbytes > self.max_bytes or self.max_entries == 0:
+            return  # would never fit; don't flush the whole cache for it
+        expires_at = self._clock() + self.ttl_s if self.ttl_s else None
+        self._data[key] = _Entry(value, nbytes, expires_at)
+        self.nbytes += nbytes
+        while len(self._data) > self.max_entries or self.nbytes > self.max_bytes:
+            oldest = next(iter(self._data))
+            self._drop(oldest)
+            self.evictions += 1
+
+    def _drop(self, key: Hashable) -> None:
+        entry = self._data.pop(key)
+        self.nbytes -= entry.nbytes
+
+    def clear(self) -> None:
+        self._data.clear()
+        self.nbytes = 0
+
+    def stats(self) -> dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self._data),
+            "bytes": self.nbytes,
+            "max_entries": self.max_entries,
+            "max_bytes": self.max_bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+        }
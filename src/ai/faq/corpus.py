@@ -0,0 +1,163 @@
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import json
+import logging
+import time
+from collections.abc import Awaitable, Callable, Sequence
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any
+
+import numpy as np
+
+from src.ai.faq.data_loader import build_tag_index
+from src.ai.faq.index import IndexBackend, VectorIndex, make_index
+
+logger = logging.getLogger("ai.faq.corpus")
+
+
+def _item_key(item: Any) -> dict[str, Any]:
+    return {
+        "id": item.id,
+        "question": item.question,
+        "answer": item.answer,
+        "tags": list(getattr(item, "tags", None) or []),
+    }
+
+
+def corpus_version(faqs: Sequence[Any]) -> str:
+    """Content digest of the corpus, in row order (any edit or reorder changes it)."""
+    payload = json.dumps([_item_key(f) for f in faqs], sort_keys=True)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()[:16]
+
+
+@dataclass(frozen=True)
+class CorpusDiff:
+    added: list[str] = field(default_factory=list)
+    removed: list[str] = field(default_factory=list)
+    updated: list[str] = field(default_factory=list)  # same id, different content
+    new_questions: list[str] = field(default_factory=list)  # texts that need embedding
+
+    @property
+    def changed(self) -> bool:
+        return bool(self.added or self.removed or self.updated)
+
+    def summary(self) -> dict[str, int]:
+        return {
+            "added": len(self.added),
+            "removed": len(self.removed),
+            "updated": len(self.updated),
+            "embedded": len(self.new_questions),
+        }
+
+
+def diff_corpus(old: Sequence[Any], new: Sequence[Any]) -> CorpusDiff:
+    """Compare two corpora by FAQ id and content; list question texts not embedded before."""
+    old_by_id = {f.id: _item_key(f) for f in old}
+    new_by_id = {f.id: _item_key(f) for f in new}
+    known_questions = {f.question for f in old}
+    return CorpusDiff(
+        added=[i for i in new_by_id if i not in old_by_id],
+        removed=[i for i in old_by_id if i not in new_by_id],
+        updated=[i for i in new_by_id if i in old_by_id and new_by_id[i] != old_by_id[i]],
+        new_questions=list(
+            dict.fromkeys(f.question for f in new if f.question not in known_questions)
+        ),
+    )
+
+
+@dataclass(frozen=True)
+class CorpusSnapshot:
+    """
+    Everything a query needs, built together and never mutated afterwards.
+
+    Requests grab one snapshot and use it throughout, so a reload that swaps
+    in a new snapshot can never pair old row numbers with new FAQ items.
+    """
+
+    faqs: list
+    doc_emb: np.ndarray
+    index: VectorIndex
+    tag_index: dict[str, np.ndarray]
+    version: str
+    loaded_at: float
+
+    @classmethod
+    def build(
+        cls,
+        faqs: list,
+        doc_emb: np.ndarray,
+        backend: IndexBackend = "exact",
+        n_lists: int | None = None,
+        n_probe: int = 8,
+    ) -> CorpusSnapshot:
+        """CPU-bound (index build): call from a worker thread for big corpora."""
+        return cls(
+            faqs=faqs,
+            doc_emb=doc_emb,
+            index=make_index(doc_emb, backend=backend, n_lists=n_lists, n_probe=n_probe),
+            tag_index=build_tag_index(faqs),
+            version=corpus_version(faqs),
+            loaded_at=time.time(),
+        )
+
+    def info(self) -> dict[str, Any]:
+        return {"version": self.version, "size": len(self.faqs), "loaded_at": self.loaded_at}
+
+
+class FileWatcher:
+    """
+    Poll a file's mtime/size and await `on_change()` when it changes.
+
+    Polling (rather than inotify) keeps this dependency-free and works on
+    bind mounts; reloads are cheap to skip when the content digest is unchanged.
+    """
+
+    def __init__(
+        self,
+        path: str | Path,
+        on_change: Callable[[], Awaitable[Any]],
+        interval_s: float = 2.0,
+    ) -> None:
+        self.path = Path(path)
+        self.on_change = on_change
+        self.interval_s = interval_s
+        self._stamp = self._stat()
+        self._task: asyncio.Task | None = None
+
+    def _stat(self) -> tuple[int, int] | None:
+        try:
+            st = self.path.stat()
+        except OSError:
+            return None
+        return st.st_mtime_ns, st.st_size
+
+    async def check(self) -> bool:
+        """Run `on_change` if the file changed since the last check; True if it did."""
+        stamp = self._stat()
+        if stamp == self._stamp:
+            return False
+        self._stamp = stamp
+        try:
+            await self.on_change()
+        except Exception:
+            # Keep serving the previous snapshot; the next edit retries
+            logger.exception("faq_reload_failed path=%s", self.path)
+        return True
+
+    async def _run(self) -> None:
+        while True:
+            await asyncio.sleep(self.interval_s)
+            await self.check()
+
+    def start(self) -> None:
+        if self._task is None or self._task.done():
+            self._task = asyncio.get_running_loop().create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
@@ -2,6 +2,7 @@ from __future__ import annotations
 
 from pathlib import Path
 
+import numpy as np
 import yaml
 from pydantic import BaseModel
 
@@ -20,3 +21,23 @@ def load_faqs(path: str | Path = "data/faqs.yaml") -> list[FAQItem]:
     with p.open("r") as f:
         raw = yaml.safe_load(f) or []
     return [FAQItem(**item) for item in raw]
+
+
+def build_tag_index(faqs: list[FAQItem]) -> dict[str, np.ndarray]:
+    """
+    Inverted index: lower-cased tag -> sorted row indices into `faqs`
+    (and therefore into the embedding matrix built from them).
+    """
+    rows: dict[str, list[int]] = {}
+    for i, item in enumerate(faqs):
+        for tag in getattr(item, "tags", None) or []:
+            rows.setdefault(tag.lower(), []).append(i)
+    return {tag: np.asarray(ix, dtype=np.intp) for tag, ix in rows.items()}
+
+
+def rows_for_tags(tag_index: dict[str, np.ndarray], tags: list[str]) -> np.ndarray:
+    """Rows carrying any of `tags` (case-insensitive); empty if none match."""
+    hits = [tag_index[t.lower()] for t in tags if t.lower() in tag_index]
+    if not hits:
+        return np.empty(0, dtype=np.intp)
+    return np.unique(np.concatenate(hits))
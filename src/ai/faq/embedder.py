@@ -1,20 +1,36 @@
 from __future__ import annotations
 
+import hashlib
+import json
+import logging
+import os
+import tempfile
+import threading
+import time
+from collections.abc import Callable
+from dataclasses import asdict, dataclass
 from pathlib import Path
 
 import numpy as np
 
 _MODEL_NAME = "sentence-transformers/all-MiniLM-L6-v2"
-_EMB_CACHE = Path("data/faqs_embeddings.npy")
+_MODEL_REVISION: str | None = None  # pin a hub commit to make cache keys reproducible
+# Manifest (JSON header) + content-addressed .npy matrix next to it
+_EMB_MANIFEST = Path("data/faqs_embeddings.json")
+_CACHE_FORMAT = 2
+
+logger = logging.getLogger("ai.faq.embedder")
+_WARMUP_TEXT = "warm-up"
 
 
 class MiniLMEmbedder:
     """Thin wrapper so we can swap models later without touching callers."""
 
-    def __init__(self) -> None:
+    def __init__(self, model_name: str = _MODEL_NAME) -> None:
         from sentence_transformers import SentenceTransformer  # lazy import
 
-        self.model = SentenceTransformer(_MODEL_NAME)
+        self.model_name = model_name
+        self.model = SentenceTransformer(model_name, revision=_MODEL_REVISION)
 
     def encode(self, texts: list[str]) -> np.ndarray:
         vecs = self.model.encode(
@@ -25,9 +41,187 @@ class MiniLMEmbedder:
         return vecs.astype("float32")
 
 
-def load_or_build_embeddings(questions: list[str]) -> tuple[np.ndarray, bool]:
-    """Return (embeddings, used_cache)."""
-    if _EMB_CACHE.exists():
-        return np.load(_EMB_CACHE), True
-    emb = MiniLMEmbedder().encode(questions)
-    return emb, False
+@dataclass
+class EmbedderStats:
+    """Load/warm-up timings for one registered model (surfaced via /faq/metrics)."""
+
+    model_name: str
+    load_seconds: float | None = None
+    warmup_seconds: float | None = None
+    warmed_up: bool = False
+
+
+# --- Process-wide registry: one model instance per model name ---
+_REGISTRY: dict[str, MiniLMEmbedder] = {}
+_STATS: dict[str, EmbedderStats] = {}
+_REGISTRY_LOCK = threading.Lock()
+
+
+def get_embedder(model_name: str = _MODEL_NAME) -> MiniLMEmbedder:
+    """
+    Return the shared embedder for `model_name`, loading it on first use.
+    The lock makes concurrent first calls (threads or startup + request) load once.
+    """
+    emb = _REGISTRY.get(model_name)
+    if emb is not None:
+        return emb
+    with _REGISTRY_LOCK:
+        emb = _REGISTRY.get(model_name)
+        if emb is None:
+            started = time.perf_counter()
+            emb = MiniLMEmbedder(model_name)
+            _REGISTRY[model_name] = emb
+            _STATS[model_name] = EmbedderStats(
+                model_name=model_name,
+                load_seconds=time.perf_counter() - started,
+            )
+    return emb
+
+
+def warm_up_embedder(embedder: MiniLMEmbedder | None = None) -> float:
+    """
+    Run one dummy encode so lazy weight/tokenizer init happens before real traffic.
+    Returns the warm-up duration in seconds.
+    """
+    emb = embedder if embedder is not None else get_embedder()
+    started = time.perf_counter()
+    emb.encode([_WARMUP_TEXT])
+    elapsed = time.perf_counter() - started
+
+    name = getattr(emb, "model_name", type(emb).__name__)
+    stats = _STATS.setdefault(name, EmbedderStats(model_name=name))
+    stats.warmup_seconds = elapsed
+    stats.warmed_up = True
+    return elapsed
+
+
+def embedder_stats() -> dict[str, dict]:
+    """Snapshot of load/warm-up metrics keyed by model name."""
+    return {name: asdict(s) for name, s in _STATS.items()}
+
+
+def reset_embedders() -> None:
+    """Drop all registered models (tests / reload tooling only)."""
+    with _REGISTRY_LOCK:
+        _REGISTRY.clear()
+        _STATS.clear()
+
+
+def encode_in_worker(texts: list[str]) -> np.ndarray:
+    """Picklable entry point for process-pool inference (uses the worker's own model)."""
+    return get_embedder().encode(texts)
+
+
+def question_hash(text: str) -> str:
+    """Content hash for one corpus question (cache rows are keyed by this)."""
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+def _cache_key(model_name: str) -> dict[str, object]:
+    return {
+        "format": _CACHE_FORMAT,
+        "model": model_name,
+        "revision": _MODEL_REVISION or "default",
+    }
+
+
+def _read_cache(manifest: Path, model_name: str) -> tuple[np.ndarray, list[str]] | None:
+    """Return (memory-mapped matrix, row hashes) if the manifest matches `model_name`."""
+    try:
+        meta = json.loads(manifest.read_text())
+    except (OSError, ValueError):
+        return None
+    if any(meta.get(k) != v for k, v in _cache_key(model_name).items()):
+        return None
+    try:
+        mat = np.load(manifest.parent / meta["file"], mmap_mode="r")
+    except (KeyError, OSError, ValueError):
+        return None
+    hashes = list(meta.get("hashes") or [])
+    if mat.ndim != 2 or mat.shape[0] != len(hashes) or mat.shape[1] != meta.get("dim"):
+        return None
+    return mat, hashes
+
+
+def _atomic_write(path: Path, write) -> None:
+    """Write via a temp file in the same directory, fsync, then rename over `path`."""
+    fd, tmp = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            write(f)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, path)
+    except BaseException:
+        Path(tmp).unlink(missing_ok=True)
+        raise
+
+
+def _write_cache(manifest: Path, mat: np.ndarray, hashes: list[str], model_name: str) -> np.ndarray:
+    """
+    Persist `mat` under a content-addressed file name, then atomically swap the
+    manifest to point at it. Readers always see a consistent (matrix, hashes) pair.
+    Returns the freshly written matrix, memory-mapped.
+    """
+    manifest.parent.mkdir(parents=True, exist_ok=True)
+    key = {**_cache_key(model_name), "dim": int(mat.shape[1])}
+    digest = hashlib.sha256(json.dumps([key, hashes]).encode("utf-8")).hexdigest()[:16]
+    data_file = manifest.parent / f"{manifest.stem}.{digest}.npy"
+
+    _atomic_write(data_file, lambda f: np.save(f, np.ascontiguousarray(mat, dtype="float32")))
+    meta = {**key, "file": data_file.name, "hashes": hashes}
+    _atomic_write(manifest, lambda f: f.write(json.dumps(meta, indent=2).encode("utf-8")))
+
+    # Old generations are unreferenced now; workers that mapped them keep their pages
+    for stale in manifest.parent.glob(f"{manifest.stem}.*.npy"):
+        if stale != data_file:
+            stale.unlink(missing_ok=True)
+    return np.load(data_file, mmap_mode="r")
+
+
+def load_or_build_embeddings(
+    questions: list[str],
+    manifest: Path = _EMB_MANIFEST,
+    encode: Callable[[list[str]], np.ndarray] | None = None,
+    model_name: str | None = None,
+) -> tuple[np.ndarray, bool]:
+    """
+    Return (embeddings, used_cache) for `questions`, in order.
+
+    Rows are reused from the on-disk cache when model, revision and question
+    content hash all match; only new/changed questions are encoded. `model_name`
+    is the model `encode` runs (default: the shared embedder's), so two models
+    never read each other's vectors. `used_cache` is True when nothing had to be
+    encoded. The result is memory-mapped read-only so multiple workers share the
+    same pages.
+    """
+    model_name = model_name or _MODEL_NAME
+    hashes = [question_hash(q) for q in questions]
+    cached = _read_cache(manifest, model_name)
+    if cached is not None and cached[1] == hashes:
+        return cached[0], True
+    if not questions:
+        return np.zeros((0, 0), dtype="float32"), True
+
+    row_of = {h: i for i, h in enumerate(cached[1])} if cached else {}
+    missing = [i for i, h in enumerate(hashes) if h not in row_of]
+
+    new_vecs = None
+    if missing:
+        encode = encode or get_embedder(model_name).encode
+        new_vecs = encode([questions[i] for i in missing])
+        if cached is not None and new_vecs.shape[1] != cached[0].shape[1]:
+            # Same name, different output size: none of the cached rows are usable
+            row_of, missing = {}, list(range(len(questions)))
+            new_vecs = encode(questions)
+
+    dim = new_vecs.shape[1] if new_vecs is not None else cached[0].shape[1]  # type: ignore[index]
+    mat = np.empty((len(questions), dim), dtype="float32")
+    if new_vecs is not None:
+        mat[missing] = new_vecs
+    reused = [i for i, h in enumerate(hashes) if h in row_of]
+    if reused:
+        mat[reused] = cached[0][[row_of[hashes[i]] for i in reused]]  # type: ignore[index]
+
+    logger.info("faq_embeddings_cache reused=%d encoded=%d", len(reused), len(missing))
+    return _write_cache(manifest, mat, hashes, model_name), not missing
@@ -0,0 +1,148 @@
+from __future__ import annotations
+
+import asyncio
+import threading
+from collections.abc import Callable
+from concurrent.futures import Executor, Future, ProcessPoolExecutor, ThreadPoolExecutor
+from dataclasses import asdict, dataclass
+from typing import Any, TypeVar
+
+from src.config.settings import Settings, get_settings
+
+T = TypeVar("T")
+
+
+class InferenceError(RuntimeError):
+    """Base class for executor admission/timeout failures."""
+
+
+class InferenceSaturated(InferenceError):
+    """All workers busy and the wait queue is full; caller should back off."""
+
+
+class InferenceTimeout(InferenceError):
+    """The call did not finish within the per-call timeout."""
+
+
+@dataclass
+class ExecutorStats:
+    submitted: int = 0
+    completed: int = 0
+    rejected: int = 0
+    timed_out: int = 0
+    in_flight: int = 0
+
+
+class InferenceExecutor:
+    """
+    Runs CPU-bound model calls off the event loop.
+
+    - `max_workers` threads (or processes) execute calls concurrently.
+    - At most `max_workers + max_queue` calls may be admitted at once; beyond that
+      `run()` fails fast with InferenceSaturated instead of queueing unboundedly.
+    - Each call is bounded by `timeout_s`; the slot is only released once the
+      underlying work actually finishes, so timeouts can't oversubscribe the pool.
+    """
+
+    def __init__(
+        self,
+        max_workers: int = 2,
+        max_queue: int = 32,
+        timeout_s: float | None = 5.0,
+        use_processes: bool = False,
+        initializer: Callable[[], None] | None = None,
+    ) -> None:
+        self.max_workers = max(1, int(max_workers))
+        self.max_queue = max(0, int(max_queue))
+        self.timeout_s = timeout_s
+        self.use_processes = use_processes
+        self._pool: Executor
+        if use_processes:
+            self._pool = ProcessPoolExecutor(max_workers=self.max_workers, initializer=initializer)
+        else:
+            self._pool = ThreadPoolExecutor(
+                max_workers=self.max_workers,
+                thread_name_prefix="inference",
+                initializer=initializer,
+            )
+        self._slots = threading.BoundedSemaphore(self.max_workers + self.max_queue)
+        self._lock = threading.Lock()
+        self._stats = ExecutorStats()
+
+    def _release(self, _: Future) -> None:
+        self._slots.release()
+        with self._lock:
+            self._stats.in_flight -= 1
+            self._stats.completed += 1
+
+    async def run(self, fn: Callable[..., T], *args: Any) -> T:
+        """Submit `fn(*args)` and await its result without blocking the loop."""
+        if not self._slots.acquire(blocking=False):
+            with self._lock:
+                self._stats.rejected += 1
+            raise InferenceSaturated("inference queue is full")
+
+        try:
+            cfut = self._pool.submit(fn, *args)
+        except BaseException:
+            self._slots.release()
+            raise
+        with self._lock:
+            self._stats.submitted += 1
+            self._stats.in_flight += 1
+        cfut.add_done_callback(self._release)
+
+        try:
+            return await asyncio.wait_for(asyncio.wrap_future(cfut), timeout=self.timeout_s)
+        except TimeoutError as err:
+            # Drops the call if it is still queued; a running call finishes in the background
+            cfut.cancel()
+            with self._lock:
+                self._stats.timed_out += 1
+            raise InferenceTimeout(f"inference call exceeded {self.timeout_s}s") from err
+
+    def stats(self) -> dict:
+        with self._lock:
+            snap = asdict(self._stats)
+        snap.update(
+            workers=self.max_workers,
+            max_queue=self.max_queue,
+            mode="process" if self.use_processes else "thread",
+        )
+        return snap
+
+    def shutdown(self, wait: bool = True) -> None:
+        self._pool.shutdown(wait=wait, cancel_futures=True)
+
+
+# --- Process-wide executor (created lazily from Settings) ---
+_EXECUTOR: InferenceExecutor | None = None
+
+
+def _init_process_worker() -> None:
+    # Each worker process loads its own model copy once, up front
+    from src.ai.faq.embedder import get_embedder
+
+    get_embedder()
+
+
+def get_inference_executor(settings: Settings | None = None) -> InferenceExecutor:
+    global _EXECUTOR
+    if _EXECUTOR is None:
+        s = settings or get_settings()
+        _EXECUTOR = InferenceExecutor(
+            max_workers=s.faq_inference_workers,
+            max_queue=s.faq_inference_max_queue,
+            timeout_s=s.faq_inference_timeout_s,
+            use_processes=s.faq_inference_use_processes,
+            initializer=_init_process_worker if s.faq_inference_use_processes else None,
+        )
+    return _EXECUTOR
+
+
+def shutdown_inference_executor() -> None:
+    """Call on app shutdown; a later get_inference_executor() builds a fresh pool."""
+    global _EXECUTOR
+    if _EXECUTOR is not None:
+        _EXECUTOR.shutdown(wait=False)
+        _EXECUTOR = None
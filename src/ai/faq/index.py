@@ -0,0 +1,151 @@
+# src/ai/faq/index.py
+from __future__ import annotations
+
+from collections.abc import Sequence
+from typing import Literal, Protocol
+
+import numpy as np
+
+from src.ai.faq.retriever import RowMask, cosine_topk, cosine_topk_batch, mask_rows
+
+Hits = list[tuple[int, float]]
+IndexBackend = Literal["exact", "ivf"]
+
+
+class VectorIndex(Protocol):
+    """Nearest-neighbour search over L2-normalised rows (cosine == dot product)."""
+
+    size: int
+
+    def search(
+        self,
+        q_mat: np.ndarray,
+        ks: Sequence[int],
+        masks: Sequence[RowMask | None] | None = None,
+    ) -> list[Hits]: ...
+
+
+class ExactIndex:
+    """Brute-force dense matmul: exact results, O(n·d) per query."""
+
+    def __init__(self, doc_mat: np.ndarray) -> None:
+        self.doc_mat = doc_mat
+        self.size = int(doc_mat.shape[0])
+
+    def search(
+        self,
+        q_mat: np.ndarray,
+        ks: Sequence[int],
+        masks: Sequence[RowMask | None] | None = None,
+    ) -> list[Hits]:
+        return cosine_topk_batch(q_mat, self.doc_mat, ks, masks)
+
+
+class IVFIndex:
+    """
+    Inverted-file ANN index in pure NumPy.
+
+    A spherical k-means coarse quantiser splits the corpus into `n_lists`
+    clusters. A query scores only the members of its `n_probe` closest
+    clusters, exactly, so recall/latency is tuned with `n_probe` alone
+    (n_probe == n_lists degenerates to exact search). A tag filter whose rows
+    the probed lists can't fill k with is scored exactly over its own rows.
+    Built in memory at startup/reload; only the vectors are cached on disk.
+    """
+
+    def __init__(
+        self,
+        doc_mat: np.ndarray,
+        centroids: np.ndarray,
+        offsets: np.ndarray,
+        rows: np.ndarray,
+        n_probe: int = 8,
+    ) -> None:
+        self.doc_mat = doc_mat
+        self.centroids = centroids
+        self.offsets = offsets  # CSR: list j owns rows[offsets[j]:offsets[j + 1]]
+        self.rows = rows
+        self.n_probe = n_probe
+        self.size = int(doc_mat.shape[0])
+
+    @property
+    def n_lists(self) -> int:
+        return int(self.centroids.shape[0])
+
+    @classmethod
+    def build(
+        cls,
+        doc_mat: np.ndarray,
+        n_lists: int | None = None,
+        n_probe: int = 8,
+        n_iter: int = 20,
+        seed: int = 0,
+    ) -> IVFIndex:
+        n = int(doc_mat.shape[0])
+        n_lists = max(1, min(n, n_lists or int(round(np.sqrt(n)))))
+        rng = np.random.default_rng(seed)
+        x = np.asarray(doc_mat, dtype="float32")
+
+        centroids = x[rng.choice(n, size=n_lists, replace=False)].copy()
+        assign = np.zeros(n, dtype=np.intp)
+        for it in range(n_iter):
+            new_assign = np.argmax(x @ centroids.T, axis=1)
+            if it and np.array_equal(new_assign, assign):
+                break
+            assign = new_assign
+            sums = np.zeros_like(centroids)
+            np.add.at(sums, assign, x)
+            counts = np.bincount(assign, minlength=n_lists)
+            empty = counts == 0
+            if empty.any():  # reseed dead lists from random rows
+                sums[empty] = x[rng.choice(n, size=int(empty.sum()), replace=False)]
+            norms = np.linalg.norm(sums, axis=1, keepdims=True)
+            centroids = sums / np.maximum(norms, 1e-12)
+
+        order = np.argsort(assign, kind="stable")
+        counts = np.bincount(assign, minlength=n_lists)
+        offsets = np.concatenate([[0], np.cumsum(counts)]).astype(np.intp)
+        return cls(doc_mat, centroids.astype("float32"), offsets, order.astype(np.intp), n_probe)
+
+    def _probe_rows(self, cent_sims: np.ndarray, n_probe: int) -> np.ndarray:
+        p = min(n_probe, self.n_lists)
+        lists = np.argpartition(-cent_sims, p - 1)[:p] if p < self.n_lists else range(p)
+        return np.concatenate([self.rows[self.offsets[j] : self.offsets[j + 1]] for j in lists])
+
+    def search(
+        self,
+        q_mat: np.ndarray,
+        ks: Sequence[int],
+        masks: Sequence[RowMask | None] | None = None,
+        n_probe: int | None = None,
+    ) -> list[Hits]:
+        n_probe = n_probe or self.n_probe
+        # Expected candidates per query; smaller tag filters are cheaper scored exactly
+        expected = n_probe * self.size / max(1, self.n_lists)
+        masks = masks if masks is not None else [None] * len(ks)
+        cent_sims = q_mat @ self.centroids.T  # (b, n_lists): one GEMM for list selection
+        out: list[Hits] = []
+        for q, cs, k, mask in zip(q_mat, cent_sims, ks, masks, strict=True):
+            allowed = mask_rows(mask)
+            if allowed is not None and allowed.size <= expected:
+                out.append(cosine_topk(q, self.doc_mat, k, mask=allowed))
+                continue
+            rows = self._probe_rows(cs, n_probe)
+            if allowed is not None:
+                rows = rows[np.isin(rows, allowed)]
+                if rows.size < k:  # the tag lives in lists we didn't probe: score it exactly
+                    rows = allowed
+            out.append(cosine_topk(q, self.doc_mat, k, mask=rows))
+        return out
+
+
+def make_index(
+    doc_mat: np.ndarray,
+    backend: IndexBackend = "exact",
+    n_lists: int | None = None,
+    n_probe: int = 8,
+) -> VectorIndex:
+    """Build the configured index backend over `doc_mat`."""
+    if backend == "ivf" and doc_mat.shape[0] > 0:
+        return IVFIndex.build(doc_mat, n_lists=n_lists, n_probe=n_probe)
+    return ExactIndex(doc_mat)
@@ -1,6 +1,7 @@
 from __future__ import annotations
 
 import smtplib
+import time
 from dataclasses import dataclass
 from email.message import EmailMessage
 
@@ -14,6 +15,13 @@ class FAQContext:
     answer: str
 
 
+@dataclass
+class HandoffItem:
+    user_question: str
+    top_faq: FAQContext
+    score: float
+
+
 def _build_message(settings: Settings, to_addr: str, subject: str, body: str) -> EmailMessage:
     msg = EmailMessage()
     msg["From"] = settings.smtp_from or "bot@local.test"
@@ -23,20 +31,20 @@ def _build_message(settings: Settings, to_addr: str, subject: str, body: str) ->
     return msg
 
 
-def send_handoff_email(
+def _configured(settings: Settings) -> bool:
+    return bool(settings.smtp_host and settings.smtp_port and settings.handoff_to)
+
+
+def build_handoff_message(
     settings: Settings,
     user_question: str,
     top_faq: FAQContext,
     score: float,
     threshold: float,
-) -> bool:
-    """
-    Send a handoff email. Returns True if we attempted to send; False if not configured.
-    Designed to be easily monkeypatched in tests (no network).
-    """
-    if not (settings.smtp_host and settings.smtp_port and settings.handoff_to):
-        # Not configured -> no-op
-        return False
+) -> EmailMessage | None:
+    """Handoff email for one query, or None when email isn't configured."""
+    if not _configured(settings):
+        return None
 
     subject = f"[FAQ Bot] Handoff triggered (score={score:.2f} < thr={threshold:.2f})"
     body = (
@@ -49,11 +57,123 @@ def send_handoff_email(
         f"Score: {score:.3f}\n"
         f"Threshold: {threshold:.3f}\n"
     )
+    return _build_message(settings, settings.handoff_to, subject, body)  # type: ignore[arg-type]
 
-    msg = _build_message(settings, settings.handoff_to, subject, body)
 
+def build_handoff_digest(
+    settings: Settings,
+    items: list[HandoffItem],
+    threshold: float,
+) -> EmailMessage | None:
+    """One email summarising several handoffs; None if not configured or nothing to send."""
+    if not items or not _configured(settings):
+        return None
+
+    subject = f"[FAQ Bot] {len(items)} handoffs triggered (thr={threshold:.2f})"
+    sections = []
+    for n, it in enumerate(items, start=1):
+        sections.append(
+            f"#{n} (score={it.score:.3f})\n"
+            f"User question:\n{it.user_question}\n"
+            f"Top retrieved context: {it.top_faq.id} - {it.top_faq.question}\n"
+        )
+    body = (
+        f"{len(items)} low-confidence FAQ queries need human attention.\n"
+        f"Threshold: {threshold:.3f}\n\n" + "\n".join(sections)
+    )
+    return _build_message(settings, settings.handoff_to, subject, body)  # type: ignore[arg-type]
+
+
+def _send(settings: Settings, msg: EmailMessage) -> None:
     with smtplib.SMTP(settings.smtp_host, int(settings.smtp_port)) as smtp:
         # MailHog requires no TLS/auth
         smtp.send_message(msg)
 
+
+def send_handoff_email(
+    settings: Settings,
+    user_question: str,
+    top_faq: FAQContext,
+    score: float,
+    threshold: float,
+) -> bool:
+    """
+    Send a handoff email. Returns True if we attempted to send; False if not configured.
+    Designed to be easily monkeypatched in tests (no network).
+    Blocking: request handlers should enqueue via the outbox instead.
+    """
+    msg = build_handoff_message(settings, user_question, top_faq, score, threshold)
+    if msg is None:
+        # Not configured -> no-op
+        return False
+    _send(settings, msg)
+    return True
+
+
+def send_handoff_digest(
+    settings: Settings,
+    items: list[HandoffItem],
+    threshold: float,
+) -> bool:
+    """
+    Send one email summarising several handoffs (used by batch endpoints).
+    Returns True if we attempted to send; False if not configured or nothing to send.
+    """
+    msg = build_handoff_digest(settings, items, threshold)
+    if msg is None:
+        return False
+    _send(settings, msg)
     return True
+
+
+class SMTPConnection:
+    """
+    One long-lived SMTP session reused across sends (owned by the outbox worker).
+
+    Connects lazily, checks liveness with NOOP before reusing a session that sat
+    idle, and drops the session on any error so the next send reconnects.
+    Blocking: call from a worker thread.
+    """
+
+    def __init__(self, settings: Settings, idle_check_s: float = 30.0) -> None:
+        self.settings = settings
+        self.idle_check_s = idle_check_s
+        self._smtp: smtplib.SMTP | None = None
+        self._last_used = 0.0
+
+    def _ensure(self) -> smtplib.SMTP:
+        if self._smtp is not None and time.monotonic() - self._last_used > self.idle_check_s:
+            try:
+                code, _ = self._smtp.noop()
+                if code != 250:
+                    self.close()
+            except (smtplib.SMTPException, OSError):
+                self.close()
+        if self._smtp is None:
+            self._smtp = smtplib.SMTP(self.settings.smtp_host, int(self.settings.smtp_port))
+        return self._smtp
+
+    def send_many(self, msgs: list[EmailMessage]) -> list[Exception | None]:
+        """Send each message over the shared session; returns per-message errors."""
+        errors: list[Exception | None] = []
+        for msg in msgs:
+            try:
+                self._ensure().send_message(msg)
+                self._last_used = time.monotonic()
+                errors.append(None)
+            except (smtplib.SMTPException, OSError) as err:
+                self.close()
+                errors.append(err)
+        return errors
+
+    def close(self) -> None:
+        smtp, self._smtp = self._smtp, None
+        if smtp is None:
+            return
+        try:
+            smtp.quit()
+        except (smtplib.SMTPException, OSError):
+            try:
+                smtp.close()
+            except OSError:
+                pass
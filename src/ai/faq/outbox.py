@@ -0,0 +1,409 @@
+from __future__ import annotations
+
+import asyncio
+import email
+import email.policy
+import logging
+import uuid
+from collections import deque
+from dataclasses import dataclass, field
+from email.message import EmailMessage
+from typing import Protocol
+
+from sqlalchemy import text
+
+from src.ai.faq.notify import (
+    FAQContext,
+    HandoffItem,
+    SMTPConnection,
+    build_handoff_digest,
+    build_handoff_message,
+)
+from src.config.settings import Settings, get_settings
+
+logger = logging.getLogger("ai.faq.outbox")
+
+
+class OutboxFull(RuntimeError):
+    """The in-memory outbox hit its size cap; the message was not queued."""
+
+
+@dataclass
+class OutboxMessage:
+    message: EmailMessage
+    id: uuid.UUID = field(default_factory=uuid.uuid4)
+    attempts: int = 0
+
+
+class OutboxStore(Protocol):
+    async def put(self, msg: OutboxMessage) -> None: ...
+
+    async def claim(self, limit: int, wait_s: float) -> list[OutboxMessage]:
+        """Up to `limit` due messages (attempts already incremented); [] after `wait_s`."""
+        ...
+
+    async def ack(self, msgs: list[OutboxMessage]) -> None: ...
+
+    async def retry(self, msg: OutboxMessage, delay_s: float, error: str) -> None: ...
+
+    async def fail(self, msg: OutboxMessage, error: str) -> None: ...
+
+    def depth(self) -> int | None: ...
+
+    def bind_loop(self) -> None:
+        """Recreate loop-bound state (wakeup events) for the running loop."""
+        ...
+
+
+class MemoryOutboxStore:
+    """Bounded in-process queue. Fast, but pending mail is lost if the process dies."""
+
+    def __init__(self, max_size: int = 1000) -> None:
+        self.max_size = max_size
+        self._items: deque[OutboxMessage] = deque()
+        self._ready = asyncio.Event()
+        self._delayed: set[asyncio.TimerHandle] = set()
+
+    async def put(self, msg: OutboxMessage) -> None:
+        if len(self._items) >= self.max_size:
+            raise OutboxFull("handoff outbox is full")
+        self._items.append(msg)
+        self._ready.set()
+
+    async def claim(self, limit: int, wait_s: float) -> list[OutboxMessage]:
+        if not self._items:
+            self._ready.clear()
+            try:
+                await asyncio.wait_for(self._ready.wait(), timeout=wait_s)
+            except TimeoutError:
+                return []
+        batch = [self._items.popleft() for _ in range(min(limit, len(self._items)))]
+        for m in batch:
+            m.attempts += 1
+        return batch
+
+    async def ack(self, msgs: list[OutboxMessage]) -> None:
+        return None
+
+    async def retry(self, msg: OutboxMessage, delay_s: float, error: str) -> None:
+        loop = asyncio.get_running_loop()
+
+        def _requeue() -> None:
+            self._delayed.discard(handle)
+            self._items.append(msg)
+            self._ready.set()
+
+        handle = loop.call_later(delay_s, _requeue)
+        self._delayed.add(handle)
+
+    async def fail(self, msg: OutboxMessage, error: str) -> None:
+        return None
+
+    def depth(self) -> int | None:
+        return len(self._items) + len(self._delayed)
+
+    def bind_loop(self) -> None:
+        self._ready = asyncio.Event()
+        if self._items:
+            self._ready.set()
+
+    def discard_delayed(self) -> int:
+        """Drop scheduled retries (shutdown); returns how many were lost."""
+        n = len(self._delayed)
+        for h in self._delayed:
+            h.cancel()
+        self._delayed.clear()
+        return n
+
+
+class PostgresOutboxStore:
+    """
+    Durable outbox in `faq_handoff_outbox`. Survives restarts; several app
+    workers can drain it concurrently because claims use SKIP LOCKED plus a
+    lease (next_attempt_at pushed forward) instead of holding row locks.
+    """
+
+    _CLAIM = text("""
+        UPDATE faq_handoff_outbox
+           SET attempts = attempts + 1,
+               next_attempt_at = now() + make_interval(secs => :lease_s)
+         WHERE id IN (
+                SELECT id FROM faq_handoff_outbox
+                 WHERE status = 'pending' AND next_attempt_at <= now()
+                 ORDER BY next_attempt_at
+                 LIMIT :limit
+                 FOR UPDATE SKIP LOCKED
+         )
+        RETURNING id, raw_message, attempts
+        """)
+
+    def __init__(self, session_factory, lease_s: float = 60.0) -> None:
+        self._session_factory = session_factory
+        self.lease_s = lease_s
+        self._wake = asyncio.Event()
+
+    async def put(self, msg: OutboxMessage) -> None:
+        async with self._session_factory() as db:
+            await db.execute(
+                text("INSERT INTO faq_handoff_outbox (id, raw_message) VALUES (:id, :raw)"),
+                {"id": msg.id, "raw": msg.message.as_string()},
+            )
+            await db.commit()
+        self._wake.set()
+
+    async def claim(self, limit: int, wait_s: float) -> list[OutboxMessage]:
+        async with self._session_factory() as db:
+            res = await db.execute(self._CLAIM, {"limit": limit, "lease_s": self.lease_s})
+            rows = res.all()
+            await db.commit()
+        if not rows:
+            self._wake.clear()
+            try:
+                await asyncio.wait_for(self._wake.wait(), timeout=wait_s)
+            except TimeoutError:
+                pass
+            return []
+        return [
+            OutboxMessage(
+                message=email.message_from_string(raw, policy=email.policy.default),
+                id=mid,
+                attempts=attempts,
+            )
+            for mid, raw, attempts in rows
+        ]
+
+    async def ack(self, msgs: list[OutboxMessage]) -> None:
+        if not msgs:
+            return
+        async with self._session_factory() as db:
+            await db.execute(
+                text(
+                    "UPDATE faq_handoff_outbox SET status = 'sent', sent_at = now(), "
+                    "last_error = NULL WHERE id = ANY(:ids)"
+                ),
+                {"ids": [m.id for m in msgs]},
+            )
+            await db.commit()
+
+    async def retry(self, msg: OutboxMessage, delay_s: float, error: str) -> None:
+        async with self._session_factory() as db:
+            await db.execute(
+                text(
+                    "UPDATE faq_handoff_outbox SET last_error = :err, "
+                    "next_attempt_at = now() + make_interval(secs => :delay) WHERE id = :id"
+                ),
+                {"id": msg.id, "err": error, "delay": delay_s},
+            )
+            await db.commit()
+
+    async def fail(self, msg: OutboxMessage, error: str) -> None:
+        async with self._session_factory() as db:
+            await db.execute(
+                text(
+                    "UPDATE faq_handoff_outbox SET status = 'failed', last_error = :err "
+                    "WHERE id = :id"
+                ),
+                {"id": msg.id, "err": error},
+            )
+            await db.commit()
+
+    def depth(self) -> int | None:
+        return None  # lives in the DB; query the table for backlog
+
+    def bind_loop(self) -> None:
+        self._wake = asyncio.Event()
+
+
+@dataclass
+class OutboxStats:
+    enqueued: int = 0
+    dropped: int = 0
+    sent: int = 0
+    retried: int = 0
+    failed: int = 0
+
+
+class HandoffOutbox:
+    """
+    Decouples handoff email from the request path.
+
+    Handlers `enqueue()` and return immediately; a background task started in
+    the app lifespan claims batches, sends them over one reused SMTP session
+    (in a worker thread, so the loop never blocks on SMTP), and retries failures
+    with exponential backoff up to `max_attempts`.
+    """
+
+    def __init__(
+        self,
+        store: OutboxStore,
+        smtp: SMTPConnection,
+        batch_size: int = 20,
+        max_attempts: int = 5,
+        backoff_base_s: float = 1.0,
+        backoff_max_s: float = 300.0,
+        poll_interval_s: float = 1.0,
+    ) -> None:
+        self.store = store
+        self.smtp = smtp
+        self.batch_size = batch_size
+        self.max_attempts = max_attempts
+        self.backoff_base_s = backoff_base_s
+        self.backoff_max_s = backoff_max_s
+        self.poll_interval_s = poll_interval_s
+        self.stats = OutboxStats()
+        self._task: asyncio.Task | None = None
+        self._delivering: asyncio.Future | None = None
+        self._stopping = False
+
+    async def enqueue(self, message: EmailMessage) -> bool:
+        """Queue a message; False (and logged) if the outbox refuses it."""
+        try:
+            await self.store.put(OutboxMessage(message=message))
+        except OutboxFull:
+            self.stats.dropped += 1
+            logger.error("handoff_outbox_full")
+            return False
+        self.stats.enqueued += 1
+        return True
+
+    def _backoff(self, attempts: int) -> float:
+        return min(self.backoff_max_s, self.backoff_base_s * (2 ** max(0, attempts - 1)))
+
+    async def drain_once(self, wait_s: float | None = None) -> int:
+        """Claim and send one batch; returns how many messages were claimed."""
+        batch = await self.store.claim(
+            self.batch_size, self.poll_interval_s if wait_s is None else wait_s
+        )
+        if not batch:
+            return 0
+        # Shielded so a shutdown cancel can't lose track of an in-flight batch
+        self._delivering = asyncio.ensure_future(self._deliver(batch))
+        await asyncio.shield(self._delivering)
+        return len(batch)
+
+    async def _deliver(self, batch: list[OutboxMessage]) -> None:
+        errors = await asyncio.to_thread(self.smtp.send_many, [m.message for m in batch])
+        sent: list[OutboxMessage] = []
+        for msg, err in zip(batch, errors, strict=True):
+            if err is None:
+                sent.append(msg)
+            elif msg.attempts >= self.max_attempts or self._stopping:
+                self.stats.failed += 1
+                logger.error("handoff_email_failed", exc_info=err)
+                await self.store.fail(msg, repr(err))
+            else:
+                self.stats.retried += 1
+                logger.warning("handoff_email_retry", exc_info=err)
+                await self.store.retry(msg, self._backoff(msg.attempts), repr(err))
+        await self.store.ack(sent)
+        self.stats.sent += len(sent)
+
+    async def _run(self) -> None:
+        while not self._stopping:
+            try:
+                await self.drain_once()
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                # Store/DB hiccup: keep the worker alive and try again shortly
+                logger.exception("handoff_outbox_worker_error")
+                await asyncio.sleep(self.poll_interval_s)
+
+    def start(self) -> None:
+        if self._task is None or self._task.done():
+            self._stopping = False
+            self.store.bind_loop()  # the store may outlive the loop it last waited on
+            self._task = asyncio.get_running_loop().create_task(self._run())
+
+    async def stop(self, timeout_s: float = 5.0) -> None:
+        """Stop the worker after a best-effort final drain, then close SMTP."""
+        self._stopping = True
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+        if self._delivering is not None:
+            await asyncio.gather(self._delivering, return_exceptions=True)
+        try:
+            async with asyncio.timeout(timeout_s):
+                while await self.drain_once(wait_s=0):
+                    pass
+        except TimeoutError:
+            logger.warning("handoff_outbox_drain_timeout")
+        if isinstance(self.store, MemoryOutboxStore):
+            lost = self.store.discard_delayed()
+            if lost:
+                logger.warning("handoff_outbox_retries_dropped count=%d", lost)
+        await asyncio.to_thread(self.smtp.close)
+
+    def snapshot(self) -> dict:
+        return {
+            "enqueued": self.stats.enqueued,
+            "dropped": self.stats.dropped,
+            "sent": self.stats.sent,
+            "retried": self.stats.retried,
+            "failed": self.stats.failed,
+            "depth": self.store.depth(),
+        }
+
+
+# --- Process-wide outbox (one per app lifespan) ---
+_OUTBOX: HandoffOutbox | None = None
+
+
+def get_outbox(settings: Settings | None = None) -> HandoffOutbox:
+    global _OUTBOX
+    if _OUTBOX is None:
+        s = settings or get_settings()
+        store: OutboxStore
+        if s.handoff_outbox_backend == "postgres":
+            from src.db.session import AsyncSessionLocal
+
+            store = PostgresOutboxStore(AsyncSessionLocal)
+        else:
+            store = MemoryOutboxStore(max_size=s.handoff_outbox_max_size)
+        _OUTBOX = HandoffOutbox(
+            store,
+            SMTPConnection(s),
+            batch_size=s.handoff_outbox_batch_size,
+            max_attempts=s.handoff_outbox_max_attempts,
+            poll_interval_s=s.handoff_outbox_poll_interval_s,
+        )
+    return _OUTBOX
+
+
+async def start_outbox(settings: Settings | None = None) -> None:
+    get_outbox(settings).start()
+
+
+async def stop_outbox() -> None:
+    global _OUTBOX
+    if _OUTBOX is not None:
+        await _OUTBOX.stop()
+        _OUTBOX = None
+
+
+async def enqueue_handoff_email(
+    settings: Settings,
+    user_question: str,
+    top_faq: FAQContext,
+    score: float,
+    threshold: float,
+) -> bool:
+    """Non-blocking replacement for send_handoff_email in request handlers."""
+    msg = build_handoff_message(settings, user_question, top_faq, score, threshold)
+    if msg is None:
+        return False
+    return await get_outbox(settings).enqueue(msg)
+
+
+async def enqueue_handoff_digest(
+    settings: Settings,
+    items: list[HandoffItem],
+    threshold: float,
+) -> bool:
+    """Non-blocking replacement for send_handoff_digest in request handlers."""
+    msg = build_handoff_digest(settings, items, threshold)
+    if msg is None:
+        return False
+    return await get_outbox(settings).enqueue(msg)
@@ -1,8 +1,13 @@
 # src/ai/faq/retriever.py
 from __future__ import annotations
 
+from collections.abc import Sequence
+
 import numpy as np
 
+# Boolean (n,) mask or integer row indices restricting which FAQs are eligible
+RowMask = np.ndarray | Sequence[int] | Sequence[bool]
+
 
 def cosine_top1(q_vec: np.ndarray, doc_mat: np.ndarray) -> tuple[int, float]:
     """
@@ -14,6 +19,98 @@ def cosine_top1(q_vec: np.ndarray, doc_mat: np.ndarray) -> tuple[int, float]:
     return idx, float(sims[idx])
 
 
+def cosine_top1_batch(q_mat: np.ndarray, doc_mat: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Batched cosine_top1: one (b, d) x (d, n) GEMM for b queries.
+    Returns (indices, cosines), each shaped (b,).
+    """
+    sims = q_mat @ doc_mat.T  # (b, n)
+    idx = np.argmax(sims, axis=1)
+    return idx, sims[np.arange(sims.shape[0]), idx]
+
+
+def mask_rows(mask: RowMask | None) -> np.ndarray | None:
+    """Normalise a boolean or index mask to integer row indices (None = all rows)."""
+    if mask is None:
+        return None
+    m = np.asarray(mask)
+    if m.dtype == bool:
+        return np.flatnonzero(m)
+    return m.astype(np.intp, copy=False)
+
+
+def _select_topk(sims: np.ndarray, k: int) -> np.ndarray:
+    """
+    Positions of the k largest values, best first; ties go to the lower position
+    (matching argmax). argpartition keeps selection O(n) before the O(k log k) sort.
+    """
+    n = sims.shape[0]
+    k = min(int(k), n)
+    if k <= 0:
+        return np.empty(0, dtype=np.intp)
+    part = np.argpartition(-sims, k - 1)[:k] if k < n else np.arange(n)
+    return part[np.lexsort((part, -sims[part]))]
+
+
+def topk_from_sims(
+    sims: np.ndarray, k: int, mask: RowMask | None = None
+) -> list[tuple[int, float]]:
+    """Top-k (index, cosine) pairs from precomputed similarities over all rows."""
+    rows = mask_rows(mask)
+    if rows is None:
+        pos = _select_topk(sims, k)
+        return [(int(i), float(sims[i])) for i in pos]
+    sub = sims[rows]
+    pos = _select_topk(sub, k)
+    return [(int(rows[p]), float(sub[p])) for p in pos]
+
+
+def cosine_topk(
+    q_vec: np.ndarray, doc_mat: np.ndarray, k: int, mask: RowMask | None = None
+) -> list[tuple[int, float]]:
+    """
+    Return up to k (index, cosine) pairs, best first.
+    With a mask only the selected rows are scored, so tag-filtered queries
+    don't pay for the whole matrix. Indices always refer to rows of doc_mat.
+    """
+    rows = mask_rows(mask)
+    if rows is None:
+        return topk_from_sims(doc_mat @ q_vec, k)
+    sims = doc_mat[rows] @ q_vec
+    pos = _select_topk(sims, k)
+    return [(int(rows[p]), float(sims[p])) for p in pos]
+
+
+def cosine_topk_batch(
+    q_mat: np.ndarray,
+    doc_mat: np.ndarray,
+    ks: Sequence[int],
+    masks: Sequence[RowMask | None] | None = None,
+) -> list[list[tuple[int, float]]]:
+    """
+    Batched cosine_topk, with each query's own k and (optional) row mask.
+    Unmasked queries share one GEMM over the whole matrix; masked ones are grouped
+    by row set and share one GEMM over just those rows, so a tag filter never pays
+    for scoring the rest of the corpus.
+    """
+    masks = masks if masks is not None else [None] * len(ks)
+    groups: dict[bytes | None, tuple[np.ndarray | None, list[int]]] = {}
+    for i, mask in enumerate(masks):
+        rows = mask_rows(mask)
+        key = None if rows is None else rows.tobytes()
+        groups.setdefault(key, (rows, []))[1].append(i)
+
+    out: list[list[tuple[int, float]]] = [[] for _ in ks]
+    for rows, members in groups.values():
+        mat = doc_mat if rows is None else doc_mat[rows]
+        sims = q_mat[members] @ mat.T  # (group size, eligible rows)
+        for sim, i in zip(sims, members, strict=True):
+            pos = _select_topk(sim, ks[i])
+            ids = pos if rows is None else rows[pos]
+            out[i] = [(int(r), float(sim[p])) for r, p in zip(ids, pos, strict=True)]
+    return out
+
+
 def score_from_cosine(cosine: float) -> float:
     """
     Map cosine in [-1, 1] to a user-facing score in [0, 1].
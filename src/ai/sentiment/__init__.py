@@ -1,3 +1,13 @@
-from .rule_based import SentimentResult, classify
+from .batch import LABELS, classify_many
+from .preprocess import PreparedText, prepare
+from .rule_based import SentimentResult, classify, extract_features
 
-__all__ = ["SentimentResult", "classify"]
+__all__ = [
+    "LABELS",
+    "PreparedText",
+    "SentimentResult",
+    "classify",
+    "classify_many",
+    "extract_features",
+    "prepare",
+]
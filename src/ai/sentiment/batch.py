@@ -0,0 +1,89 @@
+from __future__ import annotations
+
+from collections.abc import Iterable, Iterator
+from itertools import islice
+
+import numpy as np
+
+from .rule_based import extract_features
+
+# int8 label codes returned by classify_many
+NEGATIVE, NEUTRAL, POSITIVE = -1, 0, 1
+LABELS = {NEGATIVE: "negative", NEUTRAL: "neutral", POSITIVE: "positive"}
+
+
+def _feature_matrix(texts: list[str]) -> np.ndarray:
+    """
+    (n, 4) int32: pos_hits, neg_hits, flips, hedges per text. Not vectorised: one
+    extract_features() call per text, the same code classify() runs, since phrase
+    matching and the "... not" token window are per-string work that NumPy string
+    ops could only approximate.
+    """
+    feats = [extract_features(t) for t in texts]
+    return np.array(feats, dtype=np.int32).reshape(len(texts), 4)
+
+
+def score_features(
+    feats: np.ndarray,
+    pos_weight: float = 1.0,
+    neg_weight: float = 1.0,
+    neutral_band: float = 0.15,
+) -> tuple[np.ndarray, np.ndarray]:
+    """
+    classify()'s scoring rules as array operations over a feature matrix.
+    Arithmetic runs in float64 in the same order as classify(), so labels match
+    it exactly; scores are then narrowed to float32.
+    """
+    pos, neg, flips, hedges = (feats[:, i] for i in range(4))
+    score = 0.0 + pos_weight * pos.astype(np.float64)
+    score -= neg_weight * neg
+
+    flipped = flips > 0
+    negation_bias = max(0.25, neutral_band + 0.05)
+    score[flipped] -= pos_weight * flips[flipped]
+    score[flipped] -= negation_bias
+
+    score[hedges > 0] *= 0.6
+
+    mixed = (pos > 0) & (neg > 0) & (np.abs(score) <= (pos_weight + neg_weight) * 0.6)
+    score[mixed] *= 0.7
+
+    labels = np.zeros(score.shape, dtype=np.int8)
+    labels[score > neutral_band] = POSITIVE
+    labels[score < -neutral_band] = NEGATIVE
+    return score.astype(np.float32), labels
+
+
+def classify_chunks(
+    texts: Iterable[str],
+    pos_weight: float = 1.0,
+    neg_weight: float = 1.0,
+    neutral_band: float = 0.15,
+    chunk_size: int = 10_000,
+) -> Iterator[tuple[np.ndarray, np.ndarray]]:
+    """Stream (scores float32, labels int8) per chunk of `chunk_size` inputs."""
+    it = iter(texts)
+    while chunk := list(islice(it, chunk_size)):
+        yield score_features(_feature_matrix(chunk), pos_weight, neg_weight, neutral_band)
+
+
+def classify_many(
+    texts: Iterable[str],
+    pos_weight: float = 1.0,
+    neg_weight: float = 1.0,
+    neutral_band: float = 0.15,
+    chunk_size: int = 10_000,
+) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Batch classify(): returns (scores float32[n], labels int8[n]) with label codes
+    -1 negative / 0 neutral / 1 positive (see LABELS). Inputs are consumed in
+    chunks, so any iterable (e.g. a file reader) works without materialising it.
+    Feature extraction still runs per text in Python; only the scoring rules are
+    array operations, so the saving over a classify() loop is the per-result
+    objects and arithmetic, not the phrase matching.
+    """
+    parts = list(classify_chunks(texts, pos_weight, neg_weight, neutral_band, chunk_size))
+    if not parts:
+        return np.empty(0, dtype=np.float32), np.empty(0, dtype=np.int8)
+    scores, labels = zip(*parts, strict=True)
+    return np.concatenate(scores), np.concatenate(labels)
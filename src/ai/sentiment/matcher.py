@@ -0,0 +1,112 @@
+from __future__ import annotations
+
+import re
+from collections.abc import Iterable
+
+# Below this many phrases, per-phrase str.find (C loops) beats any automaton
+_SCAN_BELOW = 32
+
+
+class PhraseMatcher:
+    """
+    All-occurrences matcher over a fixed phrase set, with plain substring
+    semantics (`phrase in text`) and overlapping/nested hits reported
+    ("great" and "great value" both match "great value").
+
+    Large lexicons are loaded into a trie which is compiled into one
+    prefix-factored alternation regex ("gr(?:eat(?: value)?|im)..."). Each
+    regex search runs in C and lands on the next position where a phrase
+    starts, capturing the longest one; shorter phrases that are prefixes of
+    it come from a table built with the trie. Cost is one C-speed pass plus
+    work proportional to the hits, whatever the lexicon size.
+    Small lexicons skip the regex and scan each phrase with str.find.
+    """
+
+    def __init__(self, phrases: Iterable[str], scan_below: int = _SCAN_BELOW) -> None:
+        self.phrases: tuple[str, ...] = tuple(sorted({p for p in phrases if p}))
+        self._search = None
+        self._prefixes: dict[str, tuple[str, ...]] = {}
+        if len(self.phrases) >= scan_below:
+            self._search, self._prefixes = self._compile(self.phrases)
+
+    @staticmethod
+    def _compile(phrases: tuple[str, ...]):
+        # Trie as parallel arrays: goto[state] maps char -> state
+        goto: list[dict[str, int]] = [{}]
+        end: list[str | None] = [None]  # phrase ending at this state
+        for phrase in phrases:
+            state = 0
+            for ch in phrase:
+                nxt = goto[state].get(ch)
+                if nxt is None:
+                    nxt = len(goto)
+                    goto[state][ch] = nxt
+                    goto.append({})
+                    end.append(None)
+                state = nxt
+            end[state] = phrase
+
+        # phrase -> every phrase that is a prefix of it (itself included)
+        prefixes: dict[str, tuple[str, ...]] = {}
+        for phrase in phrases:
+            state, found = 0, []
+            for ch in phrase:
+                state = goto[state][ch]
+                if end[state] is not None:
+                    found.append(end[state])
+            prefixes[phrase] = tuple(found)
+
+        # Iterative post-order regex build (deep phrases would exceed the recursion limit).
+        # Greedy optional groups make each match the longest phrase at its start.
+        built: dict[int, str] = {}
+        stack: list[tuple[int, bool]] = [(0, False)]
+        while stack:
+            state, children_done = stack.pop()
+            if not children_done:
+                stack.append((state, True))
+                stack.extend((child, False) for child in goto[state].values())
+                continue
+            alts = [re.escape(ch) + built.pop(child) for ch, child in goto[state].items()]
+            if not alts:
+                built[state] = ""
+            elif len(alts) == 1 and end[state] is None:
+                built[state] = alts[0]
+            else:
+                group = "(?:" + "|".join(alts) + ")"
+                built[state] = group + "?" if end[state] is not None else group
+        return re.compile(built[0], re.DOTALL).search, prefixes
+
+    def __len__(self) -> int:
+        return len(self.phrases)
+
+    def matches(self, text: str) -> list[tuple[int, str]]:
+        """Every (start, phrase) occurrence, overlapping ones included; order unspecified."""
+        out: list[tuple[int, str]] = []
+        if self._search is None:
+            for phrase in self.phrases:
+                i = text.find(phrase)
+                while i != -1:
+                    out.append((i, phrase))
+                    i = text.find(phrase, i + 1)
+            return out
+
+        search, prefixes, pos = self._search, self._prefixes, 0
+        while (m := search(text, pos)) is not None:
+            start = m.start()
+            out.extend((start, phrase) for phrase in prefixes[m.group()])
+            pos = start + 1  # next start may lie inside this match
+        return out
+
+    def found(self, text: str) -> set[str]:
+        """Distinct phrases that occur anywhere in `text`."""
+        if self._search is None:
+            return {phrase for phrase in self.phrases if phrase in text}
+        return {phrase for _, phrase in self.matches(text)}
+
+    def contains_any(self, text: str) -> bool:
+        if self._search is None:
+            for phrase in self.phrases:
+                if phrase in text:
+                    return True
+            return False
+        return self._search(text) is not None
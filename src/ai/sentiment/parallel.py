@@ -0,0 +1,160 @@
+from __future__ import annotations
+
+import csv
+import json
+import os
+import time
+from collections.abc import Iterable, Iterator
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, wait
+from dataclasses import dataclass, field
+from itertools import islice
+from pathlib import Path
+
+import numpy as np
+
+from .batch import LABELS, classify_many
+
+Record = tuple[str, str]  # (id, text)
+
+
+@dataclass(frozen=True)
+class Scored:
+    id: str
+    score: float
+    label: str
+
+
+@dataclass
+class WorkerStats:
+    docs: int = 0
+    busy_s: float = 0.0
+
+    @property
+    def docs_per_s(self) -> float:
+        return self.docs / self.busy_s if self.busy_s else 0.0
+
+
+@dataclass
+class CorpusStats:
+    docs: int = 0
+    chunks: int = 0
+    wall_s: float = 0.0
+    workers: dict[int, WorkerStats] = field(default_factory=dict)  # keyed by worker pid
+
+    @property
+    def docs_per_s(self) -> float:
+        return self.docs / self.wall_s if self.wall_s else 0.0
+
+    def summary(self) -> dict:
+        return {
+            "docs": self.docs,
+            "chunks": self.chunks,
+            "wall_s": round(self.wall_s, 3),
+            "docs_per_s": round(self.docs_per_s, 1),
+            "workers": {
+                pid: {"docs": w.docs, "docs_per_s": round(w.docs_per_s, 1)}
+                for pid, w in sorted(self.workers.items())
+            },
+        }
+
+
+def read_records(
+    path: str | Path,
+    text_field: str = "text",
+    id_field: str = "id",
+) -> Iterator[Record]:
+    """
+    Stream (id, text) from a .csv or .jsonl file, one row at a time.
+    Rows without an id get their 1-based record number.
+    """
+    p = Path(path)
+    with p.open(newline="", encoding="utf-8") as f:
+        if p.suffix.lower() in {".jsonl", ".ndjson"}:
+            rows: Iterable[dict] = (json.loads(line) for line in f if line.strip())
+        else:
+            rows = csv.DictReader(f)
+        for n, row in enumerate(rows, start=1):
+            yield str(row.get(id_field) or n), str(row.get(text_field) or "")
+
+
+def _score_chunk(
+    seq: int, ids: list[str], texts: list[str]
+) -> tuple[int, list[str], np.ndarray, np.ndarray, int, float]:
+    start = time.perf_counter()
+    scores, labels = classify_many(texts, chunk_size=len(texts) or 1)
+    return seq, ids, scores, labels, os.getpid(), time.perf_counter() - start
+
+
+def _chunks(records: Iterable[Record], size: int) -> Iterator[tuple[list[str], list[str]]]:
+    it = iter(records)
+    while chunk := list(islice(it, size)):
+        ids, texts = zip(*chunk, strict=True)
+        yield list(ids), list(texts)
+
+
+def score_corpus(
+    records: Iterable[Record],
+    workers: int | None = None,
+    chunk_size: int = 2_000,
+    ordered: bool = True,
+    max_inflight: int | None = None,
+    stats: CorpusStats | None = None,
+) -> Iterator[Scored]:
+    """
+    Score a stream of (id, text) records across a process pool.
+
+    Input is pulled lazily in chunks and at most `max_inflight` chunks
+    (default 2 per worker) are submitted or buffered at once, so memory stays
+    flat however large the input. With `ordered=False` results come back as
+    chunks finish; otherwise in input order. Pass a CorpusStats to collect
+    per-worker and total throughput. `workers=1` scores inline (no pool).
+    """
+    workers = workers or os.cpu_count() or 1
+    max_inflight = max(1, max_inflight or 2 * workers)
+    stats = stats if stats is not None else CorpusStats()
+    started = time.perf_counter()
+
+    def emit(result) -> Iterator[Scored]:
+        _, ids, scores, labels, pid, busy = result
+        w = stats.workers.setdefault(pid, WorkerStats())
+        w.docs += len(ids)
+        w.busy_s += busy
+        stats.docs += len(ids)
+        stats.chunks += 1
+        stats.wall_s = time.perf_counter() - started
+        for rid, score, code in zip(ids, scores.tolist(), labels.tolist(), strict=True):
+            yield Scored(rid, score, LABELS[code])
+
+    chunks = enumerate(_chunks(records, chunk_size))
+    if workers == 1:
+        for seq, (ids, texts) in chunks:
+            yield from emit(_score_chunk(seq, ids, texts))
+        return
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        pending: set[Future] = set()
+        done_early: dict[int, tuple] = {}  # ordered mode: finished chunks waiting their turn
+        next_seq = 0
+        exhausted = False
+        while True:
+            # Back-pressure: only read more input while in-flight + buffered is under the cap
+            while not exhausted and len(pending) + len(done_early) < max_inflight:
+                nxt = next(chunks, None)
+                if nxt is None:
+                    exhausted = True
+                    break
+                seq, (ids, texts) = nxt
+                pending.add(pool.submit(_score_chunk, seq, ids, texts))
+            if not pending:
+                break
+
+            finished, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for fut in finished:
+                result = fut.result()
+                if not ordered:
+                    yield from emit(result)
+                else:
+                    done_early[result[0]] = result
+            while next_seq in done_early:
+                yield from emit(done_early.pop(next_seq))
+                next_seq += 1
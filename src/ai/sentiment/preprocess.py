@@ -0,0 +1,46 @@
+from __future__ import annotations
+
+import re
+
+_TOKEN = re.compile(r"[a-z']+")
+
+
+class PreparedText:
+    """
+    One input, normalised once and shared by every scoring rule.
+
+    - normalized: lower-cased, whitespace collapsed (phrase matching runs on this)
+    - tokens: word tokens (letters and apostrophes) for proximity rules
+    - offsets: start of each token in `normalized` (computed on first use)
+    """
+
+    __slots__ = ("raw", "normalized", "tokens", "_offsets")
+
+    def __init__(self, raw: str, normalized: str, tokens: list[str]) -> None:
+        self.raw = raw
+        self.normalized = normalized
+        self.tokens = tokens
+        self._offsets: list[int] | None = None
+
+    @property
+    def offsets(self) -> list[int]:
+        if self._offsets is None:
+            self._offsets = [m.start() for m in _TOKEN.finditer(self.normalized)]
+        return self._offsets
+
+    def window(self, start: int, stop: int) -> str:
+        """Tokens[start:stop] joined by single spaces (punctuation dropped)."""
+        return " ".join(self.tokens[start:stop])
+
+    def last_index(self, token: str) -> int:
+        """Index of the last occurrence of `token`, or -1."""
+        tokens = self.tokens
+        if token not in tokens:
+            return -1
+        return len(tokens) - 1 - tokens[::-1].index(token)
+
+
+def prepare(text: str) -> PreparedText:
+    """Normalise and tokenise `text` once for classify()."""
+    normalized = " ".join(text.lower().split())
+    return PreparedText(text, normalized, _TOKEN.findall(normalized))
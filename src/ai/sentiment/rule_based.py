@@ -1,9 +1,11 @@
 from __future__ import annotations
 
-import re
 from collections.abc import Iterable
 from dataclasses import dataclass
 
+from .matcher import PhraseMatcher
+from .preprocess import PreparedText, prepare
+
 # Phrase/word lexicons (expand gradually as we see real data)
 POS = {
     "fantastic",
@@ -41,65 +43,106 @@ NEUTRAL_HINTS = {
 }
 
 
-@dataclass
-class SentimentResult:
-    score: float
-    label: str  # "positive" | "negative" | "neutral"
+@dataclass(frozen=True)
+class Lexicons:
+    """POS/NEG/NEUTRAL_HINTS compiled into one matcher; every hit found in a single pass."""
+
+    pos: frozenset[str]
+    neg: frozenset[str]
+    hints: frozenset[str]
+    matcher: PhraseMatcher
+    pos_matcher: PhraseMatcher  # POS only, for "does this window hold a positive?"
+
+
+def compile_lexicons(
+    pos: Iterable[str] = POS,
+    neg: Iterable[str] = NEG,
+    hints: Iterable[str] = NEUTRAL_HINTS,
+) -> Lexicons:
+    pos, neg, hints = frozenset(pos), frozenset(neg), frozenset(hints)
+    return Lexicons(pos, neg, hints, PhraseMatcher(pos | neg | hints), PhraseMatcher(pos))
 
 
-def _normalise(text: str) -> str:
-    # lower + collapse whitespace
-    return " ".join(text.lower().split())
+# Compiled once at import; call `reload_lexicons()` after editing the sets above
+_LEXICONS = compile_lexicons()
 
 
-def _count_hits(text: str, phrases: Iterable[str]) -> int:
-    return sum(1 for w in phrases if w in text)
+def reload_lexicons() -> None:
+    global _LEXICONS
+    _LEXICONS = compile_lexicons()
 
 
-def _tokenise(text: str) -> list[str]:
-    # simple tokens for proximity rules; keep words only
-    return re.findall(r"[a-z']+", text.lower())
+@dataclass
+class SentimentResult:
+    score: float
+    label: str  # "positive" | "negative" | "neutral"
 
 
-def _windowed_negation(text: str, pos_phrases: Iterable[str], window: int = 4) -> int:
+def _windowed_negation(
+    p: PreparedText,
+    matches: list[tuple[int, str]],
+    lex: Lexicons,
+    window: int = 4,
+) -> int:
     """
     Count positive phrases that are negated by a nearby 'not' (or trailing ... not).
     Matches cases like:
       - "not helpful", "not great"
       - "setup was quick ... not"
+    `matches` are the lexicon hits in `p.normalized`.
     Returns the number of flips to apply (each flip = subtract one pos_weight).
     """
-    t = _normalise(text)
-    tokens = _tokenise(text)
+    t = p.normalized
 
-    flips = 0
-
-    # Pattern A: "not <positive>"
-    for w in pos_phrases:
-        if f"not {w}" in t:
-            flips += 1
+    # Pattern A: "not <positive>" (each distinct phrase flips once)
+    flips = len({w for start, w in matches if w in lex.pos and t[start - 4 : start] == "not "})
 
     # Pattern B: "<positive> ... not" (within window tokens)
     # find last occurrence of "not" and see if a POS phrase
     # appears within the previous window tokens
-    try:
-        last_not_idx = max(i for i, tok in enumerate(tokens) if tok == "not")
-    except ValueError:
-        last_not_idx = -1
-
+    last_not_idx = p.last_index("not")
     if last_not_idx != -1:
-        window_start = max(0, last_not_idx - window)
-        window_tokens = " ".join(tokens[window_start:last_not_idx])
-        for w in pos_phrases:
-            if w in window_tokens:
-                flips += 1
-                break
+        window_tokens = p.window(max(0, last_not_idx - window), last_not_idx)
+        if lex.pos_matcher.contains_any(window_tokens):
+            flips += 1
 
     return flips
 
 
+def extract_features(
+    text: str | PreparedText, lexicons: Lexicons | None = None
+) -> tuple[int, int, int, int]:
+    """
+    (pos_hits, neg_hits, negation flips, hedges): everything classify() scores,
+    for one text. Uses the current lexicons unless `lexicons` is given.
+    """
+    p = text if isinstance(text, PreparedText) else prepare(text)
+    lex = lexicons if lexicons is not None else _LEXICONS
+    t = p.normalized
+
+    # One matcher pass finds every lexicon phrase in the text
+    matches = lex.matcher.matches(t)
+    found = {w for _, w in matches}
+
+    # Phrase-first scoring (distinct phrases, as substring presence)
+    pos_hits = len(found & lex.pos)
+    neg_hits = len(found & lex.neg)
+
+    # Windowed negation flips: each flip reverses one positive weight
+    flips = _windowed_negation(p, matches, lex, window=4)
+
+    # Concession / hedge cues
+    hedges = len(found & lex.hints)
+    # (" but " in f" {t} ", without building the padded copy)
+    if " but " in t or t.startswith("but ") or t.endswith(" but") or t == "but":
+        hedges += 1
+    elif ", but" in t or "… but" in t:
+        hedges += 1
+    return pos_hits, neg_hits, flips, hedges
+
+
 def classify(
-    text: str,
+    text: str | PreparedText,
     pos_weight: float = 1.0,
     neg_weight: float = 1.0,
     neutral_band: float = 0.15,
@@ -110,18 +153,15 @@ def classify(
       - windowed negation handling ("not helpful", "quick ... not")
       - concession / hedge dampening ("works, but ...", "okay", "nothing special")
       - neutral band clamp
+    Accepts raw text or a PreparedText (normalised/tokenised once by `prepare`).
+    For many texts at once see `classify_many` (same rules, NumPy arithmetic).
     """
-    t = _normalise(text)
-    score = 0.0
+    pos_hits, neg_hits, flips, hedges = extract_features(text)
 
-    # Phrase-first scoring
-    pos_hits = _count_hits(t, POS)
-    neg_hits = _count_hits(t, NEG)
+    score = 0.0
     score += pos_weight * pos_hits
     score -= neg_weight * neg_hits
 
-    # Windowed negation flips: each flip reverses one positive weight
-    flips = _windowed_negation(text, POS, window=4)
     if flips:
         score -= pos_weight * flips  # invert previously added positive weights
         # Bias explicit negations slightly negative so they don't collapse to neutral.
@@ -129,10 +169,6 @@ def classify(
         negation_bias = max(0.25, neutral_band + 0.05)
         score -= negation_bias
 
-    # Concession / hedge dampening
-    hedges = _count_hits(t, NEUTRAL_HINTS)
-    if " but " in f" {t} " or ", but" in t or "… but" in t:
-        hedges += 1
     if hedges:
         # Pull toward neutral without fully zeroing meaningful sentiment
         score *= 0.6
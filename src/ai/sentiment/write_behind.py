@@ -0,0 +1,203 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+from collections import deque
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass
+from typing import Any
+
+from src.common.metrics import Histogram
+
+logger = logging.getLogger("ai.sentiment.write_behind")
+
+_FLUSH_MS_BUCKETS = (1, 2, 5, 10, 25, 50, 100, 250, 1000)
+_FLUSH_ROWS_BUCKETS = (1, 10, 50, 100, 250, 500, 1000, 5000)
+_MIN_FLUSH_INTERVAL_MS = 1.0
+
+Row = dict[str, Any]
+
+
+class BufferFull(RuntimeError):
+    """The write buffer hit its row cap; the row was not queued."""
+
+
+@dataclass
+class _Pending:
+    row: Row
+    waiter: asyncio.Future | None  # set when the caller waits for the commit
+    attempts: int = 0
+
+
+@dataclass
+class BufferStats:
+    enqueued: int = 0
+    rejected: int = 0
+    written: int = 0
+    retried: int = 0
+    failed: int = 0
+    high_water: int = 0
+
+
+class WriteBehindBuffer:
+    """
+    Bounded in-process row buffer flushed to the DB by a background task.
+
+    Rows are written with one bulk `write_rows(rows)` call whenever `flush_rows`
+    are waiting or every `flush_interval_ms`, whichever comes first. Callers
+    either return as soon as the row is queued (`wait=False`: fastest, lost if
+    the process dies) or wait until their batch has committed (`wait=True`:
+    durable, but many requests share one commit). A failed flush is retried up
+    to `max_attempts` times; waiting callers get the error straight away.
+    """
+
+    def __init__(
+        self,
+        write_rows: Callable[[list[Row]], Awaitable[Any]],
+        max_rows: int = 10_000,
+        flush_rows: int = 500,
+        flush_interval_ms: float = 50.0,
+        max_attempts: int = 3,
+        retry_delay_s: float = 0.5,
+    ) -> None:
+        self._write_rows = write_rows
+        self.max_rows = max(1, int(max_rows))
+        self.flush_rows = max(1, int(flush_rows))
+        # Floored: a zero timeout makes _run spin instead of waiting for rows
+        self.flush_interval_s = max(_MIN_FLUSH_INTERVAL_MS, float(flush_interval_ms)) / 1000.0
+        self.max_attempts = max(1, int(max_attempts))
+        self.retry_delay_s = retry_delay_s
+        self.stats = BufferStats()
+        self.flush_ms = Histogram(_FLUSH_MS_BUCKETS)
+        self.flush_sizes = Histogram(_FLUSH_ROWS_BUCKETS)
+        self._rows: deque[_Pending] = deque()
+        self._wake = asyncio.Event()
+        self._task: asyncio.Task | None = None
+        self._flushing: asyncio.Future | None = None
+        self._stopping = False
+
+    def depth(self) -> int:
+        return len(self._rows)
+
+    async def submit(self, row: Row, wait: bool = False) -> None:
+        """Queue one row; with `wait`, return only once it is committed. Raises BufferFull."""
+        if self._stopping or len(self._rows) >= self.max_rows:
+            self.stats.rejected += 1
+            raise BufferFull("sentiment write buffer is full")
+
+        waiter = asyncio.get_running_loop().create_future() if wait else None
+        self._rows.append(_Pending(row, waiter))
+        self.stats.enqueued += 1
+        self.stats.high_water = max(self.stats.high_water, len(self._rows))
+        if len(self._rows) >= self.flush_rows:
+            self._wake.set()
+        if waiter is not None:
+            await waiter
+
+    async def flush_once(self) -> int:
+        """Write up to `flush_rows` queued rows in one call; returns how many were taken."""
+        batch = [self._rows.popleft() for _ in range(min(self.flush_rows, len(self._rows)))]
+        if not batch:
+            return 0
+        # Shielded so a shutdown cancel can't lose track of an in-flight batch
+        self._flushing = asyncio.ensure_future(self._flush(batch))
+        await asyncio.shield(self._flushing)
+        return len(batch)
+
+    async def _flush(self, batch: list[_Pending]) -> None:
+        loop = asyncio.get_running_loop()
+        started = loop.time()
+        try:
+            await self._write_rows([p.row for p in batch])
+        except Exception as exc:
+            self._on_error(batch, exc)
+            return
+        finally:
+            self.flush_ms.observe((loop.time() - started) * 1000.0)
+            self.flush_sizes.observe(len(batch))
+
+        self.stats.written += len(batch)
+        for p in batch:
+            if p.waiter is not None and not p.waiter.done():
+                p.waiter.set_result(None)
+
+    def _on_error(self, batch: list[_Pending], exc: Exception) -> None:
+        retry: list[_Pending] = []
+        for p in batch:
+            p.attempts += 1
+            if p.waiter is not None:
+                if not p.waiter.done():  # the caller reports it; no silent retries
+                    p.waiter.set_exception(exc)
+            elif p.attempts < self.max_attempts and not self._stopping:
+                retry.append(p)
+        self.stats.retried += len(retry)
+        self.stats.failed += len(batch) - len(retry)
+        # Back to the front so retried rows keep roughly their original order
+        self._rows.extendleft(reversed(retry))
+        logger.warning(
+            "sentiment_buffer_flush_failed rows=%d requeued=%d",
+            len(batch),
+            len(retry),
+            exc_info=exc,
+        )
+
+    async def _run(self) -> None:
+        while not self._stopping:
+            try:
+                async with asyncio.timeout(self.flush_interval_s):
+                    await self._wake.wait()
+            except TimeoutError:
+                pass
+            self._wake.clear()
+
+            failed_before = self.stats.retried + self.stats.failed
+            while self._rows and not self._stopping:
+                await self.flush_once()
+                if self.stats.retried + self.stats.failed != failed_before:
+                    await asyncio.sleep(self.retry_delay_s)  # DB trouble: don't spin
+                    break
+
+    def start(self) -> None:
+        if self._task is None or self._task.done():
+            self._stopping = False
+            self._wake = asyncio.Event()  # bind to the running loop
+            self._task = asyncio.get_running_loop().create_task(self._run())
+
+    async def stop(self, timeout_s: float = 5.0) -> None:
+        """Stop accepting rows, flush what is queued (bounded by `timeout_s`), drop the rest."""
+        self._stopping = True
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+        if self._flushing is not None:
+            await asyncio.gather(self._flushing, return_exceptions=True)
+        try:
+            async with asyncio.timeout(timeout_s):
+                while await self.flush_once():
+                    pass
+        except TimeoutError:
+            logger.warning("sentiment_buffer_drain_timeout")
+
+        lost = len(self._rows)
+        if lost:
+            logger.error("sentiment_buffer_rows_dropped count=%d", lost)
+            self.stats.failed += lost
+        while self._rows:
+            p = self._rows.popleft()
+            if p.waiter is not None and not p.waiter.done():
+                p.waiter.set_exception(BufferFull("sentiment write buffer shut down"))
+
+    def snapshot(self) -> dict[str, Any]:
+        return {
+            "depth": len(self._rows),
+            "max_rows": self.max_rows,
+            "high_water": self.stats.high_water,
+            "enqueued": self.stats.enqueued,
+            "rejected": self.stats.rejected,
+            "written": self.stats.written,
+            "retried": self.stats.retried,
+            "failed": self.stats.failed,
+            "flush_ms": self.flush_ms.snapshot(),
+            "flush_rows": self.flush_sizes.snapshot(),
+        }
@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+import logging
 from contextlib import asynccontextmanager
 from typing import Any
 
@@ -7,25 +8,30 @@ from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from sqlalchemy import text
 
+from src.ai.faq.executor import shutdown_inference_executor
+from src.ai.faq.outbox import start_outbox, stop_outbox
 from src.api.errors import install_error_handlers
 from src.api.middleware.request_context import RequestContextMiddleware
+from src.api.routes import faq as faq_routes
 from src.api.routes import health as health_routes
+from src.api.routes import sentiment as sentiment_routes
 from src.api.routes.bookings import router as bookings_router
-from src.api.routes.faq import router as faq_router
-from src.api.routes.sentiment import router as sentiment_router
 from src.common.json_logging import setup_json_logging
 from src.config.settings import get_settings
 from src.db.session import dispose_engine, engine
 
 settings = get_settings()
+logger = logging.getLogger("api.app")
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """
     App lifecycle:
-    - Startup: (hook for warmups, migrations triggers, cache, etc.)
-    - Shutdown: dispose SQLAlchemy engine cleanly.
+    - Startup: DB ping, FAQ corpus load + embedder warm-up (best-effort), sentiment
+      write buffer and rollup job (if enabled), handoff outbox worker.
+    - Shutdown: drain FAQ batches, the sentiment write buffer and the handoff outbox,
+      stop the rollup job and the inference executor, dispose SQLAlchemy engine cleanly.
     """
     # Configure JSON logging once
     setup_json_logging(level="INFO" if not settings.debug else "DEBUG")
@@ -39,9 +45,24 @@ async def lifespan(app: FastAPI):
         # the /health endpoint will surface status.
         pass
 
+    try:
+        await faq_routes.warm_up_faq()
+    except Exception:
+        # Model/corpus problems shouldn't take down unrelated routes;
+        # /faq/ask retries the lazy init on first use.
+        logger.warning("faq_warmup_failed", exc_info=True)
+
+    faq_routes.start_faq_watcher()
+    sentiment_routes.start_sentiment()
+    await start_outbox(settings)
+
     yield
 
     # --- shutdown work ---
+    await faq_routes.close_faq()
+    await sentiment_routes.close_sentiment()  # flush buffered rows while the engine is up
+    await stop_outbox()  # after close_faq: flushed batches may still enqueue handoffs
+    shutdown_inference_executor()
     await dispose_engine()
 
 
@@ -63,8 +84,8 @@ def create_app() -> FastAPI:
 
     # Mount routers
     app.include_router(bookings_router)
-    app.include_router(faq_router)
-    app.include_router(sentiment_router)
+    app.include_router(faq_routes.router)
+    app.include_router(sentiment_routes.router)
     app.include_router(health_routes.router)
 
     # Error handlers (consistent JSON envelope)
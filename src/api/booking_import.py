@@ -0,0 +1,225 @@
+from __future__ import annotations
+
+import csv
+import json
+import uuid
+from collections.abc import AsyncIterable, AsyncIterator
+from datetime import UTC, datetime
+from typing import Any, Literal
+
+from pydantic import ValidationError
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.api.schemas.booking import BookingImportError, BookingImportResult, BookingImportRow
+
+ImportFormat = Literal["ndjson", "csv"]
+
+MAX_LINE_BYTES = 64 * 1024
+
+_STAGING = "booking_import_staging"
+_COLUMNS = (
+    "line",
+    "id",
+    "customer_name",
+    "customer_email",
+    "starts_at",
+    "ends_at",
+    "status",
+    "notes",
+)
+
+# Per connection, emptied by every commit; LIKE keeps column types in step with bookings.
+# LIKE copies NOT NULL, so the defaults must come too for the columns COPY leaves out.
+_CREATE_STAGING = text(f"""
+    CREATE TEMP TABLE IF NOT EXISTS {_STAGING} (
+        line integer NOT NULL,
+        LIKE bookings INCLUDING DEFAULTS
+    )
+    ON COMMIT DELETE ROWS
+    """)
+
+# DO NOTHING without a target skips rows hitting the primary key (re-imported ids)
+# and ex_bookings_no_overlap alike; the anti-join reports which lines those were
+_MERGE = text(f"""
+    WITH ins AS (
+        INSERT INTO bookings (id, customer_name, customer_email, starts_at, ends_at, status, notes)
+        SELECT id, customer_name, customer_email, starts_at, ends_at, status, notes
+        FROM {_STAGING}
+        ORDER BY line
+        ON CONFLICT DO NOTHING
+        RETURNING id
+    )
+    SELECT s.line
+    FROM {_STAGING} AS s
+    LEFT JOIN ins USING (id)
+    WHERE ins.id IS NULL
+    ORDER BY s.line
+    """)
+
+_INSERT_STAGING = text(
+    f"INSERT INTO {_STAGING} ({', '.join(_COLUMNS)}) "
+    f"VALUES ({', '.join(':' + c for c in _COLUMNS)})"
+)
+
+
+class _TooLong:
+    """Stands in for a line over MAX_LINE_BYTES (its bytes are dropped, not buffered)."""
+
+
+async def aiter_lines(
+    chunks: AsyncIterable[bytes], max_line_bytes: int = MAX_LINE_BYTES
+) -> AsyncIterator[bytes | _TooLong]:
+    """Split a byte stream into lines, holding at most one line in memory."""
+    buf = b""
+    skipping = False
+    async for chunk in chunks:
+        buf += chunk
+        *lines, buf = buf.split(b"\n")
+        for line in lines:
+            yield _TooLong() if skipping else line
+            skipping = False
+        if len(buf) > max_line_bytes:
+            buf, skipping = b"", True
+    if skipping:
+        yield _TooLong()
+    elif buf:
+        yield buf
+
+
+async def parse_records(
+    lines: AsyncIterable[bytes | _TooLong], fmt: ImportFormat
+) -> AsyncIterator[tuple[int, dict[str, Any] | str]]:
+    """
+    (line number, record) per non-blank line; the record is an error message if
+    the line can't be parsed. CSV needs a header row; quoted fields can't span lines.
+    """
+    header: list[str] | None = None
+    n = 0
+    async for raw in lines:
+        n += 1
+        if isinstance(raw, _TooLong):
+            yield n, f"line longer than {MAX_LINE_BYTES} bytes"
+            continue
+        try:
+            line = raw.decode("utf-8-sig" if n == 1 else "utf-8").rstrip("\r")
+        except UnicodeDecodeError:
+            yield n, "not valid UTF-8"
+            continue
+        if not line.strip():
+            continue
+
+        if fmt == "ndjson":
+            try:
+                obj = json.loads(line)
+            except ValueError as err:
+                yield n, f"invalid JSON: {err}"
+                continue
+            yield n, obj if isinstance(obj, dict) else "expected a JSON object"
+        elif header is None:
+            header = [h.strip() for h in next(csv.reader([line]))]
+        else:
+            values = next(csv.reader([line]))
+            if len(values) != len(header):
+                yield n, f"expected {len(header)} fields, got {len(values)}"
+                continue
+            # Empty cells mean "not given", so optional fields take their defaults
+            yield n, {k: v for k, v in zip(header, values, strict=True) if v != ""}
+
+
+def _describe(err: ValidationError) -> str:
+    return "; ".join(
+        f"{'.'.join(map(str, e['loc']))}: {e['msg']}" if e["loc"] else e["msg"]
+        for e in err.errors()
+    )
+
+
+def _utc(ts: datetime) -> datetime:
+    return ts.replace(tzinfo=UTC) if ts.tzinfo is None else ts
+
+
+async def _load_chunk(db: AsyncSession, rows: list[dict[str, Any]]) -> list[int]:
+    """Stage `rows`, merge them into bookings and commit; returns the lines skipped."""
+    await db.execute(_CREATE_STAGING)
+    if db.get_bind().dialect.driver == "asyncpg":
+        conn = await db.connection()
+        raw = await conn.get_raw_connection()
+        await raw.driver_connection.copy_records_to_table(
+            _STAGING,
+            records=[tuple(r[c] for c in _COLUMNS) for r in rows],
+            columns=list(_COLUMNS),
+        )
+    else:
+        await db.execute(_INSERT_STAGING, rows)
+    skipped = list((await db.execute(_MERGE)).scalars())
+    await db.commit()  # also empties the staging table
+    return skipped
+
+
+async def import_bookings(
+    db: AsyncSession,
+    records: AsyncIterable[tuple[int, dict[str, Any] | str]],
+    chunk_rows: int = 5_000,
+    max_errors: int = 1_000,
+    result: BookingImportResult | None = None,
+) -> BookingImportResult:
+    """
+    Validate records with BookingImportRow and load the valid ones `chunk_rows`
+    at a time: COPY into a temp staging table, then one INSERT ... SELECT ...
+    ON CONFLICT DO NOTHING into bookings, committed per chunk. Bad rows and rows
+    that clash with existing bookings are reported by line; they never fail the
+    rest. Memory holds one chunk, whatever the input size. Pass `result` to
+    see how far an import got if it raises (earlier chunks stay committed).
+    """
+    result = result if result is not None else BookingImportResult()
+
+    def reject(line: int, error: str) -> None:
+        result.rejected += 1
+        if len(result.errors) < max_errors:
+            result.errors.append(BookingImportError(line=line, error=error))
+        else:
+            result.errors_truncated = True
+
+    async def flush(chunk: list[dict[str, Any]]) -> None:
+        skipped = set(await _load_chunk(db, chunk))
+        result.inserted += len(chunk) - len(skipped)
+        for line in sorted(skipped):
+            reject(line, "conflicts with an existing booking (same id or overlapping time)")
+
+    chunk: list[dict[str, Any]] = []
+    chunk_ids: set[uuid.UUID] = set()
+    async for line, record in records:
+        result.received += 1
+        if isinstance(record, str):
+            reject(line, record)
+            continue
+        try:
+            row = BookingImportRow.model_validate(record)
+        except ValidationError as err:
+            reject(line, _describe(err))
+            continue
+
+        booking_id = row.id or uuid.uuid4()
+        if booking_id in chunk_ids:  # the anti-join can't tell two lines with one id apart
+            reject(line, "duplicate id in this import")
+            continue
+        chunk_ids.add(booking_id)
+        chunk.append(
+            {
+                "line": line,
+                "id": booking_id,
+                "customer_name": row.customer_name,
+                "customer_email": row.customer_email,
+                "starts_at": _utc(row.starts_at),
+                "ends_at": _utc(row.ends_at),
+                "status": row.status.value,
+                "notes": row.notes,
+            }
+        )
+        if len(chunk) >= chunk_rows:
+            await flush(chunk)
+            chunk, chunk_ids = [], set()
+
+    if chunk:
+        await flush(chunk)
+    return result
@@ -54,18 +54,22 @@ async def on_http_exception(request: Request, exc: StarletteHTTPException) -> JS
     Handles FastAPI/Starlette HTTPException.
     4xx -> type "http_error"
     5xx -> type "internal_server_error" (to satisfy tests/ops expectations)
+    Headers set on the exception (e.g. Retry-After) are preserved.
     """
     rid = _get_request_id(request)
     type_ = "internal_server_error" if exc.status_code >= 500 else "http_error"
     title = "HTTP Error" if isinstance(exc.detail, dict) else str(exc.detail)
     logger.warning("http_error", exc_info=exc)
-    return _envelope(
+    resp = _envelope(
         request_id=rid,
         type_=type_,
         title=title,
         detail=title,
         status_code=exc.status_code,
     )
+    for k, v in (getattr(exc, "headers", None) or {}).items():
+        resp.headers.setdefault(k, v)
+    return resp
 
 
 async def on_validation_error(request: Request, exc: RequestValidationError) -> JSONResponse:
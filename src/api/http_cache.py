@@ -0,0 +1,56 @@
+# src/api/http_cache.py
+from __future__ import annotations
+
+import hashlib
+
+from fastapi import Request, Response, status
+
+
+def make_etag(body: str | bytes) -> str:
+    """Strong validator from the serialised response body (identical JSON -> identical tag)."""
+    data = body.encode("utf-8") if isinstance(body, str) else body
+    return '"' + hashlib.sha256(data).hexdigest()[:32] + '"'
+
+
+def etag_matches(request: Request, etag: str) -> bool:
+    """True if the client's If-None-Match already names `etag` (weak comparison, RFC 9110)."""
+    header = request.headers.get("if-none-match")
+    if not header:
+        return False
+    if header.strip() == "*":
+        return True
+    tags = {t.strip().removeprefix("W/") for t in header.split(",")}
+    return etag in tags
+
+
+def version_etag(version: int) -> str:
+    """Strong validator for a row carrying a version counter."""
+    return f'"{version}"'
+
+
+def if_match_versions(request: Request) -> list[int] | None:
+    """
+    Versions named by If-Match, or None when absent or "*" (no precondition).
+    Weak and non-numeric tags can never match (strong comparison, RFC 9110), so
+    they are dropped; an empty list means the precondition fails.
+    """
+    header = request.headers.get("if-match")
+    if header is None or header.strip() == "*":
+        return None
+    versions = []
+    for tag in (t.strip() for t in header.split(",")):
+        value = tag.strip('"')
+        if not tag.startswith("W/") and value.isdigit():
+            versions.append(int(value))
+    return versions
+
+
+def cache_headers(etag: str, cache_control: str = "no-cache") -> dict[str, str]:
+    # no-cache: clients may store the body but must revalidate, which is a cheap 304
+    return {"ETag": etag, "Cache-Control": cache_control}
+
+
+def not_modified(etag: str, cache_control: str = "no-cache") -> Response:
+    return Response(
+        status_code=status.HTTP_304_NOT_MODIFIED, headers=cache_headers(etag, cache_control)
+    )
@@ -1,17 +1,42 @@
 from __future__ import annotations
 
+import base64
+import binascii
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+from datetime import UTC, datetime, timedelta
 from typing import Annotated
 from uuid import UUID
 
-from fastapi import APIRouter, Depends, HTTPException, Query, status
-from sqlalchemy import select
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response, status
+from sqlalchemy import Select, delete, select, text, tuple_, update
+from sqlalchemy.exc import IntegrityError, SQLAlchemyError
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from src.api.schemas.booking import BookingCreate, BookingOut, BookingUpdate
-from src.db.models.booking import Booking, BookingStatus
+from src.api.booking_import import ImportFormat, aiter_lines, import_bookings, parse_records
+from src.api.http_cache import if_match_versions, version_etag
+from src.api.schemas.booking import (
+    MAX_AVAILABILITY_WINDOW,
+    BookingAvailability,
+    BookingCreate,
+    BookingImportResult,
+    BookingOut,
+    BookingUpdate,
+    TimeSlot,
+)
+from src.config.settings import get_settings
+from src.db.models.booking import NO_OVERLAP_CONSTRAINT, Booking, BookingStatus
 from src.db.session import get_db
 
 router = APIRouter(prefix="/bookings", tags=["bookings"])
+settings = get_settings()
+
+_IMPORT_FORMATS: dict[str, ImportFormat] = {
+    "application/x-ndjson": "ndjson",
+    "application/ndjson": "ndjson",
+    "application/jsonl": "ndjson",
+    "text/csv": "csv",
+}
 
 
 async def _get_booking_or_404(db: AsyncSession, booking_id: UUID) -> Booking:
@@ -23,12 +48,127 @@ async def _get_booking_or_404(db: AsyncSession, booking_id: UUID) -> Booking:
     return obj
 
 
+@asynccontextmanager
+async def _overlap_as_409(db: AsyncSession) -> AsyncIterator[None]:
+    """
+    Wrap an INSERT/UPDATE; an overlap caught by ex_bookings_no_overlap becomes 409.
+    The write is the check, so there is no read-then-write race to lock against.
+    """
+    try:
+        yield
+    except IntegrityError as err:
+        await db.rollback()
+        if getattr(err.orig, "pgcode", None) == "23P01" or NO_OVERLAP_CONSTRAINT in str(err):
+            raise HTTPException(
+                status_code=status.HTTP_409_CONFLICT,
+                detail="Booking overlaps an existing booking.",
+            ) from err
+        raise
+
+
+async def _missing_or_stale(
+    db: AsyncSession, booking_id: UUID, versions: list[int] | None
+) -> HTTPException:
+    """
+    A single-statement write matched no row: 404, or 412 if the booking exists but
+    If-Match named an old version. Only this failure path costs a second query.
+    """
+    current = None
+    if versions is not None:
+        current = await db.scalar(select(Booking.version).where(Booking.id == booking_id))
+    if current is None:
+        return HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Booking not found")
+    return HTTPException(
+        status_code=status.HTTP_412_PRECONDITION_FAILED,
+        detail="Booking was changed since it was read; fetch it again and retry.",
+        headers={"ETag": version_etag(current)},
+    )
+
+
+# Gaps in [lo, hi) not covered by a live booking. The overlap filter matches the
+# exclusion constraint's expression and predicate, so only bookings touching the
+# window are read, via its GiST index.
+_FREE_SLOTS = text("""
+    SELECT lower(f) AS starts_at, upper(f) AS ends_at
+    FROM unnest(
+        tstzmultirange(tstzrange(CAST(:lo AS timestamptz), CAST(:hi AS timestamptz), '[)'))
+        - coalesce(
+            (SELECT range_agg(tstzrange(starts_at, ends_at, '[)'))
+             FROM bookings
+             WHERE status <> 'cancelled'
+               AND tstzrange(starts_at, ends_at, '[)')
+                   && tstzrange(CAST(:lo AS timestamptz), CAST(:hi AS timestamptz), '[)')),
+            '{}'::tstzmultirange
+        )
+    ) AS f
+    WHERE upper(f) - lower(f) >= :min_length
+    ORDER BY 1
+    """)
+
+
+async def free_slots(
+    db: AsyncSession, start: datetime, end: datetime, min_length: timedelta
+) -> list[tuple[datetime, datetime]]:
+    """(starts_at, ends_at) of every free gap in [start, end) at least `min_length` long."""
+    res = await db.execute(_FREE_SLOTS, {"lo": start, "hi": end, "min_length": min_length})
+    return [(lo, hi) for lo, hi in res.all()]
+
+
+def encode_cursor(created_at: datetime, booking_id: UUID) -> str:
+    """Opaque page token for the row a page ended on."""
+    raw = f"{created_at.isoformat()}|{booking_id}".encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> tuple[datetime, UUID]:
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)).decode()
+        created_at, booking_id = raw.split("|")
+        ts = datetime.fromisoformat(created_at)
+        if ts.tzinfo is None:
+            raise ValueError("cursor timestamp must be timezone-aware")
+        return ts, UUID(booking_id)
+    except (binascii.Error, UnicodeDecodeError, ValueError) as err:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY, detail="Invalid cursor."
+        ) from err
+
+
+def page_query(
+    limit: int,
+    cursor: tuple[datetime, UUID] | None = None,
+    offset: int | None = None,
+    email: str | None = None,
+    status_: BookingStatus | None = None,
+) -> Select[tuple[Booking]]:
+    """
+    Newest first, with id as tie-breaker so the order is total. A cursor seeks
+    straight past the previous page via ix_bookings_created_at_id, so every page
+    costs the same; OFFSET (legacy) makes Postgres walk and discard the skipped rows.
+    Fetches one extra row to tell whether another page follows.
+    """
+    stmt = select(Booking).order_by(Booking.created_at.desc(), Booking.id.desc())
+    if cursor is not None:
+        stmt = stmt.where(tuple_(Booking.created_at, Booking.id) < tuple_(*cursor))
+    if email:
+        stmt = stmt.where(Booking.customer_email == email)
+    if status_:
+        stmt = stmt.where(Booking.status == status_)
+    if offset:
+        stmt = stmt.offset(offset)
+    return stmt.limit(limit + 1)
+
+
 @router.post("", response_model=BookingOut, status_code=status.HTTP_201_CREATED)
 async def create_booking(
     payload: BookingCreate,
+    response: Response,
     db: Annotated[AsyncSession, Depends(get_db)],
 ):
-    """Create a booking. DB assigns timestamps; we default status to 'pending'."""
+    """
+    Create a booking. DB assigns timestamps (returned by the INSERT itself, see
+    Booking.__mapper_args__); we default status to 'pending'.
+    """
     obj = Booking(
         customer_name=payload.customer_name,
         customer_email=payload.customer_email,
@@ -38,68 +178,189 @@ async def create_booking(
         notes=payload.notes,
     )
     db.add(obj)
-    await db.flush()
-    await db.refresh(obj)
+    async with _overlap_as_409(db):
+        await db.flush()
+    response.headers["ETag"] = version_etag(obj.version)
     return obj
 
 
+@router.post(
+    ":bulk",
+    response_model=BookingImportResult,
+    summary="Import many bookings from an NDJSON or CSV upload",
+)
+async def import_bookings_bulk(
+    request: Request,
+    db: Annotated[AsyncSession, Depends(get_db)],
+) -> BookingImportResult:
+    """
+    Stream the body (Content-Type application/x-ndjson or text/csv with a header
+    row) and load it in chunks via COPY into a staging table plus one merge
+    statement per chunk. Invalid rows and rows clashing with existing bookings are
+    listed by line; everything else is imported. Rows may carry `id` and `status`;
+    re-sending a file with ids skips the rows already imported.
+    """
+    content_type = request.headers.get("content-type", "").split(";")[0].strip().lower()
+    fmt = _IMPORT_FORMATS.get(content_type)
+    if fmt is None:
+        raise HTTPException(
+            status_code=status.HTTP_415_UNSUPPORTED_MEDIA_TYPE,
+            detail=f"Send one of: {', '.join(_IMPORT_FORMATS)}.",
+        )
+
+    result = BookingImportResult()
+    try:
+        await import_bookings(
+            db,
+            parse_records(aiter_lines(request.stream()), fmt),
+            chunk_rows=settings.booking_import_chunk_rows,
+            max_errors=settings.booking_import_max_errors,
+            result=result,
+        )
+    except SQLAlchemyError as err:
+        await db.rollback()
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Import failed after {result.inserted} bookings were committed.",
+        ) from err
+    return result
+
+
+@router.get("/availability", response_model=BookingAvailability)
+async def get_availability(
+    db: Annotated[AsyncSession, Depends(get_db)],
+    start: Annotated[datetime, Query(alias="from", description="Inclusive; naive = UTC")],
+    end: Annotated[datetime, Query(alias="to", description="Exclusive; naive = UTC")],
+    min_minutes: Annotated[int, Query(ge=0, description="Drop gaps shorter than this")] = 0,
+) -> BookingAvailability:
+    """
+    Free time between non-cancelled bookings in [from, to). Computed in one query
+    (range_agg over the bookings overlapping the window, subtracted from it), so
+    cost follows the bookings in the window, not the table.
+    """
+    start = start.replace(tzinfo=UTC) if start.tzinfo is None else start
+    end = end.replace(tzinfo=UTC) if end.tzinfo is None else end
+    if end <= start:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail="'to' must be after 'from'.",
+        )
+    if end - start > MAX_AVAILABILITY_WINDOW:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail=f"Window is longer than {MAX_AVAILABILITY_WINDOW.days} days.",
+        )
+
+    slots = await free_slots(db, start, end, timedelta(minutes=min_minutes))
+    return BookingAvailability(
+        start=start, end=end, free=[TimeSlot(starts_at=lo, ends_at=hi) for lo, hi in slots]
+    )
+
+
 @router.get("/{booking_id}", response_model=BookingOut)
 async def get_booking(
     booking_id: UUID,
+    response: Response,
     db: Annotated[AsyncSession, Depends(get_db)],
 ):
-    """Read a single booking by id."""
-    return await _get_booking_or_404(db, booking_id)
+    """Read a single booking by id. The ETag is its version, for If-Match on writes."""
+    obj = await _get_booking_or_404(db, booking_id)
+    response.headers["ETag"] = version_etag(obj.version)
+    return obj
 
 
 @router.get("", response_model=list[BookingOut])
 async def list_bookings(
+    request: Request,
+    response: Response,
     db: Annotated[AsyncSession, Depends(get_db)],
     limit: Annotated[int, Query(ge=1, le=200)] = 50,
-    offset: Annotated[int, Query(ge=0)] = 0,
+    cursor: Annotated[str | None, Query(description="X-Next-Cursor from the previous page")] = None,
+    offset: Annotated[
+        int | None, Query(ge=0, description="Legacy; slow on deep pages, prefer cursor")
+    ] = None,
     email: Annotated[str | None, Query(description="Filter by customer email")] = None,
     status_: Annotated[
         BookingStatus | None,
         Query(alias="status", description="Filter by status"),
     ] = None,
 ):
-    """List bookings with simple pagination and optional filters."""
-    stmt = select(Booking).order_by(Booking.created_at.desc()).limit(limit).offset(offset)
-    if email:
-        stmt = stmt.where(Booking.customer_email == email)
-    if status_:
-        stmt = stmt.where(Booking.status == status_)
-    result = await db.execute(stmt)
-    return list(result.scalars())
+    """
+    List bookings newest first with optional filters. The body stays a plain list;
+    when more rows follow, the next page's cursor comes in `X-Next-Cursor` and as a
+    `Link: <...>; rel="next"` URL (keyset pagination). `offset` still works but
+    can't be combined with `cursor`.
+    """
+    if cursor is not None and offset:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail="Use either cursor or offset, not both.",
+        )
+    after = decode_cursor(cursor) if cursor is not None else None
+    result = await db.execute(page_query(limit, after, offset, email, status_))
+    rows = list(result.scalars())
+
+    if len(rows) > limit:
+        rows = rows[:limit]
+        next_cursor = encode_cursor(rows[-1].created_at, rows[-1].id)
+        next_url = request.url.remove_query_params("offset").include_query_params(
+            cursor=next_cursor
+        )
+        response.headers["X-Next-Cursor"] = next_cursor
+        response.headers["Link"] = f'<{next_url}>; rel="next"'
+    return rows
 
 
 @router.patch("/{booking_id}", response_model=BookingOut)
 async def update_booking(
     booking_id: UUID,
     payload: BookingUpdate,
+    request: Request,
+    response: Response,
     db: Annotated[AsyncSession, Depends(get_db)],
 ):
-    """Partial update; only provided fields change. Returns the updated row."""
-    obj = await _get_booking_or_404(db, booking_id)
-
-    # Dump only provided fields
+    """
+    Partial update; only provided fields change. One UPDATE ... RETURNING, with
+    no prior SELECT. With If-Match, it applies only while the row still has that
+    version (else 412), so concurrent editors need no row locks.
+    """
+    bookings = Booking.__table__
     data = payload.model_dump(exclude_unset=True)
+    versions = if_match_versions(request)
 
-    # Apply changes
-    for field, value in data.items():
-        setattr(obj, field, value)
+    if data:
+        stmt = (
+            update(bookings)
+            .values(**data, version=bookings.c.version + 1)  # updated_at via onupdate
+            .returning(*bookings.c)
+        )
+    else:  # nothing to change: still honour 404 / If-Match
+        stmt = select(bookings)
+    stmt = stmt.where(bookings.c.id == booking_id)
+    if versions is not None:
+        stmt = stmt.where(bookings.c.version.in_(versions))
 
-    await db.flush()
-    await db.refresh(obj)
-    return obj
+    async with _overlap_as_409(db):
+        row = (await db.execute(stmt)).mappings().first()
+    if row is None:
+        raise await _missing_or_stale(db, booking_id, versions)
+    response.headers["ETag"] = version_etag(row["version"])
+    return dict(row)
 
 
 @router.delete("/{booking_id}", status_code=status.HTTP_204_NO_CONTENT)
 async def delete_booking(
     booking_id: UUID,
+    request: Request,
     db: Annotated[AsyncSession, Depends(get_db)],
 ):
-    """Delete a booking. Returns 204 on success."""
-    _ = await _get_booking_or_404(db, booking_id)
-    await db.delete(_)
+    """Delete a booking in one DELETE ... RETURNING id; honours If-Match. 204 on success."""
+    bookings = Booking.__table__
+    versions = if_match_versions(request)
+
+    stmt = delete(bookings).where(bookings.c.id == booking_id).returning(bookings.c.id)
+    if versions is not None:
+        stmt = stmt.where(bookings.c.version.in_(versions))
+    if (await db.execute(stmt)).scalar_one_or_none() is None:
+        raise await _missing_or_stale(db, booking_id, versions)
     return None
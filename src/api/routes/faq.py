@@ -1,67 +1,448 @@
 from __future__ import annotations
 
+import asyncio
+import logging
+import secrets
+from dataclasses import dataclass
+from pathlib import Path
+
 import numpy as np
-from fastapi import APIRouter
+from fastapi import APIRouter, Header, HTTPException, status
 
-from src.ai.faq.data_loader import load_faqs
+from src.ai.faq.batcher import MicroBatcher
+from src.ai.faq.cache import LRUCache, normalize_question
+from src.ai.faq.corpus import CorpusSnapshot, FileWatcher, corpus_version, diff_corpus
+from src.ai.faq.data_loader import load_faqs, rows_for_tags
 from src.ai.faq.decision import should_handoff
-from src.ai.faq.embedder import MiniLMEmbedder, load_or_build_embeddings
-from src.ai.faq.notify import FAQContext, send_handoff_email
-from src.ai.faq.retriever import cosine_top1, score_from_cosine
-from src.api.schemas.faq import FAQAnswer, FAQAskRequest, FAQHandoff
+from src.ai.faq.embedder import (
+    MiniLMEmbedder,
+    embedder_stats,
+    encode_in_worker,
+    get_embedder,
+    load_or_build_embeddings,
+    warm_up_embedder,
+)
+from src.ai.faq.executor import (
+    InferenceSaturated,
+    InferenceTimeout,
+    get_inference_executor,
+)
+from src.ai.faq.notify import FAQContext, HandoffItem
+from src.ai.faq.outbox import enqueue_handoff_digest, enqueue_handoff_email, get_outbox
+from src.ai.faq.retriever import score_from_cosine
+from src.api.schemas.faq import (
+    FAQAnswer,
+    FAQAskRequest,
+    FAQBatchAskRequest,
+    FAQBatchAskResponse,
+    FAQCandidate,
+    FAQHandoff,
+)
 from src.config.settings import get_settings
 
 router = APIRouter(prefix="/faq", tags=["faq"])
 settings = get_settings()
+logger = logging.getLogger("api.faq")
+
+_FAQ_PATH = Path("data/faqs.yaml")
 
 # --- Lazy-initialised state (safe for tests) ---
 _FAQS: list | None = None
 _DOC_EMB: np.ndarray | None = None
 _EMBEDDER: MiniLMEmbedder | None = None
+_SNAPSHOT: CorpusSnapshot | None = None  # immutable view of _FAQS/_DOC_EMB + their indexes
+_BATCHER: MicroBatcher[_Query, list[tuple[int, float]]] | None = None
+# Caches carry the object they were built against and are cleared when it changes
+_EMB_CACHE: tuple[object, LRUCache[np.ndarray]] | None = None  # (embedder, text -> vector)
+_RESULT_CACHE: tuple[tuple, LRUCache[list[tuple[int, float]]]] | None = None  # (corpus, hits)
+_WATCHER: FileWatcher | None = None
+_RELOAD_LOCK = asyncio.Lock()
+
+
+@dataclass(frozen=True)
+class _Query:
+    question: str
+    k: int = 1
+    rows: np.ndarray | None = None  # restrict to these FAQ rows (tag filter)
+    snap: CorpusSnapshot | None = None  # corpus the rows/hits refer to
+
+
+def _build_snapshot(faqs: list, doc_emb: np.ndarray) -> CorpusSnapshot:
+    return CorpusSnapshot.build(
+        faqs,
+        doc_emb,
+        backend=settings.faq_index_backend,
+        n_lists=settings.faq_ivf_lists,
+        n_probe=settings.faq_ivf_probe,
+    )
+
+
+def _snapshot() -> CorpusSnapshot:
+    """
+    The corpus snapshot requests should use. Rebuilt if _FAQS/_DOC_EMB were
+    replaced directly (tests monkeypatch them); reloads swap all three at once.
+    """
+    global _SNAPSHOT
+    if _SNAPSHOT is None or _SNAPSHOT.faqs is not _FAQS or _SNAPSHOT.doc_emb is not _DOC_EMB:
+        _SNAPSHOT = _build_snapshot(_FAQS or [], _DOC_EMB)  # type: ignore[arg-type]
+    return _SNAPSHOT
+
+
+def _new_cache() -> LRUCache:
+    return LRUCache(
+        max_entries=settings.faq_cache_max_entries,
+        max_bytes=settings.faq_cache_max_bytes,
+        ttl_s=settings.faq_cache_ttl_s,
+    )
+
+
+def _emb_cache() -> LRUCache[np.ndarray]:
+    """Question-embedding cache for the bound model (reset if the embedder changes)."""
+    global _EMB_CACHE
+    if _EMB_CACHE is None or _EMB_CACHE[0] is not _EMBEDDER:
+        _EMB_CACHE = (_EMBEDDER, _new_cache())
+    return _EMB_CACHE[1]
+
+
+def _result_cache(snap: CorpusSnapshot) -> LRUCache[list[tuple[int, float]]]:
+    """Top-k result cache for one corpus snapshot + model (reset when either changes)."""
+    global _RESULT_CACHE
+    version = (snap, _EMBEDDER)
+    stale = _RESULT_CACHE is None or any(
+        old is not new for old, new in zip(_RESULT_CACHE[0], version, strict=True)
+    )
+    if stale:
+        _RESULT_CACHE = (version, _new_cache())
+    return _RESULT_CACHE[1]
+
+
+def _result_key(req: FAQAskRequest) -> tuple:
+    return (normalize_question(req.question), req.k or 1, tuple(sorted(req.tags or ())))
 
 
-@router.on_event("startup")
 async def _warm_faq_state() -> None:
     global _FAQS, _DOC_EMB, _EMBEDDER
     # Only initialise if not already set (helps tests that monkeypatch state)
     if _FAQS is None or _DOC_EMB is None:
-        _FAQS = load_faqs()
+        _FAQS = load_faqs(_FAQ_PATH)
         qs = [f.question for f in _FAQS]
-        _DOC_EMB, used_cache = load_or_build_embeddings(qs)
-        _EMBEDDER = None if used_cache else MiniLMEmbedder()
+        _DOC_EMB, _ = load_or_build_embeddings(qs)
+        _snapshot()
+    # Always bind the process-wide model, even when corpus vectors came from cache
+    if _EMBEDDER is None:
+        _EMBEDDER = get_embedder()
+
+
+async def warm_up_faq() -> None:
+    """
+    Lifespan hook: load the corpus, bind the shared embedder and run one dummy
+    encode so the first real /faq/ask doesn't pay model start-up costs.
+    """
+    await _warm_faq_state()
+    warm_up_embedder(_EMBEDDER)
+
+
+async def _encode(texts: list[str]) -> np.ndarray:
+    """
+    Encode on the inference executor so the event loop keeps serving other routes.
+    Maps executor back-pressure to HTTP: 429 when saturated, 503 on timeout.
+    """
+    executor = get_inference_executor(settings)
+    # Process workers hold their own model; threads share the bound embedder
+    fn = encode_in_worker if executor.use_processes else _EMBEDDER.encode  # type: ignore[union-attr]
+    try:
+        return await executor.run(fn, texts)
+    except InferenceSaturated as err:
+        raise HTTPException(
+            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+            detail="FAQ inference is saturated; retry shortly.",
+            headers={"Retry-After": "1"},
+        ) from err
+    except InferenceTimeout as err:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="FAQ inference timed out.",
+            headers={"Retry-After": "1"},
+        ) from err
+
+
+async def _encode_cached(texts: list[str]) -> np.ndarray:
+    """
+    _encode with the question-embedding cache in front: repeated questions (after
+    case/whitespace folding) skip the model, and the misses go out as one call.
+    """
+    cache = _emb_cache()
+    keys = [normalize_question(t) for t in texts]
+    vecs: dict[str, np.ndarray] = {}
+    missing: dict[str, str] = {}  # key -> first original text, dedupes within the batch
+    for key, text in zip(keys, texts, strict=True):
+        if key in vecs or key in missing:
+            continue
+        hit = cache.get(key)
+        if hit is None:
+            missing[key] = text
+        else:
+            vecs[key] = hit
+
+    if missing:
+        enc = await _encode(list(missing.values()))
+        for key, row in zip(missing, enc, strict=True):
+            vec = np.array(row, copy=True)  # don't pin the whole batch matrix
+            vec.flags.writeable = False
+            cache.put(key, vec)
+            vecs[key] = vec
+    return np.vstack([vecs[k] for k in keys])
+
+
+async def _topk_batch(queries: list[_Query]) -> list[list[tuple[int, float]]]:
+    """Encode a micro-batch in one call and search each query against its own snapshot."""
+    q_mat = await _encode_cached([q.question for q in queries])
+    # Normally one group; two only if a reload landed while the batch was filling
+    groups: dict[int, list[int]] = {}
+    for i, q in enumerate(queries):
+        groups.setdefault(id(q.snap), []).append(i)
+
+    out: list[list[tuple[int, float]]] = [[] for _ in queries]
+    for rows in groups.values():
+        snap = queries[rows[0]].snap or _snapshot()
+        hits = snap.index.search(
+            q_mat[rows], [queries[i].k for i in rows], [queries[i].rows for i in rows]
+        )
+        for i, h in zip(rows, hits, strict=True):
+            out[i] = h
+    return out
+
+
+def _get_batcher() -> MicroBatcher[_Query, list[tuple[int, float]]]:
+    global _BATCHER
+    if _BATCHER is None:
+        _BATCHER = MicroBatcher(
+            _topk_batch,
+            max_batch=settings.faq_batch_max_size,
+            max_wait_ms=settings.faq_batch_max_wait_ms,
+        )
+    return _BATCHER
+
+
+def _candidates(snap: CorpusSnapshot, hits: list[tuple[int, float]]) -> list[FAQCandidate]:
+    out = []
+    for idx, cosine in hits:
+        item = snap.faqs[idx]
+        out.append(
+            FAQCandidate(
+                source_id=item.id,
+                question=item.question,
+                answer=item.answer,
+                score=score_from_cosine(cosine),
+            )
+        )
+    return out
+
+
+async def close_faq() -> None:
+    """Lifespan hook: stop the watcher, flush queued questions before the executor goes away."""
+    global _WATCHER
+    if _WATCHER is not None:
+        await _WATCHER.stop()
+        _WATCHER = None
+    if _BATCHER is not None:
+        await _BATCHER.aclose()
+
+
+async def reload_faqs(path: Path | None = None) -> dict:
+    """
+    Re-read the FAQ YAML and atomically swap in a new corpus snapshot.
+
+    Only questions whose text is new are sent to the model (on the inference
+    executor); the matrix is assembled from the embedding cache and the index
+    rebuilt in a worker thread. The swap itself is a single synchronous step,
+    so in-flight requests keep the snapshot they started with.
+    """
+    global _FAQS, _DOC_EMB, _SNAPSHOT
+    path = path or _FAQ_PATH
+    async with _RELOAD_LOCK:
+        if _FAQS is None or _DOC_EMB is None or _EMBEDDER is None:
+            await _warm_faq_state()
+        old = _snapshot()
+        faqs = await asyncio.to_thread(load_faqs, path)
+        diff = diff_corpus(old.faqs, faqs)
+        if corpus_version(faqs) == old.version:
+            return {**old.info(), "reloaded": False, "changes": diff.summary()}
+
+        fresh: dict[str, np.ndarray] = {}
+        if diff.new_questions:
+            vecs = await _encode(diff.new_questions)
+            fresh.update(zip(diff.new_questions, vecs, strict=True))
+        embedder = _EMBEDDER
+
+        def encode(texts: list[str]) -> np.ndarray:
+            # Rows missing from the on-disk cache: normally all precomputed above
+            todo = [t for t in texts if t not in fresh]
+            if todo:
+                fresh.update(zip(todo, embedder.encode(todo), strict=True))  # type: ignore[union-attr]
+            return np.vstack([fresh[t] for t in texts])
+
+        def build() -> CorpusSnapshot:
+            doc_emb, _ = load_or_build_embeddings(
+                [f.question for f in faqs],
+                encode=encode,
+                model_name=getattr(embedder, "model_name", None),
+            )
+            return _build_snapshot(faqs, doc_emb)
+
+        snap = await asyncio.to_thread(build)
+        _FAQS, _DOC_EMB, _SNAPSHOT = snap.faqs, snap.doc_emb, snap
+    logger.info(
+        "faq_corpus_reloaded version=%s previous=%s changes=%s",
+        snap.version,
+        old.version,
+        diff.summary(),
+    )
+    return {**snap.info(), "reloaded": True, "changes": diff.summary()}
+
+
+def start_faq_watcher() -> None:
+    """Lifespan hook: hot-reload the corpus when the YAML changes (if polling is enabled)."""
+    global _WATCHER
+    if settings.faq_reload_poll_s and _WATCHER is None:
+        _WATCHER = FileWatcher(_FAQ_PATH, reload_faqs, interval_s=settings.faq_reload_poll_s)
+        _WATCHER.start()
+
+
+def _decide(
+    snap: CorpusSnapshot, req: FAQAskRequest, hits: list[tuple[int, float]]
+) -> tuple[FAQAnswer | FAQHandoff, HandoffItem | None]:
+    """Answer-or-handoff for one question; the HandoffItem (if any) feeds the email."""
+    candidates = _candidates(snap, hits) if req.k else None
+
+    if not hits:
+        # Tag filter matched no FAQs: nothing to answer from or to cite in an email
+        return (
+            FAQHandoff(handoff=True, score=0.0, question=req.question, candidates=candidates),
+            None,
+        )
+
+    idx, cosine = hits[0]
+    score = score_from_cosine(cosine)
+    item = snap.faqs[idx]
+
+    # Threshold check
+    if should_handoff(score, settings.faq_confidence_threshold):
+        ctx = FAQContext(id=item.id, question=item.question, answer=item.answer)
+        handoff = FAQHandoff(
+            handoff=True, score=score, question=req.question, candidates=candidates
+        )
+        return handoff, HandoffItem(user_question=req.question, top_faq=ctx, score=score)
+
+    # Confident -> return curated answer
+    return (
+        FAQAnswer(answer=item.answer, score=score, source_id=item.id, candidates=candidates),
+        None,
+    )
+
+
+def _rows_for(snap: CorpusSnapshot, req: FAQAskRequest) -> np.ndarray | None:
+    return rows_for_tags(snap.tag_index, req.tags) if req.tags else None
 
 
 @router.post(
     "/ask",
     response_model=FAQAnswer | FAQHandoff,  # can return either shape
+    response_model_exclude_none=True,  # `candidates` only when k was requested
 )
 async def ask(req: FAQAskRequest):
     # init-on-first-call fallback (for tests that don’t run startup)
-    global _FAQS, _DOC_EMB, _EMBEDDER
-    if _FAQS is None or _DOC_EMB is None:
+    if _FAQS is None or _DOC_EMB is None or _EMBEDDER is None:
         await _warm_faq_state()  # type: ignore[misc]
 
-    if _EMBEDDER is None:
-        q_emb = MiniLMEmbedder().encode([req.question])[0]
-    else:
-        q_emb = _EMBEDDER.encode([req.question])[0]
+    snap = _snapshot()
+    cache = _result_cache(snap) if settings.faq_result_cache_enabled else None
+    key = _result_key(req)
+    hits = cache.get(key) if cache is not None else None
+    if hits is None:
+        hits = await _get_batcher().submit(
+            _Query(req.question, k=req.k or 1, rows=_rows_for(snap, req), snap=snap)
+        )
+        if cache is not None:
+            cache.put(key, hits)
+    result, handoff = _decide(snap, req, hits)
 
-    idx, cosine = cosine_top1(q_emb, _DOC_EMB)  # type: ignore[arg-type]
-    score = score_from_cosine(cosine)
+    if handoff is not None:
+        # Queued, not sent: SMTP latency/outages never reach the request path
+        _ = await enqueue_handoff_email(
+            settings=settings,
+            user_question=handoff.user_question,
+            top_faq=handoff.top_faq,
+            score=handoff.score,
+            threshold=settings.faq_confidence_threshold,
+        )
+    return result
 
-    # Threshold check
-    if should_handoff(score, settings.faq_confidence_threshold):  # CHANGED
-        item = _FAQS[idx]  # type: ignore[index]
-        ctx = FAQContext(id=item.id, question=item.question, answer=item.answer)
-        _ = send_handoff_email(
+
+@router.post(
+    "/ask:batch",
+    response_model=FAQBatchAskResponse,
+    response_model_exclude_none=True,
+    summary="Answer many FAQ questions in one call",
+)
+async def ask_batch(req: FAQBatchAskRequest) -> FAQBatchAskResponse:
+    """
+    Bulk variant of /faq/ask for ingestion/replay jobs: all questions are encoded
+    in one model call and scored in one search, results come back in request order,
+    and any handoffs are summarised in a single digest email.
+    """
+    if _FAQS is None or _DOC_EMB is None or _EMBEDDER is None:
+        await _warm_faq_state()  # type: ignore[misc]
+
+    snap = _snapshot()
+    q_mat = await _encode_cached([it.question for it in req.items])
+    all_hits = snap.index.search(
+        q_mat, [it.k or 1 for it in req.items], [_rows_for(snap, it) for it in req.items]
+    )
+
+    results: list[FAQAnswer | FAQHandoff] = []
+    handoffs: list[HandoffItem] = []
+    for it, hits in zip(req.items, all_hits, strict=True):
+        result, handoff = _decide(snap, it, hits)
+        results.append(result)
+        if handoff is not None:
+            handoffs.append(handoff)
+
+    if handoffs:
+        _ = await enqueue_handoff_digest(
             settings=settings,
-            user_question=req.question,
-            top_faq=ctx,
-            score=score,
+            items=handoffs,
             threshold=settings.faq_confidence_threshold,
         )
-        return FAQHandoff(handoff=True, score=score, question=req.question)
+    return FAQBatchAskResponse(results=results)
 
-    # Confident -> return curated answer
-    item = _FAQS[idx]  # type: ignore[index]
-    return FAQAnswer(answer=item.answer, score=score, source_id=item.id)
+
+@router.get("/metrics", summary="FAQ model and runtime metrics")
+async def faq_metrics() -> dict:
+    """Operational counters for the FAQ bot (model, executor, batching, caches, outbox)."""
+    return {
+        "embedder": embedder_stats(),
+        "executor": get_inference_executor(settings).stats(),
+        "batcher": _get_batcher().stats(),
+        "cache": {
+            "embeddings": _emb_cache().stats(),
+            "results": _RESULT_CACHE[1].stats() if _RESULT_CACHE else None,
+        },
+        "corpus": _SNAPSHOT.info() if _SNAPSHOT else None,
+        "handoff_outbox": get_outbox(settings).snapshot(),
+    }
+
+
+@router.post("/reload", summary="Reload data/faqs.yaml without a restart")
+async def reload(x_admin_token: str | None = Header(default=None)) -> dict:
+    """
+    Admin-only hot reload of the FAQ corpus. Disabled unless FAQ_ADMIN_TOKEN is set;
+    callers must send it in the X-Admin-Token header.
+    """
+    expected = settings.faq_admin_token
+    # Constant-time compare: `!=` returns at the first differing byte
+    if not expected or not secrets.compare_digest(
+        (x_admin_token or "").encode(), expected.encode()
+    ):
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Forbidden")
+    return await reload_faqs()
@@ -1,22 +1,54 @@
 from __future__ import annotations
 
-from typing import Annotated
+import uuid
+from datetime import UTC, datetime
+from typing import Annotated, Any, Literal
 
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy import func, select
-from sqlalchemy.exc import SQLAlchemyError
-from sqlalchemy.ext.asyncio import AsyncSession
+import asyncpg
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response, status
+from sqlalchemy import insert, select
+from sqlalchemy.exc import DBAPIError, SQLAlchemyError
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
 
-from src.ai.sentiment import classify
+from src.ai.sentiment import SentimentResult, classify
+from src.ai.sentiment.write_behind import BufferFull, WriteBehindBuffer
+from src.api.http_cache import cache_headers, etag_matches, make_etag, not_modified
 from src.api.schemas.sentiment import (
+    MAX_TIMESERIES_POINTS,
+    SentimentBatchRequest,
+    SentimentBatchResponse,
     SentimentRequest,
     SentimentResponse,
     SentimentSummaryResponse,
+    SentimentTimeseriesPoint,
+    SentimentTimeseriesResponse,
 )
-from src.db.models.sentiment import Sentiment
-from src.db.session import get_db
+from src.common.ttl_cache import AsyncTTLCache
+from src.config.settings import get_settings
+from src.db.models.sentiment import Sentiment, SentimentLabelCount
+from src.db.sentiment_rollup import BUCKET_WIDTH, RollupWorker, align, align_up, query_timeseries
+from src.db.session import AsyncSessionLocal, get_db, get_session_factory
 
 router = APIRouter(prefix="/sentiment", tags=["sentiment"])
+settings = get_settings()
+
+_COPY_COLUMNS = ("id", "text", "score", "label")
+_BUFFER: WriteBehindBuffer | None = None  # only in group_commit / write_behind modes
+_ROLLUP: RollupWorker | None = None
+_SUMMARY_CACHE: AsyncTTLCache[tuple[SentimentSummaryResponse, str]] | None = None  # (body, etag)
+
+
+def _summary_cache() -> AsyncTTLCache[tuple[SentimentSummaryResponse, str]]:
+    global _SUMMARY_CACHE
+    if _SUMMARY_CACHE is None:
+        _SUMMARY_CACHE = AsyncTTLCache(ttl_s=settings.sentiment_summary_cache_ttl_s)
+    return _SUMMARY_CACHE
+
+
+def _invalidate_read_caches() -> None:
+    """Call after committing sentiment rows so this process never serves pre-write counts."""
+    if _SUMMARY_CACHE is not None:
+        _SUMMARY_CACHE.invalidate()
 
 
 @router.post(
@@ -28,11 +60,14 @@ router = APIRouter(prefix="/sentiment", tags=["sentiment"])
 async def create_sentiment(
     payload: SentimentRequest,
     db: Annotated[AsyncSession, Depends(get_db)],
+    response: Response,
 ) -> SentimentResponse:
     """
     Classify the sentiment of the provided text and persist the result.
     Rolls back and returns 500 on DB failures so the global error handler
     can wrap the response in the standard error envelope.
+    With a buffered `sentiment_persist_mode` the row goes through the
+    write-behind buffer instead (202 in write_behind mode, 429 when full).
     """
     text = payload.text.strip()
     if not text:
@@ -42,43 +77,269 @@ async def create_sentiment(
         )
 
     result = classify(text)
+    if settings.sentiment_persist_mode != "sync":
+        return await _create_buffered(text, result, response)
+
     row = Sentiment(text=text, score=result.score, label=result.label)
     db.add(row)
 
     try:
-        await db.flush()
-        await db.commit()
+        await db.commit()  # flushes the INSERT first; id is client-side, nothing to refresh
     except SQLAlchemyError as err:
         await db.rollback()
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="Failed to persist sentiment result.",
         ) from err
+    _invalidate_read_caches()
 
-    await db.refresh(row)
     return SentimentResponse(id=row.id, text=row.text, score=row.score, label=row.label)
 
 
+async def _insert_rows(db: AsyncSession, rows: list[dict[str, Any]]) -> list[uuid.UUID]:
+    """
+    Write all rows in one statement and return their ids in input order.
+    Ids are generated client-side, so COPY (which can't RETURN) gives the same result.
+    """
+    if len(rows) >= settings.sentiment_copy_threshold and db.get_bind().dialect.driver == "asyncpg":
+        conn = await db.connection()
+        raw = await conn.get_raw_connection()
+        try:
+            await raw.driver_connection.copy_records_to_table(
+                Sentiment.__tablename__,
+                records=[tuple(r[c] for c in _COPY_COLUMNS) for r in rows],
+                columns=list(_COPY_COLUMNS),
+            )
+        except (asyncpg.PostgresError, asyncpg.InterfaceError) as err:
+            # Raw driver call: SQLAlchemy doesn't wrap it, so callers' SQLAlchemyError
+            # handling (rollback, 500 envelope, buffer retries) would never see it
+            raise DBAPIError(f"COPY {Sentiment.__tablename__}", None, err) from err
+        return [r["id"] for r in rows]
+
+    # Executemany-style ORM insert: SQLAlchemy renders one multi-row INSERT ... RETURNING
+    stmt = insert(Sentiment).returning(Sentiment.id, sort_by_parameter_order=True)
+    res = await db.execute(stmt, rows)
+    return list(res.scalars())
+
+
+def _get_buffer() -> WriteBehindBuffer:
+    global _BUFFER
+    if _BUFFER is None:
+        _BUFFER = WriteBehindBuffer(
+            _write_buffered_rows,
+            max_rows=settings.sentiment_buffer_max_rows,
+            flush_rows=settings.sentiment_buffer_flush_rows,
+            flush_interval_ms=settings.sentiment_buffer_flush_ms,
+        )
+    _BUFFER.start()  # no-op while running
+    return _BUFFER
+
+
+async def _write_buffered_rows(rows: list[dict[str, Any]]) -> None:
+    async with AsyncSessionLocal() as db:
+        await _insert_rows(db, rows)
+        await db.commit()
+    _invalidate_read_caches()
+
+
+async def _create_buffered(
+    text: str, result: SentimentResult, response: Response
+) -> SentimentResponse:
+    row = {"id": uuid.uuid4(), "text": text, "score": result.score, "label": result.label}
+    wait = settings.sentiment_persist_mode == "group_commit"
+    try:
+        await _get_buffer().submit(row, wait=wait)
+    except BufferFull as err:
+        raise HTTPException(
+            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+            detail="Sentiment write buffer is full; retry shortly.",
+            headers={"Retry-After": "1"},
+        ) from err
+    except SQLAlchemyError as err:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Failed to persist sentiment result.",
+        ) from err
+
+    if not wait:
+        response.status_code = status.HTTP_202_ACCEPTED  # accepted, not yet committed
+    return SentimentResponse(**row)
+
+
+def start_sentiment() -> None:
+    """
+    Lifespan hook: start the write-behind flusher when a buffered mode is configured,
+    and the rollup job behind /sentiment/timeseries when enabled.
+    """
+    global _ROLLUP
+    if settings.sentiment_persist_mode != "sync":
+        _get_buffer()
+    if settings.sentiment_rollup_interval_s and _ROLLUP is None:
+        _ROLLUP = RollupWorker(
+            AsyncSessionLocal,
+            interval_s=settings.sentiment_rollup_interval_s,
+            settle_s=settings.sentiment_rollup_settle_s,
+        )
+        _ROLLUP.start()
+
+
+async def close_sentiment() -> None:
+    """Lifespan hook: stop the rollup job, flush buffered rows before the engine is disposed."""
+    global _BUFFER, _ROLLUP
+    if _ROLLUP is not None:
+        await _ROLLUP.stop()
+        _ROLLUP = None
+    if _BUFFER is not None:
+        await _BUFFER.stop()
+        _BUFFER = None
+
+
+@router.post(
+    ":batch",
+    response_model=SentimentBatchResponse,
+    status_code=status.HTTP_201_CREATED,
+    summary="Analyse and persist many texts in one call",
+)
+async def create_sentiment_batch(
+    payload: SentimentBatchRequest,
+    db: Annotated[AsyncSession, Depends(get_db)],
+) -> SentimentBatchResponse:
+    """
+    Bulk variant of POST /sentiment: every text is classified, then all rows are
+    written in a single statement and transaction (all or nothing). Results come
+    back in request order with the same shape as the single-item endpoint.
+    """
+    texts = [item.text.strip() for item in payload.items]
+    empty = [i for i, text in enumerate(texts) if not text]
+    if empty:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail=f"Text must not be empty (items {empty}).",
+        )
+
+    rows: list[dict[str, Any]] = []
+    for text in texts:
+        result = classify(text)
+        rows.append(
+            {"id": uuid.uuid4(), "text": text, "score": result.score, "label": result.label}
+        )
+
+    try:
+        ids = await _insert_rows(db, rows)
+        await db.commit()
+    except SQLAlchemyError as err:
+        await db.rollback()
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Failed to persist sentiment results.",
+        ) from err
+    _invalidate_read_caches()
+
+    return SentimentBatchResponse(
+        results=[
+            SentimentResponse(id=row_id, text=r["text"], score=r["score"], label=r["label"])
+            for row_id, r in zip(ids, rows, strict=True)
+        ]
+    )
+
+
+@router.get("/metrics", summary="Sentiment persistence metrics")
+async def sentiment_metrics() -> dict:
+    """Persistence mode, write-buffer depth/outcomes/flush latency, rollup job, summary cache."""
+    return {
+        "persist_mode": settings.sentiment_persist_mode,
+        "write_buffer": _BUFFER.snapshot() if _BUFFER is not None else None,
+        "rollup": _ROLLUP.snapshot() if _ROLLUP is not None else None,
+        "summary_cache": _summary_cache().stats(),
+    }
+
+
+@router.get(
+    "/timeseries",
+    response_model=SentimentTimeseriesResponse,
+    summary="Counts by label per hour or day, for dashboard trends",
+)
+async def get_sentiment_timeseries(
+    db: Annotated[AsyncSession, Depends(get_db)],
+    start: Annotated[datetime, Query(alias="from", description="Inclusive; naive = UTC")],
+    end: Annotated[datetime | None, Query(alias="to", description="Exclusive; default now")] = None,
+    bucket: Literal["hour", "day"] = "hour",
+) -> SentimentTimeseriesResponse:
+    """
+    Served from the hourly sentiment_rollup plus a raw-table read of the few rows
+    newer than its watermark (kept behind any open transaction, so every committed
+    insert is counted once); cost depends on the number of buckets, not on table
+    size. `from`/`to` are widened to bucket boundaries (UTC).
+    """
+    lo = align(start, bucket)
+    hi = align_up(end or datetime.now(UTC), bucket)
+    n_points = int((hi - lo) / BUCKET_WIDTH[bucket])
+    if n_points <= 0:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail="'to' must be after 'from'.",
+        )
+    if n_points > MAX_TIMESERIES_POINTS:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail=f"Range spans {n_points} {bucket} buckets (max {MAX_TIMESERIES_POINTS}).",
+        )
+
+    rows = await query_timeseries(db, lo, hi, bucket)
+
+    width = BUCKET_WIDTH[bucket]
+    points = [SentimentTimeseriesPoint(bucket_start=lo + i * width) for i in range(n_points)]
+    score_sums = [0.0] * n_points
+    for b, label, count, score_sum in rows:
+        i = int((b - lo) / width)
+        if 0 <= i < n_points and label in ("positive", "negative", "neutral"):
+            setattr(points[i], label, getattr(points[i], label) + count)
+            points[i].total += count
+            score_sums[i] += score_sum
+    for p, s in zip(points, score_sums, strict=True):
+        p.avg_score = s / p.total if p.total else None
+
+    return SentimentTimeseriesResponse(bucket=bucket, start=lo, end=hi, points=points)
+
+
 @router.get(
     "/summary",
     response_model=SentimentSummaryResponse,
     summary="Return counts by sentiment label for dashboard",
 )
 async def get_sentiment_summary(
-    db: Annotated[AsyncSession, Depends(get_db)],
-) -> SentimentSummaryResponse:
+    request: Request,
+    response: Response,
+    session_factory: Annotated[async_sessionmaker[AsyncSession], Depends(get_session_factory)],
+) -> SentimentSummaryResponse | Response:
     """
-    Aggregate sentiment results by label.
+    Counts by label, read from the trigger-maintained sentiment_label_counts
+    table (three rows, whatever the history size).
     Returns zeros for missing buckets so the UI contract is stable.
+    Cached in-process for `sentiment_summary_cache_ttl_s` (concurrent polls share
+    one query; writes through this process invalidate it) and sent with an ETag:
+    a matching If-None-Match gets 304 without a body.
     """
-    stmt = select(Sentiment.label, func.count()).group_by(Sentiment.label)
-    res = await db.execute(stmt)
 
-    buckets = {"positive": 0, "negative": 0, "neutral": 0}
-    for label, count in res.all():
-        # Defensive cast to int; asyncpg returns Decimal/Int variants
-        if label in buckets:
-            buckets[label] = int(count)
+    async def load() -> tuple[SentimentSummaryResponse, str]:
+        # Its own session, not this request's: the load is shared with concurrent
+        # misses and must outlive the request that happened to start it
+        stmt = select(SentimentLabelCount.label, SentimentLabelCount.count)
+        async with session_factory() as db:
+            res = await db.execute(stmt)
+
+        buckets = {"positive": 0, "negative": 0, "neutral": 0}
+        for label, count in res.all():
+            # Defensive cast to int; asyncpg returns Decimal/Int variants
+            if label in buckets:
+                buckets[label] = int(count)
+
+        total = sum(buckets.values())
+        summary = SentimentSummaryResponse(**buckets, total=total)
+        return summary, make_etag(summary.model_dump_json())
 
-    total = sum(buckets.values())
-    return SentimentSummaryResponse(**buckets, total=total)
+    summary, etag = await _summary_cache().get_or_load("summary", load)
+    if etag_matches(request, etag):
+        return not_modified(etag)
+    response.headers.update(cache_headers(etag))
+    return summary
@@ -1,8 +1,12 @@
-from datetime import datetime
+from datetime import datetime, timedelta
 from uuid import UUID
 
 from pydantic import BaseModel, EmailStr, Field, model_validator
 
+from src.db.models.booking import BookingStatus
+
+MAX_AVAILABILITY_WINDOW = timedelta(days=92)
+
 
 class BookingBase(BaseModel):
     customer_name: str = Field(min_length=1, max_length=120)
@@ -44,6 +48,43 @@ class BookingOut(BookingBase):
     status: str
     created_at: datetime
     updated_at: datetime
+    version: int  # also sent as the ETag; echo it in If-Match to update safely
 
     class Config:
         from_attributes = True  # Pydantic v2: ORM mode
+
+
+class TimeSlot(BaseModel):
+    starts_at: datetime
+    ends_at: datetime
+
+
+class BookingAvailability(BaseModel):
+    """Free slots in [start, end), oldest first; busy time is whatever lies between them."""
+
+    start: datetime
+    end: datetime
+    free: list[TimeSlot]
+
+
+class BookingImportRow(BookingCreate):
+    """
+    One row of POST /bookings:bulk. Rows carrying the old system's `id` are
+    skipped when that id already exists, so a failed import can be re-run.
+    """
+
+    id: UUID | None = None
+    status: BookingStatus = BookingStatus.pending
+
+
+class BookingImportError(BaseModel):
+    line: int  # 1-based line in the upload (CSV: the header is line 1)
+    error: str
+
+
+class BookingImportResult(BaseModel):
+    received: int = 0  # non-blank data lines
+    inserted: int = 0
+    rejected: int = 0  # invalid, or conflicting with an existing booking (id or time)
+    errors: list[BookingImportError] = []
+    errors_truncated: bool = False
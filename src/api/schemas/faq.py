@@ -2,22 +2,48 @@ from __future__ import annotations
 
 from typing import Annotated
 
-from pydantic import BaseModel, StringConstraints
+from pydantic import BaseModel, Field, StringConstraints
 
 Question = Annotated[str, StringConstraints(min_length=1, max_length=500)]
+Tag = Annotated[str, StringConstraints(min_length=1, max_length=64)]
+
+MAX_CANDIDATES = 20
+MAX_BATCH_ITEMS = 256
 
 
 class FAQAskRequest(BaseModel):
     question: Question
+    # Optional: return the top-k ranked candidates alongside the decision
+    k: int | None = Field(default=None, ge=1, le=MAX_CANDIDATES)
+    # Optional: only consider FAQs carrying any of these tags
+    tags: list[Tag] | None = Field(default=None, max_length=20)
+
+
+class FAQCandidate(BaseModel):
+    source_id: str
+    question: str
+    answer: str
+    score: float
 
 
 class FAQAnswer(BaseModel):
     answer: str
     score: float
     source_id: str
+    candidates: list[FAQCandidate] | None = None
 
 
 class FAQHandoff(BaseModel):
     handoff: bool = True
     score: float
     question: str
+    candidates: list[FAQCandidate] | None = None
+
+
+class FAQBatchAskRequest(BaseModel):
+    items: list[FAQAskRequest] = Field(min_length=1, max_length=MAX_BATCH_ITEMS)
+
+
+class FAQBatchAskResponse(BaseModel):
+    # One entry per request item, same order; each is an answer or a handoff
+    results: list[FAQAnswer | FAQHandoff]
@@ -1,10 +1,14 @@
 from __future__ import annotations
 
+from datetime import datetime
 from typing import Literal
 from uuid import UUID
 
 from pydantic import BaseModel, Field
 
+MAX_BATCH_ITEMS = 1000
+MAX_TIMESERIES_POINTS = 5000
+
 
 class SentimentRequest(BaseModel):
     # Enforce basic limits to prevent abuse and make validation deterministic
@@ -18,6 +22,15 @@ class SentimentResponse(BaseModel):
     label: Literal["positive", "negative", "neutral"]
 
 
+class SentimentBatchRequest(BaseModel):
+    items: list[SentimentRequest] = Field(min_length=1, max_length=MAX_BATCH_ITEMS)
+
+
+class SentimentBatchResponse(BaseModel):
+    # One entry per request item, same order
+    results: list[SentimentResponse]
+
+
 class SentimentSummaryResponse(BaseModel):
     """Aggregate counts for dashboard usage."""
 
@@ -25,3 +38,21 @@ class SentimentSummaryResponse(BaseModel):
     negative: int = 0
     neutral: int = 0
     total: int = 0
+
+
+class SentimentTimeseriesPoint(BaseModel):
+    bucket_start: datetime
+    positive: int = 0
+    negative: int = 0
+    neutral: int = 0
+    total: int = 0
+    avg_score: float | None = None  # None for empty buckets
+
+
+class SentimentTimeseriesResponse(BaseModel):
+    """Zero-filled counts per UTC hour/day bucket in [start, end)."""
+
+    bucket: Literal["hour", "day"]
+    start: datetime
+    end: datetime
+    points: list[SentimentTimeseriesPoint]
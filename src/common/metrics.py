@@ -0,0 +1,46 @@
+# src/common/metrics.py
+from __future__ import annotations
+
+import bisect
+import threading
+from collections.abc import Sequence
+
+
+class Histogram:
+    """
+    Fixed-bucket histogram with Prometheus-style cumulative `le` buckets.
+    Cheap enough to observe on every request; snapshot() is JSON-ready.
+    """
+
+    def __init__(self, buckets: Sequence[float]) -> None:
+        self.bounds = sorted(float(b) for b in buckets)
+        self._counts = [0] * (len(self.bounds) + 1)  # last slot = +Inf
+        self._sum = 0.0
+        self._count = 0
+        self._lock = threading.Lock()
+
+    def observe(self, value: float) -> None:
+        i = bisect.bisect_left(self.bounds, value)
+        with self._lock:
+            self._counts[i] += 1
+            self._sum += value
+            self._count += 1
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            counts = list(self._counts)
+            total, count = self._sum, self._count
+        cumulative: dict[str, int] = {}
+        running = 0
+        for bound, n in zip([*self.bounds, float("inf")], counts, strict=True):
+            running += n
+            cumulative[f"le_{bound:g}"] = running
+        return {
+            "count": count,
+            "sum": total,
+            "mean": total / count if count else 0.0,
+            "buckets": cumulative,
+        }
+
+
+__all__ = ["Histogram"]
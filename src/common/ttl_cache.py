@@ -0,0 +1,88 @@
+# src/common/ttl_cache.py
+from __future__ import annotations
+
+import asyncio
+import time
+from collections.abc import Awaitable, Callable, Hashable
+from dataclasses import dataclass
+from typing import Generic, TypeVar
+
+V = TypeVar("V")
+
+
+@dataclass
+class _Entry(Generic[V]):
+    value: V
+    expires_at: float
+
+
+class AsyncTTLCache(Generic[V]):
+    """
+    Tiny per-process cache for read-mostly endpoints.
+
+    `get_or_load(key, loader)` serves a fresh entry if there is one; otherwise
+    exactly one caller runs `loader()` and every concurrent miss for the same key
+    awaits that same load (single-flight), so a burst of pollers costs one query.
+    The load runs as its own task, so a caller going away doesn't cancel it for
+    the others. `invalidate()` drops entries and keeps loads already in flight
+    from caching what may be a pre-write result. `ttl_s <= 0` disables caching
+    (single-flight still applies).
+    """
+
+    def __init__(self, ttl_s: float, clock: Callable[[], float] = time.monotonic) -> None:
+        self.ttl_s = ttl_s
+        self._clock = clock
+        self._entries: dict[Hashable, _Entry[V]] = {}
+        self._inflight: dict[Hashable, asyncio.Task] = {}
+        self._generation = 0
+        self.hits = 0
+        self.misses = 0
+        self.coalesced = 0  # misses that joined a load already in flight
+        self.invalidations = 0
+
+    async def get_or_load(self, key: Hashable, loader: Callable[[], Awaitable[V]]) -> V:
+        entry = self._entries.get(key)
+        if entry is not None and entry.expires_at > self._clock():
+            self.hits += 1
+            return entry.value
+
+        task = self._inflight.get(key)
+        if task is not None:
+            self.coalesced += 1
+        else:
+            self.misses += 1
+            task = asyncio.ensure_future(self._load(key, loader, self._generation))
+            self._inflight[key] = task
+        return await asyncio.shield(task)
+
+    async def _load(self, key: Hashable, loader: Callable[[], Awaitable[V]], gen: int) -> V:
+        try:
+            value = await loader()
+        finally:
+            if self._inflight.get(key) is asyncio.current_task():
+                del self._inflight[key]
+        if gen == self._generation and self.ttl_s > 0:
+            self._entries[key] = _Entry(value, self._clock() + self.ttl_s)
+        return value
+
+    def invalidate(self) -> None:
+        """Forget everything (call after writes that change what loaders return)."""
+        self._generation += 1
+        self._entries.clear()
+        self._inflight.clear()  # later misses start a fresh load
+        self.invalidations += 1
+
+    def stats(self) -> dict[str, float | int]:
+        lookups = self.hits + self.misses + self.coalesced
+        return {
+            "ttl_s": self.ttl_s,
+            "entries": len(self._entries),
+            "hits": self.hits,
+            "misses": self.misses,
+            "coalesced": self.coalesced,
+            "invalidations": self.invalidations,
+            "hit_ratio": (self.hits + self.coalesced) / lookups if lookups else 0.0,
+        }
+
+
+__all__ = ["AsyncTTLCache"]
@@ -2,6 +2,7 @@
 from __future__ import annotations
 
 from functools import lru_cache
+from typing import Literal
 
 from pydantic import ValidationInfo, field_validator
 from pydantic_settings import BaseSettings, SettingsConfigDict
@@ -10,6 +11,56 @@ from pydantic_settings import BaseSettings, SettingsConfigDict
 class Settings(BaseSettings):
     # --- FAQ Bot ---
     faq_confidence_threshold: float = 0.60
+    # Inference executor for MiniLM encode calls (keeps CPU work off the event loop)
+    faq_inference_workers: int = 2
+    faq_inference_max_queue: int = 32  # waiting calls beyond busy workers before 429
+    faq_inference_timeout_s: float = 5.0
+    faq_inference_use_processes: bool = False  # process pool: one model copy per worker
+    # Micro-batching of concurrent /faq/ask queries into one encode call
+    faq_batch_max_size: int = 16
+    faq_batch_max_wait_ms: float = 2.0
+    # Retrieval index: "exact" dense matmul, or "ivf" approximate search for big corpora
+    faq_index_backend: Literal["exact", "ivf"] = "exact"
+    faq_ivf_lists: int | None = None  # default ~sqrt(n_docs)
+    faq_ivf_probe: int = 8  # lists scanned per query (higher = better recall, slower)
+    # LRU caches keyed on normalised question text (embeddings, and final top-k results)
+    faq_cache_max_entries: int = 10_000  # per cache; 0 disables
+    faq_cache_max_bytes: int = 64 * 1024 * 1024
+    faq_cache_ttl_s: float | None = 3600.0
+    faq_result_cache_enabled: bool = True  # results are dropped whenever the corpus changes
+    # Hot reload of data/faqs.yaml: poll interval (None = off) and token for POST /faq/reload
+    faq_reload_poll_s: float | None = None
+    faq_admin_token: str | None = None
+
+    # --- Sentiment ---
+    # POST /sentiment:batch writes with one multi-row INSERT; at or above this many
+    # rows it switches to COPY (asyncpg only)
+    sentiment_copy_threshold: int = 200
+    # Persistence for POST /sentiment:
+    #   "sync"          one commit per request (default)
+    #   "group_commit"  rows are buffered and the request returns once its bulk insert
+    #                   commits: durable, with many requests sharing each commit
+    #   "write_behind"  202 as soon as the row is buffered: fastest, but rows still in
+    #                   the buffer are lost if the process dies
+    sentiment_persist_mode: Literal["sync", "group_commit", "write_behind"] = "sync"
+    sentiment_buffer_max_rows: int = 10_000  # beyond this POST /sentiment answers 429
+    sentiment_buffer_flush_rows: int = 500
+    sentiment_buffer_flush_ms: float = 50.0
+    # Hourly sentiment_rollup behind GET /sentiment/timeseries. Interval of the job inside
+    # API processes: None = off (default); run scripts/run_sentiment_rollup.py from one job
+    # process instead, or set it on a single instance. Reads stay correct without the job,
+    # only slower. settle_s: how old rows must be before they are folded.
+    sentiment_rollup_interval_s: float | None = None
+    sentiment_rollup_settle_s: float = 30.0
+    # GET /sentiment/summary in-process cache (0 = off; concurrent misses still share a query)
+    sentiment_summary_cache_ttl_s: float = 2.0
+
+    # --- Bookings ---
+    # POST /bookings:bulk: valid rows are COPYed to staging, merged and committed this
+    # many at a time (bounds memory and lock time), and at most this many row errors
+    # are listed in the response (all are counted)
+    booking_import_chunk_rows: int = 5_000
+    booking_import_max_errors: int = 1_000
 
     # --- General ---
     app_env: str = "local"
@@ -32,6 +83,13 @@ class Settings(BaseSettings):
     smtp_port: int | None = None
     smtp_from: str | None = None
     handoff_to: str | None = None
+    # Outbox: handlers enqueue, a background worker sends (memory = best-effort,
+    # postgres = durable across restarts via the faq_handoff_outbox table)
+    handoff_outbox_backend: Literal["memory", "postgres"] = "memory"
+    handoff_outbox_max_size: int = 1000  # memory backend only
+    handoff_outbox_batch_size: int = 20
+    handoff_outbox_max_attempts: int = 5
+    handoff_outbox_poll_interval_s: float = 1.0
 
     # --- CORS ---
     # Accepts either JSON (["http://a","http://b"]) or comma-separated (http://a,http://b)
@@ -79,6 +137,14 @@ class Settings(BaseSettings):
             return parts or ["http://localhost:5173"]
         return v
 
+    @field_validator("sentiment_buffer_flush_ms")
+    @classmethod
+    def positive_flush_interval(cls, v: float) -> float:
+        # 0 would turn the write-behind flusher into a busy loop
+        if v <= 0:
+            raise ValueError("sentiment_buffer_flush_ms must be > 0")
+        return v
+
 
 @lru_cache
 def get_settings() -> Settings:
@@ -0,0 +1,44 @@
+"""add composite indexes for the GET /bookings filters
+
+Revision ID: a4c9e3d7b512
+Revises: f2b7d40c8e16
+Create Date: 2026-10-17 19:00:00.000000
+"""
+
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "a4c9e3d7b512"
+down_revision: str | Sequence[str] | None = "f2b7d40c8e16"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+def upgrade() -> None:
+    # WHERE customer_email = ? [AND status = ?] ORDER BY created_at DESC, id DESC LIMIT k
+    # Its leading column covers everything ix_bookings_customer_email did, so that one goes.
+    op.create_index(
+        "ix_bookings_email_created_at_id",
+        "bookings",
+        ["customer_email", "created_at", "id"],
+        unique=False,
+    )
+    op.drop_index("ix_bookings_customer_email", table_name="bookings")
+
+    # WHERE status = ? ORDER BY created_at DESC, id DESC LIMIT k
+    # Not partial per-status indexes: asyncpg prepares statements, and a generic plan
+    # for "status = $1" can't prove a "WHERE status = 'pending'" predicate holds
+    op.create_index(
+        "ix_bookings_status_created_at_id",
+        "bookings",
+        ["status", sa.text("created_at DESC"), sa.text("id DESC")],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_bookings_status_created_at_id", table_name="bookings")
+    op.create_index("ix_bookings_customer_email", "bookings", ["customer_email"], unique=False)
+    op.drop_index("ix_bookings_email_created_at_id", table_name="bookings")
@@ -0,0 +1,58 @@
+"""add faq_handoff_outbox table
+
+Revision ID: b5e2a9c4d1f0
+Revises: f70c1b29220
+Create Date: 2026-10-17 09:00:00.000000
+"""
+
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "b5e2a9c4d1f0"
+down_revision: str | Sequence[str] | None = "f70c1b29220"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "faq_handoff_outbox",
+        sa.Column("id", sa.UUID(), primary_key=True, nullable=False),
+        sa.Column("raw_message", sa.Text(), nullable=False),
+        sa.Column("status", sa.String(length=16), nullable=False, server_default="pending"),
+        sa.Column("attempts", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("last_error", sa.Text(), nullable=True),
+        sa.Column(
+            "next_attempt_at",
+            sa.DateTime(timezone=True),
+            server_default=sa.text("now()"),
+            nullable=False,
+        ),
+        sa.Column(
+            "created_at",
+            sa.DateTime(timezone=True),
+            server_default=sa.text("now()"),
+            nullable=False,
+        ),
+        sa.Column("sent_at", sa.DateTime(timezone=True), nullable=True),
+        sa.CheckConstraint(
+            "status in ('pending','sent','failed')",
+            name="ck_faq_handoff_outbox_status",
+        ),
+    )
+    # Partial index keeps the worker's claim query cheap as sent rows pile up
+    op.create_index(
+        "ix_faq_handoff_outbox_due",
+        "faq_handoff_outbox",
+        ["next_attempt_at"],
+        unique=False,
+        postgresql_where=sa.text("status = 'pending'"),
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_faq_handoff_outbox_due", table_name="faq_handoff_outbox")
+    op.drop_table("faq_handoff_outbox")
@@ -0,0 +1,55 @@
+"""forbid overlapping live bookings with a GiST exclusion constraint
+
+Revision ID: c6d2f8a1e934
+Revises: a4c9e3d7b512
+Create Date: 2026-10-17 20:00:00.000000
+"""
+
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "c6d2f8a1e934"
+down_revision: str | Sequence[str] | None = "a4c9e3d7b512"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+# Live bookings that start before some earlier-starting one has ended: one sort, O(n log n)
+_OVERLAPS = sa.text("""
+    SELECT count(*)
+    FROM (
+        SELECT starts_at,
+               max(ends_at) OVER (
+                   ORDER BY starts_at, id ROWS BETWEEN UNBOUNDED PRECEDING AND 1 PRECEDING
+               ) AS prev_end
+        FROM bookings
+        WHERE status <> 'cancelled'
+    ) AS s
+    WHERE starts_at < prev_end
+    """)
+
+
+def upgrade() -> None:
+    # Fail with a readable message instead of a bare 23P01 if old data already clashes;
+    # which booking of a clash wins is a business call, so don't guess
+    clashes = op.get_bind().execute(_OVERLAPS).scalar_one()
+    if clashes:
+        raise RuntimeError(
+            f"{clashes} non-cancelled booking(s) overlap an earlier one; "
+            "cancel or move them before applying ex_bookings_no_overlap"
+        )
+
+    # Half-open [starts_at, ends_at): back-to-back bookings don't conflict.
+    # The GiST index behind it also answers "which bookings overlap [from, to)".
+    op.execute("""
+        ALTER TABLE bookings
+        ADD CONSTRAINT ex_bookings_no_overlap
+        EXCLUDE USING gist (tstzrange(starts_at, ends_at, '[)') WITH &&)
+        WHERE (status <> 'cancelled')
+        """)
+
+
+def downgrade() -> None:
+    op.drop_constraint("ex_bookings_no_overlap", "bookings", type_="exclude")
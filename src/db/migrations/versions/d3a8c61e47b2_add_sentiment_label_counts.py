@@ -0,0 +1,99 @@
+"""add sentiment_label_counts maintained by triggers
+
+Revision ID: d3a8c61e47b2
+Revises: b5e2a9c4d1f0
+Create Date: 2026-10-17 12:00:00.000000
+"""
+
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "d3a8c61e47b2"
+down_revision: str | Sequence[str] | None = "b5e2a9c4d1f0"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+# Statement-level triggers with transition tables: a bulk INSERT/COPY of N rows
+# costs one upsert per label rather than N row-level counter updates.
+_APPLY_FN = """
+CREATE OR REPLACE FUNCTION sentiment_label_counts_apply() RETURNS trigger
+LANGUAGE plpgsql AS $$
+BEGIN
+    IF TG_OP IN ('INSERT', 'UPDATE') THEN
+        INSERT INTO sentiment_label_counts AS c (label, count)
+        SELECT label, count(*) FROM new_rows GROUP BY label
+        ON CONFLICT (label) DO UPDATE SET count = c.count + EXCLUDED.count;
+    END IF;
+    IF TG_OP IN ('DELETE', 'UPDATE') THEN
+        UPDATE sentiment_label_counts AS c
+        SET count = c.count - d.n
+        FROM (SELECT label, count(*) AS n FROM old_rows GROUP BY label) AS d
+        WHERE c.label = d.label;
+    END IF;
+    RETURN NULL;
+END;
+$$;
+"""
+
+_RESET_FN = """
+CREATE OR REPLACE FUNCTION sentiment_label_counts_reset() RETURNS trigger
+LANGUAGE plpgsql AS $$
+BEGIN
+    UPDATE sentiment_label_counts SET count = 0;
+    RETURN NULL;
+END;
+$$;
+"""
+
+_TRIGGERS = {
+    "trg_sentiment_counts_insert": (
+        "AFTER INSERT ON sentiment REFERENCING NEW TABLE AS new_rows "
+        "FOR EACH STATEMENT EXECUTE FUNCTION sentiment_label_counts_apply()"
+    ),
+    "trg_sentiment_counts_update": (
+        "AFTER UPDATE ON sentiment REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows "
+        "FOR EACH STATEMENT EXECUTE FUNCTION sentiment_label_counts_apply()"
+    ),
+    "trg_sentiment_counts_delete": (
+        "AFTER DELETE ON sentiment REFERENCING OLD TABLE AS old_rows "
+        "FOR EACH STATEMENT EXECUTE FUNCTION sentiment_label_counts_apply()"
+    ),
+    "trg_sentiment_counts_truncate": (
+        "AFTER TRUNCATE ON sentiment "
+        "FOR EACH STATEMENT EXECUTE FUNCTION sentiment_label_counts_reset()"
+    ),
+}
+
+
+def upgrade() -> None:
+    op.create_table(
+        "sentiment_label_counts",
+        sa.Column("label", sa.String(length=16), primary_key=True, nullable=False),
+        sa.Column("count", sa.BigInteger(), nullable=False, server_default="0"),
+    )
+    op.execute(_APPLY_FN)
+    op.execute(_RESET_FN)
+
+    # Block writers until the triggers exist and the seed is taken, so no insert
+    # lands between the two (reads carry on)
+    op.execute("LOCK TABLE sentiment IN SHARE ROW EXCLUSIVE MODE")
+    for name, body in _TRIGGERS.items():
+        op.execute(f"CREATE TRIGGER {name} {body}")
+    op.execute("""
+        INSERT INTO sentiment_label_counts (label, count)
+        SELECT l.label, count(s.label)
+        FROM (VALUES ('positive'), ('negative'), ('neutral')) AS l(label)
+        LEFT JOIN sentiment AS s ON s.label = l.label
+        GROUP BY l.label
+        """)
+
+
+def downgrade() -> None:
+    for name in _TRIGGERS:
+        op.execute(f"DROP TRIGGER IF EXISTS {name} ON sentiment")
+    op.execute("DROP FUNCTION IF EXISTS sentiment_label_counts_reset()")
+    op.execute("DROP FUNCTION IF EXISTS sentiment_label_counts_apply()")
+    op.drop_table("sentiment_label_counts")
@@ -0,0 +1,29 @@
+"""add bookings.version for optimistic concurrency (If-Match)
+
+Revision ID: d9f4a7c3b218
+Revises: c6d2f8a1e934
+Create Date: 2026-10-17 21:00:00.000000
+"""
+
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "d9f4a7c3b218"
+down_revision: str | Sequence[str] | None = "c6d2f8a1e934"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    # A constant default is metadata-only on Postgres 11+: no table rewrite
+    op.add_column(
+        "bookings",
+        sa.Column("version", sa.Integer(), server_default=sa.text("1"), nullable=False),
+    )
+
+
+def downgrade() -> None:
+    op.drop_column("bookings", "version")
@@ -0,0 +1,47 @@
+"""add sentiment_rollup (hourly) and its watermark
+
+Revision ID: e61f0b9a3c75
+Revises: d3a8c61e47b2
+Create Date: 2026-10-17 15:00:00.000000
+"""
+
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "e61f0b9a3c75"
+down_revision: str | Sequence[str] | None = "d3a8c61e47b2"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    # PK (bucket_start, label) doubles as the range index for timeseries reads
+    op.create_table(
+        "sentiment_rollup",
+        sa.Column("bucket_start", sa.DateTime(timezone=True), primary_key=True, nullable=False),
+        sa.Column("label", sa.String(length=16), primary_key=True, nullable=False),
+        sa.Column("count", sa.BigInteger(), nullable=False, server_default="0"),
+        sa.Column("score_sum", sa.Float(), nullable=False, server_default="0"),
+    )
+    op.create_table(
+        "sentiment_rollup_state",
+        sa.Column("id", sa.SmallInteger(), primary_key=True, nullable=False),
+        sa.Column("watermark", sa.DateTime(timezone=True), nullable=True),
+        sa.Column(
+            "updated_at",
+            sa.DateTime(timezone=True),
+            server_default=sa.text("now()"),
+            nullable=False,
+        ),
+        sa.CheckConstraint("id = 1", name="ck_sentiment_rollup_state_singleton"),
+    )
+    # NULL watermark: the first job run starts from the oldest row
+    op.execute("INSERT INTO sentiment_rollup_state (id, watermark) VALUES (1, NULL)")
+
+
+def downgrade() -> None:
+    op.drop_table("sentiment_rollup_state")
+    op.drop_table("sentiment_rollup")
@@ -0,0 +1,31 @@
+"""add index on bookings(created_at, id) for keyset pagination
+
+Revision ID: f2b7d40c8e16
+Revises: e61f0b9a3c75
+Create Date: 2026-10-17 18:00:00.000000
+"""
+
+from collections.abc import Sequence
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "f2b7d40c8e16"
+down_revision: str | Sequence[str] | None = "e61f0b9a3c75"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    # Serves both GET /bookings orderings: newest first (scanned backwards) and
+    # the (created_at, id) < cursor seek, with id breaking created_at ties
+    op.create_index(
+        "ix_bookings_created_at_id",
+        "bookings",
+        ["created_at", "id"],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_bookings_created_at_id", table_name="bookings")
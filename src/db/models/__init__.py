@@ -1 +1,2 @@
 from .booking import Booking, BookingStatus  # noqa: F401
+from .handoff_outbox import HandoffOutbox  # noqa: F401
@@ -8,11 +8,15 @@ from sqlalchemy import (
     DateTime,
     Enum,
     Index,
+    Integer,
     String,
     Text,
+    column,
     func,
+    literal_column,
+    text,
 )
-from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.dialects.postgresql import UUID, ExcludeConstraint
 from sqlalchemy.orm import Mapped, mapped_column
 
 from src.db.session import Base
@@ -24,6 +28,9 @@ class BookingStatus(str, enum.Enum):
     cancelled = "cancelled"
 
 
+NO_OVERLAP_CONSTRAINT = "ex_bookings_no_overlap"
+
+
 class Booking(Base):
     __tablename__ = "bookings"
 
@@ -59,8 +66,37 @@ class Booking(Base):
         server_default=func.now(),
         onupdate=func.now(),
     )
+    # Optimistic concurrency: every UPDATE bumps it; PATCH/DELETE with If-Match only
+    # apply while it still holds the version the client read
+    version: Mapped[int] = mapped_column(Integer, nullable=False, server_default=text("1"))
+
+    # Fetch created_at/updated_at/version via INSERT/UPDATE ... RETURNING during flush,
+    # so handlers never need a follow-up refresh() SELECT
+    __mapper_args__ = {"eager_defaults": True}
 
+    # One index per GET /bookings access path, each ending in (created_at, id) so the
+    # newest-first order and the cursor seek come straight off the index (scanned
+    # backwards) with no sort step
     __table_args__ = (
         Index("ix_bookings_starts_at", "starts_at"),
-        Index("ix_bookings_customer_email", "customer_email"),
+        # No filter
+        Index("ix_bookings_created_at_id", "created_at", "id"),
+        # ?email= (with or without ?status=); also serves plain email lookups
+        Index("ix_bookings_email_created_at_id", "customer_email", "created_at", "id"),
+        # ?status=. Not partial per-status indexes: asyncpg prepares statements, and a
+        # generic plan for "status = $1" can't prove any partial predicate holds
+        Index(
+            "ix_bookings_status_created_at_id",
+            "status",
+            text("created_at DESC"),
+            text("id DESC"),
+        ),
+        # No two live bookings may overlap (half-open, so back-to-back slots are fine).
+        # Its GiST index also serves the range-overlap scan behind GET /bookings/availability.
+        ExcludeConstraint(
+            (func.tstzrange(column("starts_at"), column("ends_at"), literal_column("'[)'")), "&&"),
+            name=NO_OVERLAP_CONSTRAINT,
+            using="gist",
+            where=text("status <> 'cancelled'"),
+        ).ddl_if(dialect="postgresql"),
     )
@@ -0,0 +1,50 @@
+from __future__ import annotations
+
+import uuid
+from datetime import datetime
+
+import sqlalchemy as sa
+from sqlalchemy.orm import Mapped, mapped_column
+
+from src.db.session import Base
+
+
+class HandoffOutbox(Base):
+    """Durable queue of handoff emails, drained by the outbox worker."""
+
+    __tablename__ = "faq_handoff_outbox"
+
+    id: Mapped[uuid.UUID] = mapped_column(
+        sa.dialects.postgresql.UUID(as_uuid=True),
+        primary_key=True,
+        default=uuid.uuid4,
+    )
+    # Full RFC 5322 message as produced by EmailMessage.as_string()
+    raw_message: Mapped[str] = mapped_column(sa.Text(), nullable=False)
+    status: Mapped[str] = mapped_column(sa.String(length=16), nullable=False, default="pending")
+    attempts: Mapped[int] = mapped_column(sa.Integer(), nullable=False, default=0)
+    last_error: Mapped[str | None] = mapped_column(sa.Text(), nullable=True)
+    next_attempt_at: Mapped[datetime] = mapped_column(
+        sa.DateTime(timezone=True),
+        server_default=sa.text("now()"),
+        nullable=False,
+    )
+    created_at: Mapped[datetime] = mapped_column(
+        sa.DateTime(timezone=True),
+        server_default=sa.text("now()"),
+        nullable=False,
+    )
+    sent_at: Mapped[datetime | None] = mapped_column(sa.DateTime(timezone=True), nullable=True)
+
+    __table_args__ = (
+        sa.CheckConstraint(
+            "status in ('pending','sent','failed')",
+            name="ck_faq_handoff_outbox_status",
+        ),
+        # Worker claim query: pending rows that are due, oldest first
+        sa.Index(
+            "ix_faq_handoff_outbox_due",
+            "next_attempt_at",
+            postgresql_where=sa.text("status = 'pending'"),
+        ),
+    )
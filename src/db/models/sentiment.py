@@ -1,6 +1,7 @@
 from __future__ import annotations
 
 import uuid
+from datetime import datetime
 
 import sqlalchemy as sa
 from sqlalchemy.orm import Mapped, mapped_column
@@ -27,6 +28,9 @@ class Sentiment(Base):
         nullable=False,
     )
 
+    # created_at comes back with the INSERT (RETURNING) instead of a refresh() SELECT
+    __mapper_args__ = {"eager_defaults": True}
+
     __table_args__ = (
         sa.CheckConstraint(
             "label in ('positive','negative','neutral')",
@@ -35,3 +39,44 @@ class Sentiment(Base):
         sa.Index("ix_sentiment_created_at", "created_at"),
         sa.Index("ix_sentiment_label", "label"),
     )
+
+
+class SentimentLabelCount(Base):
+    """
+    Running row count per label, kept in step with `sentiment` by statement-level
+    triggers (see migration d3a8c61e47b2), so the dashboard summary reads three rows
+    instead of scanning the table. Rebuild with scripts/reconcile_sentiment_counts.py.
+    """
+
+    __tablename__ = "sentiment_label_counts"
+
+    label: Mapped[str] = mapped_column(sa.String(length=16), primary_key=True)
+    count: Mapped[int] = mapped_column(sa.BigInteger(), nullable=False, default=0)
+
+
+class SentimentRollup(Base):
+    """
+    Hourly counts and score sums per label, filled incrementally from
+    `sentiment.created_at` by the rollup job (src/db/sentiment_rollup.py).
+    """
+
+    __tablename__ = "sentiment_rollup"
+
+    bucket_start: Mapped[datetime] = mapped_column(sa.DateTime(timezone=True), primary_key=True)
+    label: Mapped[str] = mapped_column(sa.String(length=16), primary_key=True)
+    count: Mapped[int] = mapped_column(sa.BigInteger(), nullable=False, default=0)
+    score_sum: Mapped[float] = mapped_column(sa.Float(), nullable=False, default=0.0)
+
+
+class SentimentRollupState(Base):
+    """Single row: everything created before `watermark` is in sentiment_rollup."""
+
+    __tablename__ = "sentiment_rollup_state"
+
+    id: Mapped[int] = mapped_column(sa.SmallInteger(), primary_key=True, default=1)
+    watermark: Mapped[datetime | None] = mapped_column(sa.DateTime(timezone=True), nullable=True)
+    updated_at: Mapped[datetime] = mapped_column(
+        sa.DateTime(timezone=True), server_default=sa.text("now()"), nullable=False
+    )
+
+    __table_args__ = (sa.CheckConstraint("id = 1", name="ck_sentiment_rollup_state_singleton"),)
@@ -0,0 +1,121 @@
+from __future__ import annotations
+
+import enum
+import json
+from dataclasses import dataclass
+from datetime import date, datetime
+from typing import Any
+
+from sqlalchemy.engine import Dialect
+from sqlalchemy.ext.asyncio import AsyncConnection
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.sql.base import Executable
+from sqlalchemy.sql.elements import ClauseElement
+
+
+class Explain(Executable, ClauseElement):
+    """`EXPLAIN (ANALYZE, BUFFERS, FORMAT JSON) <stmt>`, keeping the statement's bind params."""
+
+    inherit_cache = False
+
+    def __init__(self, statement: Executable, analyze: bool = True) -> None:
+        self.statement = statement
+        self.analyze = analyze
+
+
+@compiles(Explain, "postgresql")
+def _compile_explain(element: Explain, compiler, **kw) -> str:
+    opts = "ANALYZE, BUFFERS, FORMAT JSON" if element.analyze else "FORMAT JSON"
+    return f"EXPLAIN ({opts}) " + compiler.process(element.statement, **kw)
+
+
+@dataclass(frozen=True)
+class ScanNode:
+    node_type: str
+    relation: str | None
+    index: str | None
+    rows: int  # rows the node read: returned + removed by its filter, over all loops
+
+
+def _rows_read(node: dict[str, Any]) -> int:
+    loops = node.get("Actual Loops", 1) or 1
+    if "Actual Rows" in node:
+        return int((node["Actual Rows"] + node.get("Rows Removed by Filter", 0)) * loops)
+    return int(node.get("Plan Rows", 0))  # plain EXPLAIN: the planner's estimate
+
+
+def walk_plan(plan: dict[str, Any]):
+    """Yield every node of one EXPLAIN (FORMAT JSON) plan tree, depth first."""
+    yield plan
+    for child in plan.get("Plans", ()):
+        yield from walk_plan(child)
+
+
+def scans(plan: dict[str, Any]) -> list[ScanNode]:
+    return [
+        ScanNode(n["Node Type"], n.get("Relation Name"), n.get("Index Name"), _rows_read(n))
+        for n in walk_plan(plan)
+        if "Relation Name" in n
+    ]
+
+
+def seq_scans_over(plan: dict[str, Any], max_rows: int) -> list[ScanNode]:
+    """Sequential scans in `plan` that read more than `max_rows` rows."""
+    return [s for s in scans(plan) if s.node_type == "Seq Scan" and s.rows > max_rows]
+
+
+async def explain(conn: AsyncConnection, stmt: Executable, analyze: bool = True) -> dict[str, Any]:
+    """
+    Run EXPLAIN for `stmt` and return the top-level JSON document ("Plan",
+    "Execution Time", ...). ANALYZE executes the statement, so run writes
+    inside a transaction that gets rolled back.
+    """
+    raw = (await conn.execute(Explain(stmt, analyze))).scalar_one()
+    doc = json.loads(raw) if isinstance(raw, str) else raw
+    return doc[0]
+
+
+def _sql_literal(value: Any) -> str:
+    """Untyped SQL literal; PREPARE already fixed each parameter's type."""
+    if value is None:
+        return "NULL"
+    if isinstance(value, enum.Enum):
+        value = value.value
+    if isinstance(value, datetime | date):
+        value = value.isoformat()
+    return "'" + str(value).replace("'", "''") + "'"
+
+
+def prepared_sql(stmt: Executable, dialect: Dialect) -> tuple[str, list[str]]:
+    """`stmt` as "$n"-parameter SQL for PREPARE, plus its bind values as SQL literals."""
+    compiled = stmt.compile(dialect=dialect)
+    names = compiled.positiontup or []
+    return compiled.string, [_sql_literal(compiled.params[n]) for n in names]
+
+
+async def explain_generic(
+    conn: AsyncConnection, stmt: Executable, analyze: bool = True
+) -> dict[str, Any]:
+    """
+    EXPLAIN the generic plan of `stmt`: the one asyncpg's cached prepared
+    statements end up running after a few executions, where the planner no
+    longer sees parameter values (so e.g. partial-index predicates can't be
+    proven): PREPAREs it under plan_cache_mode = force_generic_plan, EXPLAINs an
+    EXECUTE, then drops the statement and the setting again. asyncpg only.
+    """
+    sql, args = prepared_sql(stmt, conn.dialect)
+    opts = "ANALYZE, BUFFERS, FORMAT JSON" if analyze else "FORMAT JSON"
+    execute = "EXECUTE _explain_generic" + (f"({', '.join(args)})" if args else "")
+    # Simple-protocol calls on the driver connection: "$n" must reach PREPARE verbatim
+    raw = (await conn.get_raw_connection()).driver_connection
+    await raw.execute("SET plan_cache_mode = force_generic_plan")
+    try:
+        await raw.execute(f"PREPARE _explain_generic AS {sql}")
+        try:
+            raw_doc = await raw.fetchval(f"EXPLAIN ({opts}) {execute}")
+        finally:
+            await raw.execute("DEALLOCATE _explain_generic")
+    finally:
+        await raw.execute("RESET plan_cache_mode")
+    doc = json.loads(raw_doc) if isinstance(raw_doc, str) else raw_doc
+    return doc[0]
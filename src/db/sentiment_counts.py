@@ -0,0 +1,41 @@
+from __future__ import annotations
+
+from sqlalchemy import func, select, text
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.db.models.sentiment import Sentiment, SentimentLabelCount
+
+LABELS = ("positive", "negative", "neutral")
+
+
+async def reconcile_label_counts(db: AsyncSession, apply: bool = True) -> dict[str, dict[str, int]]:
+    """
+    Recount `sentiment` by label and compare with `sentiment_label_counts`.
+
+    Writers are blocked (SHARE lock) until the caller's transaction ends, so the
+    recount and the counters describe the same rows; readers carry on. With
+    `apply`, counters are overwritten with the recount. The caller commits.
+    Returns {label: {"counter": ..., "actual": ...}} as found before the fix.
+    """
+    await db.execute(text("LOCK TABLE sentiment IN SHARE MODE"))
+    actual = dict.fromkeys(LABELS, 0)
+    res = await db.execute(select(Sentiment.label, func.count()).group_by(Sentiment.label))
+    actual.update({label: int(n) for label, n in res.all()})
+
+    res = await db.execute(select(SentimentLabelCount.label, SentimentLabelCount.count))
+    counters = {label: int(n) for label, n in res.all()}
+
+    if apply:
+        stmt = insert(SentimentLabelCount).values(
+            [{"label": label, "count": n} for label, n in actual.items()]
+        )
+        await db.execute(
+            stmt.on_conflict_do_update(
+                index_elements=[SentimentLabelCount.label], set_={"count": stmt.excluded.count}
+            )
+        )
+    return {
+        label: {"counter": counters.get(label, 0), "actual": actual[label]}
+        for label in sorted(actual.keys() | counters.keys())
+    }
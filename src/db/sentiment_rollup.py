@@ -0,0 +1,240 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+from dataclasses import dataclass
+from datetime import UTC, datetime, timedelta
+from typing import Any, Literal
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+logger = logging.getLogger("db.sentiment_rollup")
+
+Bucket = Literal["hour", "day"]
+BUCKET_WIDTH: dict[str, timedelta] = {"hour": timedelta(hours=1), "day": timedelta(days=1)}
+
+# Lock the watermark row so two job runs can never aggregate the same range twice.
+# oldest_xact: start of the oldest other open transaction; it may still commit rows
+# stamped with that time (created_at = now() = transaction start). Sessions of other
+# roles show a NULL xact_start unless the job's role has pg_read_all_stats.
+_CLAIM = text("""
+    SELECT watermark, now() AS db_now,
+           (SELECT min(created_at) FROM sentiment) AS oldest,
+           (SELECT min(xact_start) FROM pg_stat_activity
+             WHERE datname = current_database() AND pid <> pg_backend_pid()) AS oldest_xact
+    FROM sentiment_rollup_state
+    WHERE id = 1
+    FOR UPDATE
+    """)
+
+# Range scan on ix_sentiment_created_at; adds to existing hour rows
+_AGGREGATE = text("""
+    INSERT INTO sentiment_rollup AS r (bucket_start, label, count, score_sum)
+    SELECT date_trunc('hour', created_at, 'UTC'), label, count(*), sum(score)
+    FROM sentiment
+    WHERE created_at >= :lo AND created_at < :hi
+    GROUP BY 1, 2
+    ON CONFLICT (bucket_start, label) DO UPDATE
+    SET count = r.count + EXCLUDED.count,
+        score_sum = r.score_sum + EXCLUDED.score_sum
+    """)
+
+_ADVANCE = text(
+    "UPDATE sentiment_rollup_state SET watermark = :hi, updated_at = now() WHERE id = 1"
+)
+
+# One statement, so the watermark, the rollup rows and the raw tail come from the
+# same snapshot: rollup covers created_at < watermark, the tail everything after.
+_TIMESERIES = text("""
+    WITH wm AS (
+        SELECT coalesce(
+            (SELECT watermark FROM sentiment_rollup_state WHERE id = 1),
+            '-infinity'::timestamptz
+        ) AS watermark
+    ),
+    rolled AS (
+        SELECT date_trunc(:unit, bucket_start, 'UTC') AS b, label,
+               sum(count) AS n, sum(score_sum) AS s
+        FROM sentiment_rollup
+        WHERE bucket_start >= :lo AND bucket_start < :hi
+        GROUP BY 1, 2
+    ),
+    tail AS (
+        SELECT date_trunc(:unit, created_at, 'UTC') AS b, label,
+               count(*) AS n, sum(score) AS s
+        FROM sentiment
+        WHERE created_at >= greatest(CAST(:lo AS timestamptz), (SELECT watermark FROM wm))
+          AND created_at < :hi
+        GROUP BY 1, 2
+    )
+    SELECT b, label, sum(n) AS n, sum(s) AS s
+    FROM (SELECT * FROM rolled UNION ALL SELECT * FROM tail) AS u
+    GROUP BY b, label
+    ORDER BY b
+    """)
+
+
+def _utc(ts: datetime) -> datetime:
+    return ts.replace(tzinfo=UTC) if ts.tzinfo is None else ts.astimezone(UTC)
+
+
+def align(ts: datetime, bucket: Bucket) -> datetime:
+    """Floor `ts` to the start of its UTC hour/day (naive datetimes are taken as UTC)."""
+    ts = _utc(ts)
+    if bucket == "day":
+        return ts.replace(hour=0, minute=0, second=0, microsecond=0)
+    return ts.replace(minute=0, second=0, microsecond=0)
+
+
+def align_up(ts: datetime, bucket: Bucket) -> datetime:
+    """Ceil `ts` to a UTC hour/day boundary (unchanged if already on one)."""
+    floor = align(ts, bucket)
+    return floor if floor == _utc(ts) else floor + BUCKET_WIDTH[bucket]
+
+
+def rollup_horizon(db_now: datetime, settle_s: float, oldest_xact: datetime | None) -> datetime:
+    """
+    How far the watermark may move: `settle_s` behind now, and never past the
+    start of a transaction that is still open, since its rows are not visible yet.
+    """
+    horizon = db_now - timedelta(seconds=settle_s)
+    return horizon if oldest_xact is None else min(horizon, oldest_xact)
+
+
+@dataclass(frozen=True)
+class RollupStep:
+    lo: datetime | None
+    hi: datetime | None
+    groups: int  # (hour, label) rows upserted
+    caught_up: bool
+
+
+async def refresh_rollup(
+    db: AsyncSession,
+    settle_s: float = 30.0,
+    max_span: timedelta = timedelta(days=1),
+) -> RollupStep:
+    """
+    Fold the next slice of `sentiment` into sentiment_rollup and advance the watermark.
+
+    Only rows older than `settle_s` are taken, and never rows from after the
+    start of the oldest transaction still open (created_at = its start time, so
+    a slow COPY or import commits rows far below now). At most `max_span` of
+    history is processed per call to keep transactions short; loop until
+    `caught_up`. The caller commits.
+    """
+    watermark, db_now, oldest, oldest_xact = (await db.execute(_CLAIM)).one()
+    target = rollup_horizon(db_now, settle_s, oldest_xact)
+    lo = watermark if watermark is not None else oldest
+    if lo is None:  # no rows at all yet
+        await db.execute(_ADVANCE, {"hi": target})
+        return RollupStep(None, target, 0, True)
+    if lo >= target:
+        return RollupStep(lo, lo, 0, True)
+
+    hi = min(target, lo + max_span)
+    res = await db.execute(_AGGREGATE, {"lo": lo, "hi": hi})
+    await db.execute(_ADVANCE, {"hi": hi})
+    return RollupStep(lo, hi, max(0, res.rowcount or 0), hi >= target)
+
+
+async def rebuild_rollup(db: AsyncSession, start: datetime, end: datetime) -> int:
+    """
+    Recompute the hours in [start, end) from the raw table, e.g. after deletes,
+    backfills or edits older than the watermark. Hours past the watermark are
+    left to the regular job. The caller commits; returns (hour, label) rows written.
+    """
+    watermark = (await db.execute(_CLAIM)).one().watermark
+    lo, hi = align(start, "hour"), align_up(end, "hour")
+    if watermark is not None:
+        hi = min(hi, align(watermark, "hour"))
+    if watermark is None or hi <= lo:
+        return 0
+    await db.execute(
+        text("DELETE FROM sentiment_rollup WHERE bucket_start >= :lo AND bucket_start < :hi"),
+        {"lo": lo, "hi": hi},
+    )
+    res = await db.execute(_AGGREGATE, {"lo": lo, "hi": hi})
+    return max(0, res.rowcount or 0)
+
+
+async def query_timeseries(
+    db: AsyncSession, start: datetime, end: datetime, bucket: Bucket
+) -> list[tuple[datetime, str, int, float]]:
+    """(bucket_start, label, count, score_sum) for buckets in [start, end), oldest first."""
+    res = await db.execute(_TIMESERIES, {"unit": bucket, "lo": start, "hi": end})
+    return [(b, label, int(n), float(s or 0.0)) for b, label, n, s in res.all()]
+
+
+class RollupWorker:
+    """Runs `refresh_rollup` every `interval_s` in the background until caught up."""
+
+    def __init__(
+        self,
+        session_factory: async_sessionmaker[AsyncSession],
+        interval_s: float = 60.0,
+        settle_s: float = 30.0,
+        max_span: timedelta = timedelta(days=1),
+    ) -> None:
+        self.session_factory = session_factory
+        self.interval_s = interval_s
+        self.settle_s = settle_s
+        self.max_span = max_span
+        self.runs = 0
+        self.watermark: datetime | None = None
+        self.last_run_ms: float | None = None
+        self.last_error: str | None = None
+        self._task: asyncio.Task | None = None
+
+    async def run_once(self) -> int:
+        """Catch the rollup up to now - settle_s; returns (hour, label) rows upserted."""
+        started = time.perf_counter()
+        groups = 0
+        while True:
+            async with self.session_factory() as db:
+                step = await refresh_rollup(db, self.settle_s, self.max_span)
+                await db.commit()
+            groups += step.groups
+            self.watermark = step.hi or self.watermark
+            if step.caught_up:
+                break
+        self.runs += 1
+        self.last_run_ms = (time.perf_counter() - started) * 1000.0
+        self.last_error = None
+        return groups
+
+    async def _run(self) -> None:
+        while True:
+            await asyncio.sleep(self.interval_s)
+            try:
+                await self.run_once()
+            except asyncio.CancelledError:
+                raise
+            except Exception as exc:
+                # DB down or busy: the watermark didn't move, next tick retries the same range
+                self.last_error = repr(exc)
+                logger.exception("sentiment_rollup_failed")
+
+    def start(self) -> None:
+        if self._task is None or self._task.done():
+            self._task = asyncio.get_running_loop().create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            # A task left on another (already closed) loop can't be awaited; just drop it
+            if self._task.get_loop() is asyncio.get_running_loop():
+                self._task.cancel()
+                await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+
+    def snapshot(self) -> dict[str, Any]:
+        return {
+            "interval_s": self.interval_s,
+            "settle_s": self.settle_s,
+            "runs": self.runs,
+            "watermark": self.watermark.isoformat() if self.watermark else None,
+            "last_run_ms": self.last_run_ms,
+            "last_error": self.last_error,
+        }
@@ -53,6 +53,15 @@ async def get_db() -> AsyncIterator[AsyncSession]:
             await session.close()
 
 
+def get_session_factory() -> async_sessionmaker[AsyncSession]:
+    """
+    The factory behind get_db, for work that must not borrow the request's session
+    (e.g. a load shared by concurrent requests). Override it along with get_db to
+    point the app at another database.
+    """
+    return AsyncSessionLocal
+
+
 # ---- Optional graceful shutdown helpers ----
 async def dispose_engine() -> None:
     """Call on app shutdown to close the engine cleanly."""
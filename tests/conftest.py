@@ -21,7 +21,7 @@ from sqlalchemy.ext.asyncio import (
 
 from src.api.app import create_app
 from src.config.settings import Settings
-from src.db.session import get_db
+from src.db.session import get_db, get_session_factory
 
 # ---------------------------------------------------------------------------
 # Configuration
@@ -172,6 +172,11 @@ async def test_client(db_session: AsyncSession) -> AsyncGenerator[AsyncClient, N
         yield db_session
 
     app.dependency_overrides[get_db] = _get_test_db
+    # Loads that open their own sessions (e.g. the cached summary) use the test DB too
+    test_sessions = async_sessionmaker(
+        bind=db_session.bind, expire_on_commit=False, class_=AsyncSession
+    )
+    app.dependency_overrides[get_session_factory] = lambda: test_sessions
 
     async with LifespanManager(app):
         transport = ASGITransport(app=app)
@@ -197,7 +202,8 @@ def _mock_smtp_and_email_handoff(monkeypatch):
 
     - Clear SMTP-related env vars.
     - Replace smtplib.SMTP with a dummy.
-    - Replace send_handoff_email at both the notify module and the router import site.
+    - Replace send_handoff_email at both the notify module and the router import site,
+      and the outbox enqueue helpers the router actually calls.
       (Individual tests can still override with their own monkeypatch.)
     """
     for k in ("SMTP_HOST", "SMTP_PORT", "SMTP_FROM", "HANDOFF_TO"):
@@ -215,6 +221,12 @@ def _mock_smtp_and_email_handoff(monkeypatch):
         def send_message(self, *a, **kw):
             return None
 
+        def noop(self):
+            return (250, b"OK")
+
+        def quit(self):
+            return None
+
     monkeypatch.setattr(smtplib, "SMTP", _DummySMTP, raising=True)
 
     # No-op email sender
@@ -225,6 +237,18 @@ def _mock_smtp_and_email_handoff(monkeypatch):
         import src.ai.faq.notify as notify_mod
 
         monkeypatch.setattr(notify_mod, "send_handoff_email", _noop, raising=False)
+        monkeypatch.setattr(notify_mod, "send_handoff_digest", _noop, raising=False)
+    except Exception:
+        pass
+
+    async def _async_noop(*args, **kwargs):
+        return True
+
+    try:
+        import src.ai.faq.outbox as outbox_mod
+
+        monkeypatch.setattr(outbox_mod, "enqueue_handoff_email", _async_noop, raising=False)
+        monkeypatch.setattr(outbox_mod, "enqueue_handoff_digest", _async_noop, raising=False)
     except Exception:
         pass
 
@@ -232,6 +256,9 @@ def _mock_smtp_and_email_handoff(monkeypatch):
         import src.api.routes.faq as faq_mod
 
         monkeypatch.setattr(faq_mod, "send_handoff_email", _noop, raising=False)
+        monkeypatch.setattr(faq_mod, "send_handoff_digest", _noop, raising=False)
+        monkeypatch.setattr(faq_mod, "enqueue_handoff_email", _async_noop, raising=False)
+        monkeypatch.setattr(faq_mod, "enqueue_handoff_digest", _async_noop, raising=False)
     except Exception:
         pass
 
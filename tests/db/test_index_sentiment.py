@@ -8,6 +8,8 @@ from sqlalchemy.ext.asyncio import create_async_engine
 
 INDEX_NAME = "ix_sentiment_label_created_at"
 TABLE_NAME = "sentiment"
+# The revision that *precedes* the index migration (later migrations stack on top)
+DOWNGRADE_TARGET_BEFORE_INDEX = "9ddf87711437"
 
 
 def _resolve_db_url() -> str:
@@ -44,7 +46,7 @@ async def _list_indexes(db_url: str):
 def test_sentiment_index_exists_and_downgrades_cleanly():
     """
     - Upgrade to head: index must exist
-    - Downgrade one revision: index must be gone
+    - Downgrade to the revision before the index: index must be gone
     - Upgrade back to head: index exists again
     """
     # Configure Alembic
@@ -59,8 +61,8 @@ def test_sentiment_index_exists_and_downgrades_cleanly():
     names = {i["name"] for i in idx}
     assert INDEX_NAME in names, f"{INDEX_NAME} not found after upgrade; got {names}"
 
-    # Downgrade one revision (the index migration) and verify removal
-    command.downgrade(cfg, "-1")
+    # Downgrade past the index migration and verify removal
+    command.downgrade(cfg, DOWNGRADE_TARGET_BEFORE_INDEX)
     idx = asyncio.run(_list_indexes(db_url))
     names = {i["name"] for i in idx}
     assert INDEX_NAME not in names, f"{INDEX_NAME} still present after downgrade; got {names}"
@@ -0,0 +1,80 @@
+import asyncio
+import os
+import uuid
+
+import sqlalchemy as sa
+from alembic import command
+from alembic.config import Config
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+
+from src.db.sentiment_counts import reconcile_label_counts
+
+
+def _resolve_db_url() -> str:
+    url = os.getenv("DATABASE_URL") or os.getenv("DATABASE_ASYNC_URL") or os.getenv("APP_DB_URL")
+    if url:
+        return url
+
+    user = os.getenv("APP_DB_USER", "appuser")
+    pw = os.getenv("APP_DB_PASSWORD", "apppass")
+    host = os.getenv("APP_DB_HOST", "localhost")
+    port = os.getenv("APP_DB_PORT", "5432")
+    name = os.getenv("APP_DB_NAME", "appdb")
+    return f"postgresql+asyncpg://{user}:{pw}@{host}:{port}/{name}"
+
+
+async def _counters(conn) -> dict[str, int]:
+    res = await conn.execute(sa.text("SELECT label, count FROM sentiment_label_counts"))
+    return {label: int(n) for label, n in res.all()}
+
+
+async def _exercise_triggers(db_url: str) -> None:
+    engine = create_async_engine(db_url, future=True)
+    try:
+        async with engine.connect() as conn:
+            trans = await conn.begin()  # rolled back: leaves the DB as it was
+            before = await _counters(conn)
+
+            ids = [uuid.uuid4() for _ in range(5)]
+            rows = [
+                {"id": ids[0], "label": "positive"},
+                {"id": ids[1], "label": "positive"},
+                {"id": ids[2], "label": "negative"},
+                {"id": ids[3], "label": "neutral"},
+                {"id": ids[4], "label": "neutral"},
+            ]
+            await conn.execute(
+                sa.text(
+                    "INSERT INTO sentiment (id, text, score, label) VALUES (:id, 't', 0, :label)"
+                ),
+                rows,
+            )
+            await conn.execute(
+                sa.text("UPDATE sentiment SET label = 'negative' WHERE id = :id"), {"id": ids[3]}
+            )
+            await conn.execute(sa.text("DELETE FROM sentiment WHERE id = :id"), {"id": ids[0]})
+
+            after = await _counters(conn)
+            delta = {label: after[label] - before.get(label, 0) for label in after}
+            assert delta == {"positive": 1, "negative": 2, "neutral": 1}
+
+            # Counters agree with a full recount; corrupted counters get rebuilt
+            await conn.execute(sa.text("UPDATE sentiment_label_counts SET count = count + 7"))
+            db = AsyncSession(bind=conn)
+            report = await reconcile_label_counts(db)
+            assert all(r["counter"] - r["actual"] == 7 for r in report.values())
+            assert await _counters(conn) == {label: r["actual"] for label, r in report.items()}
+
+            await trans.rollback()
+    finally:
+        await engine.dispose()
+
+
+def test_label_counts_follow_inserts_updates_and_deletes():
+    cfg = Config()
+    cfg.set_main_option("script_location", "src/db/migrations")
+    db_url = _resolve_db_url()
+    cfg.set_main_option("sqlalchemy.url", db_url)
+    command.upgrade(cfg, "head")
+
+    asyncio.run(_exercise_triggers(db_url))
@@ -0,0 +1,90 @@
+import asyncio
+import os
+import uuid
+from datetime import UTC, datetime, timedelta
+
+import sqlalchemy as sa
+from alembic import command
+from alembic.config import Config
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+
+from src.db.sentiment_rollup import query_timeseries, refresh_rollup
+
+
+def _resolve_db_url() -> str:
+    url = os.getenv("DATABASE_URL") or os.getenv("DATABASE_ASYNC_URL") or os.getenv("APP_DB_URL")
+    if url:
+        return url
+
+    user = os.getenv("APP_DB_USER", "appuser")
+    pw = os.getenv("APP_DB_PASSWORD", "apppass")
+    host = os.getenv("APP_DB_HOST", "localhost")
+    port = os.getenv("APP_DB_PORT", "5432")
+    name = os.getenv("APP_DB_NAME", "appdb")
+    return f"postgresql+asyncpg://{user}:{pw}@{host}:{port}/{name}"
+
+
+async def _exercise_rollup(db_url: str) -> None:
+    engine = create_async_engine(db_url, future=True)
+    base = datetime(1999, 1, 1, tzinfo=UTC)  # far from real data
+    try:
+        async with engine.connect() as conn:
+            trans = await conn.begin()  # rolled back: leaves the DB as it was
+            db = AsyncSession(bind=conn)
+            await conn.execute(
+                sa.text("UPDATE sentiment_rollup_state SET watermark = :wm"), {"wm": base}
+            )
+            rows = [
+                {
+                    "id": uuid.uuid4(),
+                    "label": label,
+                    "score": score,
+                    "ts": base + timedelta(minutes=m),
+                }
+                for m, label, score in [
+                    (5, "positive", 1.0),
+                    (50, "positive", 0.5),
+                    (70, "negative", -1.0),
+                    (200, "neutral", 0.0),
+                ]
+            ]
+            await conn.execute(
+                sa.text(
+                    "INSERT INTO sentiment (id, text, score, label, created_at) "
+                    "VALUES (:id, 't', :score, :label, :ts)"
+                ),
+                rows,
+            )
+            hi = base + timedelta(hours=4)
+
+            # Before the job runs everything comes from the raw tail; after, from the rollup
+            before = await query_timeseries(db, base, hi, "hour")
+            step = await refresh_rollup(db, settle_s=0, max_span=timedelta(minutes=90))
+            assert not step.caught_up and step.hi == base + timedelta(minutes=90)
+            mixed = await query_timeseries(db, base, hi, "hour")
+            assert before == mixed
+            assert [(b - base, label, n) for b, label, n, _ in mixed] == [
+                (timedelta(0), "positive", 2),
+                (timedelta(hours=1), "negative", 1),
+                (timedelta(hours=3), "neutral", 1),
+            ]
+            days = await query_timeseries(db, base, base + timedelta(days=1), "day")
+            assert sorted((label, n) for _, label, n, _ in days) == [
+                ("negative", 1),
+                ("neutral", 1),
+                ("positive", 2),
+            ]
+
+            await trans.rollback()
+    finally:
+        await engine.dispose()
+
+
+def test_rollup_and_raw_tail_give_the_same_timeseries():
+    cfg = Config()
+    cfg.set_main_option("script_location", "src/db/migrations")
+    db_url = _resolve_db_url()
+    cfg.set_main_option("sqlalchemy.url", db_url)
+    command.upgrade(cfg, "head")
+
+    asyncio.run(_exercise_rollup(db_url))
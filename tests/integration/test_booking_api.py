@@ -1,5 +1,7 @@
 from __future__ import annotations
 
+import json
+import uuid
 from datetime import UTC, datetime, timedelta
 
 import pytest
@@ -45,3 +47,152 @@ async def test_create_list_read_update_delete_booking(test_client: AsyncClient):
     # Verify 404 after delete
     r = await test_client.get(f"/bookings/{bid}")
     assert r.status_code == 404
+
+
+@pytest.mark.asyncio
+async def test_list_bookings_cursor_pages_match_offset_pages(test_client: AsyncClient):
+    now = datetime.now(UTC).replace(microsecond=0)
+    email = "pager@example.com"
+    for i in range(5):
+        payload = {
+            "customer_name": f"Pager {i}",
+            "customer_email": email,
+            "starts_at": (now + timedelta(days=i)).isoformat(),
+            "ends_at": (now + timedelta(days=i, hours=1)).isoformat(),
+        }
+        assert (await test_client.post("/bookings", json=payload)).status_code == 201
+
+    by_cursor, cursor = [], None
+    while True:
+        params = {"limit": 2, "email": email} | ({"cursor": cursor} if cursor else {})
+        page = await test_client.get("/bookings", params=params)
+        by_cursor += [item["id"] for item in page.json()]
+        cursor = page.headers.get("X-Next-Cursor")
+        if cursor is None:
+            assert "Link" not in page.headers
+            break
+        assert page.headers["Link"].endswith('>; rel="next"') and cursor in page.headers["Link"]
+
+    by_offset = []
+    for offset in range(0, 6, 2):
+        r = await test_client.get(
+            "/bookings", params={"limit": 2, "offset": offset, "email": email}
+        )
+        by_offset += [item["id"] for item in r.json()]
+
+    assert len(by_cursor) == 5
+    assert by_cursor == by_offset
+
+    r = await test_client.get("/bookings", params={"cursor": "not-a-cursor"})
+    assert r.status_code == 422
+
+
+@pytest.mark.asyncio
+async def test_overlapping_bookings_conflict_and_availability_shows_gaps(
+    test_client: AsyncClient,
+):
+    day = datetime(2031, 6, 2, tzinfo=UTC)
+
+    def booking(start_h: int, end_h: int) -> dict:
+        return {
+            "customer_name": "Slot",
+            "customer_email": "slot@example.com",
+            "starts_at": (day + timedelta(hours=start_h)).isoformat(),
+            "ends_at": (day + timedelta(hours=end_h)).isoformat(),
+        }
+
+    assert (await test_client.post("/bookings", json=booking(9, 10))).status_code == 201
+    # Back-to-back is fine: ranges are half-open
+    assert (await test_client.post("/bookings", json=booking(10, 11))).status_code == 201
+    assert (await test_client.post("/bookings", json=booking(13, 14))).status_code == 201
+
+    r = await test_client.get(
+        "/bookings/availability",
+        params={
+            "from": (day + timedelta(hours=8)).isoformat(),
+            "to": (day + timedelta(hours=17)).isoformat(),
+        },
+    )
+    assert r.status_code == 200, r.text
+    free = [
+        (datetime.fromisoformat(s["starts_at"]), datetime.fromisoformat(s["ends_at"]))
+        for s in r.json()["free"]
+    ]
+    assert free == [
+        (day + timedelta(hours=8), day + timedelta(hours=9)),
+        (day + timedelta(hours=11), day + timedelta(hours=13)),
+        (day + timedelta(hours=14), day + timedelta(hours=17)),
+    ]
+
+    # Last: a conflict rolls back the (shared) test session
+    r = await test_client.post("/bookings", json=booking(9, 12))
+    assert r.status_code == 409
+
+
+@pytest.mark.asyncio
+async def test_bulk_import_merges_and_reports_conflicts(test_client: AsyncClient):
+    day = datetime(2032, 3, 1, tzinfo=UTC)
+
+    def row(start_h: int, end_h: int, **extra) -> str:
+        return json.dumps(
+            {
+                "customer_name": "Legacy",
+                "customer_email": "legacy@example.com",
+                "starts_at": (day + timedelta(hours=start_h)).isoformat(),
+                "ends_at": (day + timedelta(hours=end_h)).isoformat(),
+                **extra,
+            }
+        )
+
+    existing = json.loads(row(9, 10))
+    assert (await test_client.post("/bookings", json=existing)).status_code == 201
+
+    legacy_id = str(uuid.uuid4())
+    body = "\n".join(
+        [
+            row(11, 12, id=legacy_id),
+            row(9, 11),  # overlaps the existing 09-10 booking
+            row(9, 11, status="cancelled"),  # cancelled rows don't block anything
+            '{"customer_name": "x"}',
+        ]
+    )
+    headers = {"Content-Type": "application/x-ndjson"}
+    r = await test_client.post("/bookings:bulk", content=body, headers=headers)
+    assert r.status_code == 200, r.text
+    out = r.json()
+    assert (out["received"], out["inserted"], out["rejected"]) == (4, 2, 2)
+    assert [e["line"] for e in out["errors"]] == [2, 4]
+
+    r = await test_client.get(f"/bookings/{legacy_id}")
+    assert r.status_code == 200 and r.json()["status"] == "pending"
+
+    # Re-running the same file imports nothing twice
+    r = await test_client.post("/bookings:bulk", content=row(11, 12, id=legacy_id), headers=headers)
+    assert r.json()["inserted"] == 0 and r.json()["rejected"] == 1
+
+
+@pytest.mark.asyncio
+async def test_if_match_guards_concurrent_edits(test_client: AsyncClient):
+    start = datetime(2033, 1, 3, 9, tzinfo=UTC)
+    payload = {
+        "customer_name": "Eve",
+        "customer_email": "eve@example.com",
+        "starts_at": start.isoformat(),
+        "ends_at": (start + timedelta(hours=1)).isoformat(),
+    }
+    r = await test_client.post("/bookings", json=payload)
+    bid, etag = r.json()["id"], r.headers["ETag"]
+    assert etag == '"1"'
+
+    # Two clients read version 1; the first write wins, the second gets 412
+    r = await test_client.patch(f"/bookings/{bid}", json={"notes": "A"}, headers={"If-Match": etag})
+    assert r.status_code == 200 and r.json()["version"] == 2
+    assert r.headers["ETag"] == '"2"'
+    r = await test_client.patch(f"/bookings/{bid}", json={"notes": "B"}, headers={"If-Match": etag})
+    assert r.status_code == 412 and r.headers["ETag"] == '"2"'
+
+    r = await test_client.delete(f"/bookings/{bid}", headers={"If-Match": etag})
+    assert r.status_code == 412
+    r = await test_client.delete(f"/bookings/{bid}", headers={"If-Match": '"2"'})
+    assert r.status_code == 204
+    assert (await test_client.delete(f"/bookings/{bid}")).status_code == 404
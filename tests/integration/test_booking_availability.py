@@ -0,0 +1,101 @@
+from __future__ import annotations
+
+from datetime import UTC, datetime, timedelta
+
+import pytest
+from asgi_lifespan import LifespanManager
+from httpx import ASGITransport, AsyncClient
+from sqlalchemy.exc import IntegrityError
+
+from src.api.app import app
+from src.api.routes import bookings as bookings_route
+from src.db.session import get_db
+
+
+async def _request(method: str, url: str, **kw):
+    transport = ASGITransport(app=app)
+    async with LifespanManager(app):
+        async with AsyncClient(transport=transport, base_url="http://testserver") as client:
+            return await client.request(method, url, **kw)
+
+
+@pytest.mark.asyncio
+async def test_availability_returns_free_slots(monkeypatch) -> None:
+    calls = []
+    t0 = datetime(2026, 3, 2, 9, tzinfo=UTC)
+
+    async def fake_free_slots(db, start, end, min_length):
+        calls.append((start, end, min_length))
+        return [(t0, t0 + timedelta(hours=1)), (t0 + timedelta(hours=2), end)]
+
+    monkeypatch.setattr(bookings_route, "free_slots", fake_free_slots)
+    r = await _request(
+        "GET",
+        "/bookings/availability",
+        params={"from": "2026-03-02T09:00:00", "to": "2026-03-02T17:00:00Z", "min_minutes": 30},
+    )
+    assert r.status_code == 200, r.text
+
+    # Naive 'from' is taken as UTC
+    assert calls == [(t0, t0 + timedelta(hours=8), timedelta(minutes=30))]
+    assert [(s["starts_at"], s["ends_at"]) for s in r.json()["free"]] == [
+        ("2026-03-02T09:00:00Z", "2026-03-02T10:00:00Z"),
+        ("2026-03-02T11:00:00Z", "2026-03-02T17:00:00Z"),
+    ]
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    "params",
+    [
+        {"from": "2026-03-02T10:00:00Z", "to": "2026-03-02T09:00:00Z"},  # to before from
+        {"from": "2026-01-01T00:00:00Z", "to": "2026-12-31T00:00:00Z"},  # window too long
+        {"from": "2026-03-02T09:00:00Z"},  # to is required
+    ],
+)
+async def test_availability_rejects_bad_windows(params) -> None:
+    r = await _request("GET", "/bookings/availability", params=params)
+    assert r.status_code == 422
+
+
+class _Orig(Exception):
+    pgcode = "23P01"  # exclusion_violation
+
+
+class _ConflictingSession:
+    rolled_back = False
+
+    def add(self, obj) -> None:
+        pass
+
+    async def flush(self) -> None:
+        raise IntegrityError("INSERT INTO bookings ...", {}, _Orig("conflicting key value"))
+
+    async def rollback(self) -> None:
+        self.rolled_back = True
+
+
+@pytest.mark.asyncio
+async def test_overlapping_booking_is_409() -> None:
+    session = _ConflictingSession()
+
+    async def _get_conflicting_db():
+        yield session
+
+    app.dependency_overrides[get_db] = _get_conflicting_db
+    try:
+        r = await _request(
+            "POST",
+            "/bookings",
+            json={
+                "customer_name": "Bob",
+                "customer_email": "bob@example.com",
+                "starts_at": "2026-03-02T09:30:00Z",
+                "ends_at": "2026-03-02T10:30:00Z",
+            },
+        )
+    finally:
+        app.dependency_overrides.pop(get_db, None)
+
+    assert r.status_code == 409
+    assert session.rolled_back
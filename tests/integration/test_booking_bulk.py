@@ -0,0 +1,48 @@
+from __future__ import annotations
+
+import pytest
+from asgi_lifespan import LifespanManager
+from httpx import ASGITransport, AsyncClient
+
+from src.api import booking_import
+from src.api.app import app
+from src.api.routes import bookings as bookings_route
+
+
+async def _post(body: bytes, content_type: str):
+    transport = ASGITransport(app=app)
+    async with LifespanManager(app):
+        async with AsyncClient(transport=transport, base_url="http://testserver") as client:
+            return await client.post(
+                "/bookings:bulk", content=body, headers={"Content-Type": content_type}
+            )
+
+
+@pytest.mark.asyncio
+async def test_bulk_csv_is_streamed_in_chunks(monkeypatch) -> None:
+    chunks = []
+
+    async def fake_load_chunk(db, rows):
+        chunks.append([r["line"] for r in rows])
+        return []
+
+    monkeypatch.setattr(booking_import, "_load_chunk", fake_load_chunk)
+    monkeypatch.setattr(bookings_route.settings, "booking_import_chunk_rows", 2)
+    body = "customer_name,customer_email,starts_at,ends_at,notes\n" + "".join(
+        f"C{i},c{i}@example.com,2030-01-0{i}T09:00:00Z,2030-01-0{i}T10:00:00Z,\n"
+        for i in range(1, 6)
+    )
+    body += "Bad,not-an-email,2030-01-09T09:00:00Z,2030-01-09T10:00:00Z,\n"
+
+    r = await _post(body.encode(), "text/csv; charset=utf-8")
+    assert r.status_code == 200, r.text
+    out = r.json()
+    assert chunks == [[2, 3], [4, 5], [6]]
+    assert (out["received"], out["inserted"], out["rejected"]) == (6, 5, 1)
+    assert out["errors"][0]["line"] == 7 and "customer_email" in out["errors"][0]["error"]
+
+
+@pytest.mark.asyncio
+async def test_bulk_rejects_unknown_content_type() -> None:
+    r = await _post(b"[]", "application/json")
+    assert r.status_code == 415
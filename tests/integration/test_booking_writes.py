@@ -0,0 +1,121 @@
+from __future__ import annotations
+
+import uuid
+from datetime import UTC, datetime
+
+import pytest
+from asgi_lifespan import LifespanManager
+from httpx import ASGITransport, AsyncClient
+
+from src.api.app import app
+from src.db.session import get_db
+
+BOOKING_ID = uuid.uuid4()
+
+
+class _Result:
+    def __init__(self, row: dict | None) -> None:
+        self.row = row
+
+    def mappings(self):
+        return self
+
+    def first(self):
+        return self.row
+
+    def scalar_one_or_none(self):
+        return self.row["id"] if self.row else None
+
+
+class _FakeSession:
+    """Stands in for the DB: a booking at `version`, or none when version is None."""
+
+    def __init__(self, version: int | None) -> None:
+        self.version = version
+        self.statements: list[str] = []
+
+    def _matches(self, params: dict) -> bool:
+        if self.version is None:
+            return False
+        in_lists = [v for v in params.values() if isinstance(v, list)]  # version IN (...)
+        return not in_lists or self.version in in_lists[0]
+
+    async def execute(self, stmt):
+        sql = str(stmt.compile())
+        params = stmt.compile().params
+        self.statements.append(sql.split()[0])
+        if not self._matches(params):
+            return _Result(None)
+        if sql.startswith("UPDATE"):
+            self.version += 1
+        now = datetime(2030, 1, 1, tzinfo=UTC)
+        return _Result(
+            {
+                "id": BOOKING_ID,
+                "customer_name": "Ann",
+                "customer_email": "ann@example.com",
+                "starts_at": now,
+                "ends_at": now.replace(hour=1),
+                "notes": params.get("notes"),
+                "status": "pending",
+                "created_at": now,
+                "updated_at": now,
+                "version": self.version,
+            }
+        )
+
+    async def scalar(self, stmt):
+        self.statements.append("SELECT")
+        return self.version
+
+
+async def _request(session: _FakeSession, method: str, headers: dict | None = None, **kw):
+    async def _get_fake_db():
+        yield session
+
+    app.dependency_overrides[get_db] = _get_fake_db
+    try:
+        transport = ASGITransport(app=app)
+        async with LifespanManager(app):
+            async with AsyncClient(transport=transport, base_url="http://testserver") as client:
+                return await client.request(
+                    method, f"/bookings/{BOOKING_ID}", headers=headers or {}, **kw
+                )
+    finally:
+        app.dependency_overrides.pop(get_db, None)
+
+
+@pytest.mark.asyncio
+async def test_patch_is_one_update_and_bumps_the_etag() -> None:
+    session = _FakeSession(version=3)
+    r = await _request(session, "PATCH", {"If-Match": '"3"'}, json={"notes": "moved"})
+    assert r.status_code == 200, r.text
+    assert r.json()["notes"] == "moved" and r.json()["version"] == 4
+    assert r.headers["ETag"] == '"4"'
+    assert session.statements == ["UPDATE"]
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("if_match", ['"2"', 'W/"3"', '"abc"'])
+async def test_patch_with_stale_or_weak_if_match_is_412(if_match) -> None:
+    session = _FakeSession(version=3)
+    r = await _request(session, "PATCH", {"If-Match": if_match}, json={"notes": "x"})
+    assert r.status_code == 412
+    assert r.headers["ETag"] == '"3"'
+    assert session.version == 3
+
+
+@pytest.mark.asyncio
+async def test_missing_booking_is_404_without_a_second_query() -> None:
+    session = _FakeSession(version=None)
+    assert (await _request(session, "PATCH", json={"notes": "x"})).status_code == 404
+    assert (await _request(session, "DELETE")).status_code == 404
+    assert session.statements == ["UPDATE", "DELETE"]
+
+
+@pytest.mark.asyncio
+async def test_delete_honours_if_match() -> None:
+    session = _FakeSession(version=5)
+    assert (await _request(session, "DELETE", {"If-Match": '"4"'})).status_code == 412
+    assert (await _request(session, "DELETE", {"If-Match": '"4", "5"'})).status_code == 204
+    assert (await _request(session, "DELETE", {"If-Match": "*"})).status_code == 204
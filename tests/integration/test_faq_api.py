@@ -43,3 +43,41 @@ async def test_faq_ask_returns_answer(monkeypatch):
     assert data["answer"] == "Use /bookings."
     assert data["source_id"] == "faq-001"
     assert 0.0 <= data["score"] <= 1.0
+
+
+@pytest.mark.asyncio
+async def test_faq_ask_topk_with_tag_filter(monkeypatch):
+    import src.api.routes.faq as faq_mod
+
+    class FakeEmbedder:
+        def encode(self, texts):
+            return np.vstack([np.array([1.0, 0.0], dtype="float32") for _ in texts])
+
+    faqs = [
+        types.SimpleNamespace(id="faq-001", question="Demo?", answer="A1", tags=["demo"]),
+        types.SimpleNamespace(id="faq-002", question="Cancel?", answer="A2", tags=["booking"]),
+        types.SimpleNamespace(id="faq-003", question="Move?", answer="A3", tags=["booking"]),
+    ]
+    doc_emb = np.array([[1.0, 0.0], [0.8, 0.6], [0.6, 0.8]], dtype="float32")
+
+    monkeypatch.setattr(faq_mod, "_FAQS", faqs, raising=False)
+    monkeypatch.setattr(faq_mod, "_DOC_EMB", doc_emb, raising=False)
+    monkeypatch.setattr(faq_mod, "_EMBEDDER", FakeEmbedder(), raising=False)
+    monkeypatch.setattr(faq_mod.settings, "faq_confidence_threshold", 0.20, raising=False)
+
+    transport = ASGITransport(app=app)
+    async with LifespanManager(app):
+        async with AsyncClient(transport=transport, base_url="http://test") as ac:
+            res = await ac.post(
+                "/faq/ask", json={"question": "move my booking", "k": 5, "tags": ["Booking"]}
+            )
+            plain = await ac.post("/faq/ask", json={"question": "demo"})
+
+    assert res.status_code == 200
+    data = res.json()
+    # faq-001 is the global best match but is excluded by the tag filter
+    assert data["source_id"] == "faq-002"
+    assert [c["source_id"] for c in data["candidates"]] == ["faq-002", "faq-003"]
+    assert data["candidates"][0]["score"] >= data["candidates"][1]["score"]
+    # Without k the response shape is unchanged
+    assert "candidates" not in plain.json()
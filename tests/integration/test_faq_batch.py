@@ -0,0 +1,77 @@
+import types
+
+import numpy as np
+import pytest
+from asgi_lifespan import LifespanManager
+from httpx import ASGITransport, AsyncClient
+
+from src.api.app import app
+
+
+@pytest.mark.asyncio
+async def test_faq_ask_batch_encodes_once_and_sends_one_digest(monkeypatch):
+    import src.api.routes.faq as faq_mod
+
+    encode_calls = []
+
+    class FakeEmbedder:
+        def encode(self, texts):
+            encode_calls.append(list(texts))
+            # "demo" questions match doc 0 exactly; anything else scores <= 0.5
+            return np.vstack(
+                [
+                    np.array([1.0, 0.0] if "demo" in t else [0.0, 1.0], dtype="float32")
+                    for t in texts
+                ]
+            )
+
+    faqs = [
+        types.SimpleNamespace(id="faq-001", question="Book a demo?", answer="Use /bookings."),
+        types.SimpleNamespace(id="faq-002", question="Other?", answer="Other."),
+    ]
+    doc_emb = np.array([[1.0, 0.0], [0.6, -0.8]], dtype="float32")
+
+    monkeypatch.setattr(faq_mod, "_FAQS", faqs, raising=False)
+    monkeypatch.setattr(faq_mod, "_DOC_EMB", doc_emb, raising=False)
+    monkeypatch.setattr(faq_mod, "_EMBEDDER", FakeEmbedder(), raising=False)
+    monkeypatch.setattr(faq_mod.settings, "faq_confidence_threshold", 0.60, raising=False)
+
+    digests = []
+
+    async def fake_digest(settings, items, threshold):
+        digests.append(items)
+        return True
+
+    monkeypatch.setattr(faq_mod, "enqueue_handoff_digest", fake_digest, raising=False)
+
+    payload = {
+        "items": [
+            {"question": "demo please"},
+            {"question": "something unrelated"},
+            {"question": "another demo"},
+            {"question": "still unrelated"},
+        ]
+    }
+    transport = ASGITransport(app=app)
+    async with LifespanManager(app):
+        encode_calls.clear()  # ignore the lifespan warm-up encode
+        async with AsyncClient(transport=transport, base_url="http://test") as ac:
+            res = await ac.post("/faq/ask:batch", json=payload)
+
+    assert res.status_code == 200, res.text
+    results = res.json()["results"]
+    assert [r.get("source_id") for r in results] == ["faq-001", None, "faq-001", None]
+    assert results[1]["handoff"] is True and results[3]["handoff"] is True
+    # One model call for the whole batch, one digest for both handoffs
+    assert len(encode_calls) == 1 and len(encode_calls[0]) == 4
+    assert len(digests) == 1
+    assert [h.user_question for h in digests[0]] == ["something unrelated", "still unrelated"]
+
+
+@pytest.mark.asyncio
+async def test_faq_ask_batch_rejects_empty_batch():
+    transport = ASGITransport(app=app)
+    async with LifespanManager(app):
+        async with AsyncClient(transport=transport, base_url="http://test") as ac:
+            res = await ac.post("/faq/ask:batch", json={"items": []})
+    assert res.status_code == 422
@@ -43,11 +43,11 @@ async def test_faq_ask_above_threshold_returns_answer(monkeypatch):
     # Defensive: ensure we don't accidentally send email on this path
     calls = {"n": 0}
 
-    def never_called(*args, **kwargs):
+    async def never_called(*args, **kwargs):
         calls["n"] += 1
         return True
 
-    monkeypatch.setattr(faq_mod, "send_handoff_email", never_called, raising=False)
+    monkeypatch.setattr(faq_mod, "enqueue_handoff_email", never_called, raising=False)
 
     transport = ASGITransport(app=app)
     async with LifespanManager(app):
@@ -0,0 +1,47 @@
+import types
+
+import numpy as np
+import pytest
+from asgi_lifespan import LifespanManager
+from httpx import ASGITransport, AsyncClient
+
+from src.api.app import app
+
+
+@pytest.mark.asyncio
+async def test_repeated_questions_skip_the_model_until_the_corpus_changes(monkeypatch):
+    import src.api.routes.faq as faq_mod
+
+    encode_calls = []
+
+    class FakeEmbedder:
+        def encode(self, texts):
+            encode_calls.append(list(texts))
+            return np.vstack([np.array([1.0, 0.0], dtype="float32") for _ in texts])
+
+    faqs = [types.SimpleNamespace(id="faq-001", question="Cancel?", answer="Use /bookings.")]
+    monkeypatch.setattr(faq_mod, "_FAQS", faqs, raising=False)
+    monkeypatch.setattr(faq_mod, "_DOC_EMB", np.array([[1.0, 0.0]], dtype="float32"))
+    monkeypatch.setattr(faq_mod, "_EMBEDDER", FakeEmbedder(), raising=False)
+    monkeypatch.setattr(faq_mod.settings, "faq_confidence_threshold", 0.20, raising=False)
+
+    transport = ASGITransport(app=app)
+    async with LifespanManager(app):
+        encode_calls.clear()  # ignore the lifespan warm-up encode
+        async with AsyncClient(transport=transport, base_url="http://test") as ac:
+            first = await ac.post("/faq/ask", json={"question": "How do I cancel?"})
+            again = await ac.post("/faq/ask", json={"question": "  how do i   CANCEL? "})
+            assert again.json() == first.json()
+            assert len(encode_calls) == 1
+
+            # New corpus version: results are recomputed, the question vector is reused
+            faqs2 = [types.SimpleNamespace(id="faq-002", question="Cancel?", answer="New.")]
+            monkeypatch.setattr(faq_mod, "_FAQS", faqs2, raising=False)
+            monkeypatch.setattr(faq_mod, "_DOC_EMB", np.array([[1.0, 0.0]], dtype="float32"))
+            res = await ac.post("/faq/ask", json={"question": "how do I cancel?"})
+            metrics = (await ac.get("/faq/metrics")).json()["cache"]
+
+    assert res.json()["source_id"] == "faq-002"
+    assert len(encode_calls) == 1
+    assert metrics["embeddings"]["hits"] >= 1
+    assert metrics["results"]["entries"] == 1
@@ -0,0 +1,93 @@
+import functools
+import textwrap
+
+import numpy as np
+import pytest
+from asgi_lifespan import LifespanManager
+from fastapi import HTTPException
+from httpx import ASGITransport, AsyncClient
+
+import src.ai.faq.embedder as emb_mod
+from src.ai.faq.data_loader import FAQItem
+from src.api.app import app
+
+
+@pytest.mark.asyncio
+async def test_reload_swaps_corpus_and_embeds_only_new_questions(monkeypatch, tmp_path):
+    import src.api.routes.faq as faq_mod
+
+    encode_calls = []
+
+    class FakeEmbedder:
+        def encode(self, texts):
+            encode_calls.append(list(texts))
+            return np.vstack(
+                [
+                    np.array([1.0, 0.0] if "refund" in t.lower() else [0.0, 1.0], dtype="float32")
+                    for t in texts
+                ]
+            )
+
+    yaml_path = tmp_path / "faqs.yaml"
+    manifest = tmp_path / "faqs_embeddings.json"
+    monkeypatch.setattr(faq_mod, "_FAQ_PATH", yaml_path)
+    monkeypatch.setattr(
+        faq_mod,
+        "load_or_build_embeddings",
+        functools.partial(emb_mod.load_or_build_embeddings, manifest=manifest),
+    )
+    embedder = FakeEmbedder()
+    faqs = [FAQItem(id="faq-001", question="Opening hours?", answer="9-5.")]
+    doc_emb, _ = emb_mod.load_or_build_embeddings(
+        [f.question for f in faqs], manifest=manifest, encode=embedder.encode
+    )
+    monkeypatch.setattr(faq_mod, "_FAQS", faqs, raising=False)
+    monkeypatch.setattr(faq_mod, "_DOC_EMB", doc_emb, raising=False)
+    monkeypatch.setattr(faq_mod, "_EMBEDDER", embedder, raising=False)
+    monkeypatch.setattr(faq_mod.settings, "faq_confidence_threshold", 0.60, raising=False)
+    monkeypatch.setattr(faq_mod.settings, "faq_admin_token", "s3cret", raising=False)
+
+    yaml_path.write_text(textwrap.dedent("""
+        - id: faq-001
+          question: "Opening hours?"
+          answer: "9-6 on weekdays."
+        - id: faq-002
+          question: "How do refunds work?"
+          answer: "Refunds take 5 days."
+    """).strip())
+
+    transport = ASGITransport(app=app)
+    async with LifespanManager(app):
+        encode_calls.clear()
+        async with AsyncClient(transport=transport, base_url="http://test") as ac:
+            denied = await ac.post("/faq/reload")
+            res = await ac.post("/faq/reload", headers={"X-Admin-Token": "s3cret"})
+            assert encode_calls == [["How do refunds work?"]]  # unchanged question reused
+            ask = await ac.post("/faq/ask", json={"question": "refund please"})
+            again = await ac.post("/faq/reload", headers={"X-Admin-Token": "s3cret"})
+
+    assert denied.status_code == 403
+    assert res.status_code == 200, res.text
+    body = res.json()
+    assert body["reloaded"] is True and body["size"] == 2
+    assert body["changes"] == {"added": 1, "removed": 0, "updated": 1, "embedded": 1}
+    assert ask.json()["source_id"] == "faq-002"
+    assert again.json()["reloaded"] is False
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    ("configured", "sent"),
+    [("s3cret", None), ("s3cret", "s3cre"), ("s3cret", "s3cret-"), (None, ""), ("", "")],
+)
+async def test_reload_rejects_wrong_or_unconfigured_token(monkeypatch, configured, sent):
+    import src.api.routes.faq as faq_mod
+
+    async def _never():
+        raise AssertionError("reloaded without a valid token")
+
+    monkeypatch.setattr(faq_mod.settings, "faq_admin_token", configured, raising=False)
+    monkeypatch.setattr(faq_mod, "reload_faqs", _never)
+    with pytest.raises(HTTPException) as err:
+        await faq_mod.reload(x_admin_token=sent)
+    assert err.value.status_code == 403
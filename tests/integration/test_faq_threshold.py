@@ -75,11 +75,11 @@ async def test_faq_ask_below_threshold_triggers_email(monkeypatch):
     # Spy on the *router's* imported function, not the source module
     calls = {"n": 0}
 
-    def fake_send_handoff_email(*args, **kwargs):
+    async def fake_enqueue_handoff_email(*args, **kwargs):
         calls["n"] += 1
         return True
 
-    monkeypatch.setattr(faq_mod, "send_handoff_email", fake_send_handoff_email, raising=False)
+    monkeypatch.setattr(faq_mod, "enqueue_handoff_email", fake_enqueue_handoff_email, raising=False)
 
     transport = ASGITransport(app=app)
     async with LifespanManager(app):
@@ -0,0 +1,103 @@
+from __future__ import annotations
+
+import uuid
+from types import SimpleNamespace
+
+import asyncpg
+import pytest
+from asgi_lifespan import LifespanManager
+from httpx import ASGITransport, AsyncClient
+from sqlalchemy import select
+
+from src.ai.sentiment import classify
+from src.api.app import app
+from src.api.routes import sentiment as sentiment_route
+from src.db.models.sentiment import Sentiment
+from src.db.session import AsyncSessionLocal, get_db
+
+TEXTS = ["Support was helpful and great value.", "Setup was quick… not.", "It's okay."]
+
+
+async def _post_batch(texts: list[str]):
+    transport = ASGITransport(app=app)
+    async with LifespanManager(app):
+        async with AsyncClient(transport=transport, base_url="http://testserver") as client:
+            return await client.post(
+                "/sentiment:batch", json={"items": [{"text": t} for t in texts]}
+            )
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("copy_threshold", [1_000_000, 1])  # multi-row INSERT, then COPY
+async def test_batch_persists_rows_in_request_order(monkeypatch, copy_threshold) -> None:
+    monkeypatch.setattr(sentiment_route.settings, "sentiment_copy_threshold", copy_threshold)
+    resp = await _post_batch(TEXTS)
+    assert resp.status_code == 201, resp.text
+
+    results = resp.json()["results"]
+    assert [r["text"] for r in results] == TEXTS
+    for r in results:
+        expected = classify(r["text"])
+        assert set(r.keys()) == {"id", "text", "score", "label"}
+        assert (r["score"], r["label"]) == (pytest.approx(expected.score), expected.label)
+
+    ids = [uuid.UUID(r["id"]) for r in results]
+    async with AsyncSessionLocal() as session:
+        rows = (await session.execute(select(Sentiment).where(Sentiment.id.in_(ids)))).scalars()
+        by_id = {row.id: row for row in rows}
+    assert [by_id[i].text for i in ids] == TEXTS
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("items", [[], ["fine", "   "]])
+async def test_batch_rejects_empty_input_with_422(items) -> None:
+    resp = await _post_batch(items)
+    assert resp.status_code == 422
+    assert "X-Request-ID" in resp.headers
+
+
+class _FailingCopySession:
+    """Claims to be asyncpg so the batch takes the COPY path, whose COPY then fails."""
+
+    def __init__(self) -> None:
+        self.rolled_back = False
+
+    def get_bind(self):
+        return SimpleNamespace(dialect=SimpleNamespace(driver="asyncpg"))
+
+    async def connection(self):
+        async def copy_records_to_table(*args, **kwargs):
+            raise asyncpg.UniqueViolationError("duplicate key value violates unique constraint")
+
+        driver = SimpleNamespace(copy_records_to_table=copy_records_to_table)
+
+        async def get_raw_connection():
+            return SimpleNamespace(driver_connection=driver)
+
+        return SimpleNamespace(get_raw_connection=get_raw_connection)
+
+    async def commit(self) -> None:
+        raise AssertionError("must not commit after a failed COPY")
+
+    async def rollback(self) -> None:
+        self.rolled_back = True
+
+
+@pytest.mark.asyncio
+async def test_batch_copy_failure_rolls_back_and_returns_500_envelope(monkeypatch) -> None:
+    monkeypatch.setattr(sentiment_route.settings, "sentiment_copy_threshold", 1)
+    session = _FailingCopySession()
+
+    async def _get_fake_db():
+        yield session
+
+    app.dependency_overrides[get_db] = _get_fake_db
+    try:
+        resp = await _post_batch(TEXTS)
+    finally:
+        app.dependency_overrides.pop(get_db, None)
+
+    assert resp.status_code == 500
+    assert resp.json()["error"]["type"] == "internal_server_error"
+    assert "X-Request-ID" in resp.headers
+    assert session.rolled_back
@@ -0,0 +1,113 @@
+from __future__ import annotations
+
+import asyncio
+from contextlib import asynccontextmanager
+
+import pytest
+from asgi_lifespan import LifespanManager
+from httpx import ASGITransport, AsyncClient
+
+from src.api.app import app
+from src.api.routes import sentiment as sentiment_route
+from src.db.session import get_session_factory
+
+
+class _FakeResult:
+    def __init__(self, rows):
+        self._rows = rows
+
+    def all(self):
+        return self._rows
+
+
+class _FakeSession:
+    """Stands in for the DB: counts queries and returns the current counter rows."""
+
+    def __init__(self) -> None:
+        self.rows = [("positive", 2), ("negative", 1), ("neutral", 0)]
+        self.queries = 0
+        self.open = 0  # sessions entered and not yet closed
+        self.delay_s = 0.01
+        self.factory = None  # the session factory the app is given (set by the fixture)
+
+    async def execute(self, stmt):
+        assert self.open, "queried through a closed session"
+        self.queries += 1
+        await asyncio.sleep(self.delay_s)  # long enough for concurrent polls to overlap
+        return _FakeResult(list(self.rows))
+
+
+class _Req:
+    headers: dict[str, str] = {}  # no If-None-Match
+
+
+class _Resp:
+    def __init__(self) -> None:
+        self.headers: dict[str, str] = {}
+
+
+@pytest.fixture
+def fake_db(monkeypatch):
+    session = _FakeSession()
+
+    @asynccontextmanager
+    async def _session_factory():
+        session.open += 1
+        try:
+            yield session
+        finally:
+            session.open -= 1
+
+    monkeypatch.setattr(sentiment_route, "_SUMMARY_CACHE", None)
+    monkeypatch.setattr(sentiment_route.settings, "sentiment_summary_cache_ttl_s", 60.0)
+    session.factory = _session_factory
+    app.dependency_overrides[get_session_factory] = lambda: _session_factory
+    yield session
+    app.dependency_overrides.pop(get_session_factory, None)
+
+
+@pytest.mark.asyncio
+async def test_summary_polls_share_one_query_and_revalidate_with_304(fake_db) -> None:
+    transport = ASGITransport(app=app)
+    async with LifespanManager(app):
+        async with AsyncClient(transport=transport, base_url="http://testserver") as client:
+            responses = await asyncio.gather(*(client.get("/sentiment/summary") for _ in range(20)))
+            assert all(r.status_code == 200 for r in responses)
+            assert responses[0].json() == {"positive": 2, "negative": 1, "neutral": 0, "total": 3}
+            assert fake_db.queries == 1
+
+            etag = responses[0].headers["ETag"]
+            assert responses[0].headers["Cache-Control"] == "no-cache"
+            r = await client.get("/sentiment/summary", headers={"If-None-Match": etag})
+            assert r.status_code == 304 and r.content == b""
+            assert r.headers["ETag"] == etag
+
+            # A write through this process invalidates; new counts mean a new ETag
+            fake_db.rows = [("positive", 3), ("negative", 1), ("neutral", 0)]
+            sentiment_route._invalidate_read_caches()
+            r = await client.get("/sentiment/summary", headers={"If-None-Match": etag})
+            assert r.status_code == 200 and r.json()["total"] == 4
+            assert r.headers["ETag"] != etag
+            assert fake_db.queries == 2
+
+            stats = (await client.get("/sentiment/metrics")).json()["summary_cache"]
+            assert stats["misses"] == 2 and stats["invalidations"] == 1
+
+
+@pytest.mark.asyncio
+async def test_summary_load_survives_the_caller_that_started_it(fake_db) -> None:
+    fake_db.delay_s = 0.05
+    first = asyncio.create_task(
+        sentiment_route.get_sentiment_summary(_Req(), _Resp(), fake_db.factory)
+    )
+    await asyncio.sleep(0.01)  # first caller's load is now in flight
+    second = asyncio.create_task(
+        sentiment_route.get_sentiment_summary(_Req(), _Resp(), fake_db.factory)
+    )
+    await asyncio.sleep(0)
+    first.cancel()  # e.g. the client disconnected
+
+    summary = await second
+    assert summary.total == 3
+    assert first.cancelled()
+    assert fake_db.queries == 1 and fake_db.open == 0
@@ -0,0 +1,58 @@
+from __future__ import annotations
+
+from datetime import UTC, datetime
+
+import pytest
+from asgi_lifespan import LifespanManager
+from httpx import ASGITransport, AsyncClient
+
+from src.api.app import app
+from src.api.routes import sentiment as sentiment_route
+
+
+async def _get(params: dict):
+    transport = ASGITransport(app=app)
+    async with LifespanManager(app):
+        async with AsyncClient(transport=transport, base_url="http://testserver") as client:
+            return await client.get("/sentiment/timeseries", params=params)
+
+
+@pytest.mark.asyncio
+async def test_timeseries_zero_fills_and_averages(monkeypatch) -> None:
+    calls = []
+
+    async def fake_query(db, start, end, bucket):
+        calls.append((start, end, bucket))
+        return [
+            (datetime(2026, 1, 1, 1, tzinfo=UTC), "positive", 3, 2.4),
+            (datetime(2026, 1, 1, 1, tzinfo=UTC), "negative", 1, -1.2),
+            (datetime(2026, 1, 1, 3, tzinfo=UTC), "neutral", 2, 0.0),
+        ]
+
+    monkeypatch.setattr(sentiment_route, "query_timeseries", fake_query)
+    r = await _get({"from": "2026-01-01T00:30:00Z", "to": "2026-01-01T04:00:00Z"})
+    assert r.status_code == 200, r.text
+
+    body = r.json()
+    # 'from' widened down to the hour; 'to' already on a boundary
+    assert calls == [
+        (datetime(2026, 1, 1, tzinfo=UTC), datetime(2026, 1, 1, 4, tzinfo=UTC), "hour")
+    ]
+    assert [p["total"] for p in body["points"]] == [0, 4, 0, 2]
+    assert body["points"][1]["positive"] == 3 and body["points"][1]["negative"] == 1
+    assert body["points"][1]["avg_score"] == pytest.approx(0.3)
+    assert body["points"][0]["avg_score"] is None
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    "params",
+    [
+        {"from": "2026-01-02T00:00:00Z", "to": "2026-01-01T00:00:00Z"},  # to before from
+        {"from": "2000-01-01T00:00:00Z", "to": "2026-01-01T00:00:00Z"},  # too many hours
+        {"from": "2026-01-01T00:00:00Z", "bucket": "week"},
+    ],
+)
+async def test_timeseries_rejects_bad_ranges(params) -> None:
+    r = await _get(params)
+    assert r.status_code == 422
@@ -0,0 +1,71 @@
+from __future__ import annotations
+
+import asyncio
+
+import pytest
+from asgi_lifespan import LifespanManager
+from httpx import ASGITransport, AsyncClient
+
+from src.api.app import app
+from src.api.routes import sentiment as sentiment_route
+
+
+@pytest.fixture
+def written(monkeypatch) -> list[dict]:
+    """Replace the bulk DB write behind the buffer with an in-memory sink."""
+    rows: list[dict] = []
+
+    async def _sink(batch: list[dict]) -> None:
+        rows.extend(batch)
+
+    monkeypatch.setattr(sentiment_route, "_write_buffered_rows", _sink)
+    monkeypatch.setattr(sentiment_route.settings, "sentiment_buffer_flush_ms", 10_000.0)
+    return rows
+
+
+@pytest.mark.asyncio
+async def test_write_behind_returns_202_and_drains_on_shutdown(monkeypatch, written) -> None:
+    monkeypatch.setattr(sentiment_route.settings, "sentiment_persist_mode", "write_behind")
+    transport = ASGITransport(app=app)
+    async with LifespanManager(app):
+        async with AsyncClient(transport=transport, base_url="http://testserver") as client:
+            r = await client.post("/sentiment", json={"text": "Support was helpful."})
+            assert r.status_code == 202, r.text
+            assert written == []  # still buffered (long flush interval)
+
+            m = (await client.get("/sentiment/metrics")).json()
+            assert m["persist_mode"] == "write_behind"
+            assert m["write_buffer"]["depth"] == 1
+
+    assert [str(row["id"]) for row in written] == [r.json()["id"]]
+    assert written[0]["label"] == r.json()["label"]
+
+
+@pytest.mark.asyncio
+async def test_group_commit_returns_201_after_the_batch_is_written(monkeypatch, written) -> None:
+    monkeypatch.setattr(sentiment_route.settings, "sentiment_persist_mode", "group_commit")
+    monkeypatch.setattr(sentiment_route.settings, "sentiment_buffer_flush_rows", 3)
+    transport = ASGITransport(app=app)
+    async with LifespanManager(app):
+        async with AsyncClient(transport=transport, base_url="http://testserver") as client:
+            texts = ["great value", "awful", "it's okay"]
+            responses = await asyncio.gather(
+                *(client.post("/sentiment", json={"text": t}) for t in texts)
+            )
+            assert [r.status_code for r in responses] == [201, 201, 201]
+            assert sorted(row["text"] for row in written) == sorted(texts)
+            snap = (await client.get("/sentiment/metrics")).json()["write_buffer"]
+            assert snap["written"] == 3 and snap["flush_rows"]["count"] == 1
+
+
+@pytest.mark.asyncio
+async def test_full_buffer_returns_429(monkeypatch, written) -> None:
+    monkeypatch.setattr(sentiment_route.settings, "sentiment_persist_mode", "write_behind")
+    monkeypatch.setattr(sentiment_route.settings, "sentiment_buffer_max_rows", 1)
+    transport = ASGITransport(app=app)
+    async with LifespanManager(app):
+        async with AsyncClient(transport=transport, base_url="http://testserver") as client:
+            assert (await client.post("/sentiment", json={"text": "fine"})).status_code == 202
+            r = await client.post("/sentiment", json={"text": "fine again"})
+    assert r.status_code == 429
+    assert r.headers.get("Retry-After") == "1"
@@ -0,0 +1,47 @@
+import csv
+
+import numpy as np
+import pytest
+
+from src.ai.sentiment import LABELS, classify, classify_many, extract_features, prepare
+from src.ai.sentiment.rule_based import compile_lexicons
+
+DEVSET = "data/sentiment/devset.csv"
+
+
+def _devset_texts() -> list[str]:
+    return [r["text"] for r in csv.DictReader(open(DEVSET))]
+
+
+@pytest.mark.parametrize("chunk_size", [1, 5, 10_000])
+def test_classify_many_matches_classify(chunk_size):
+    texts = _devset_texts() + ["", "not helpful", "setup was quick ... not", "okay, but great"]
+    scores, labels = classify_many(iter(texts), chunk_size=chunk_size)
+
+    assert scores.dtype == np.float32 and labels.dtype == np.int8
+    assert scores.shape == labels.shape == (len(texts),)
+    for text, score, code in zip(texts, scores, labels, strict=True):
+        expected = classify(text)
+        assert LABELS[int(code)] == expected.label
+        assert float(score) == pytest.approx(expected.score, abs=1e-6)
+
+
+def test_classify_many_passes_weights_through():
+    texts = ["fantastic and helpful", "awful, but fine"]
+    scores, labels = classify_many(texts, pos_weight=0.1, neg_weight=2.0, neutral_band=0.5)
+    for text, score, code in zip(texts, scores, labels, strict=True):
+        expected = classify(text, pos_weight=0.1, neg_weight=2.0, neutral_band=0.5)
+        assert LABELS[int(code)] == expected.label
+        assert float(score) == pytest.approx(expected.score, abs=1e-6)
+
+
+def test_classify_many_empty_input():
+    scores, labels = classify_many([])
+    assert scores.shape == (0,) and labels.shape == (0,)
+
+
+def test_extract_features_is_public_and_takes_custom_lexicons():
+    assert extract_features("Setup was quick… not.") == (1, 0, 1, 0)
+    assert extract_features(prepare("Setup was quick… not.")) == (1, 0, 1, 0)
+    lex = compile_lexicons(pos={"stellar"}, neg={"meh"}, hints=set())
+    assert extract_features("not stellar, meh", lex) == (1, 1, 1, 0)
@@ -0,0 +1,49 @@
+import random
+
+import pytest
+
+from src.ai.sentiment.matcher import PhraseMatcher
+from src.ai.sentiment.rule_based import compile_lexicons
+
+
+@pytest.mark.parametrize("scan_below", [0, 1000])  # compiled regex / plain scan
+def test_reports_overlapping_and_nested_phrases(scan_below):
+    m = PhraseMatcher(["great", "great value", "eat", "had to retry", "retry"], scan_below)
+    hits = set(m.matches("great value, had to retry"))
+    assert hits == {
+        (0, "great"),
+        (0, "great value"),
+        (2, "eat"),
+        (13, "had to retry"),
+        (20, "retry"),
+    }
+    assert m.found("nothing here") == set()
+    assert m.contains_any("a great day") and not m.contains_any("nothing here")
+
+
+@pytest.mark.parametrize("scan_below", [0, 1000])
+def test_matches_substring_semantics_of_in(scan_below):
+    rng = random.Random(7)
+    alphabet = "ab c"
+    phrases = {"".join(rng.choice(alphabet) for _ in range(rng.randint(1, 5))) for _ in range(60)}
+    m = PhraseMatcher(phrases, scan_below)
+    for _ in range(300):
+        text = "".join(rng.choice(alphabet) for _ in range(rng.randint(0, 30)))
+        assert m.found(text) == {p for p in phrases if p in text}
+        expected = {(i, p) for p in phrases for i in range(len(text)) if text.startswith(p, i)}
+        assert sorted(m.matches(text)) == sorted(expected)
+
+
+def test_large_lexicon_compiles_and_matches():
+    phrases = [f"phrase number {n}" for n in range(20_000)]
+    m = PhraseMatcher(phrases)
+    assert len(m) == 20_000
+    assert m.found("we saw phrase number 19999 and phrase number 7") >= {
+        "phrase number 19999",
+        "phrase number 7",
+    }
+
+
+def test_compile_lexicons_combines_sets():
+    lex = compile_lexicons(pos={"good"}, neg={"bad"}, hints={"okay"})
+    assert lex.matcher.found("good but bad, okay") == {"good", "bad", "okay"}
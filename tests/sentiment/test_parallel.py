@@ -0,0 +1,49 @@
+import json
+
+import pytest
+
+from src.ai.sentiment import classify
+from src.ai.sentiment.parallel import CorpusStats, read_records, score_corpus
+
+TEXTS = [
+    "fantastic and helpful",
+    "awful, but fine",
+    "not helpful",
+    "setup was quick ... not",
+    "okay",
+    "",
+] * 7
+
+
+def _records():
+    return [(f"r{i}", t) for i, t in enumerate(TEXTS)]
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_score_corpus_ordered_matches_classify(workers):
+    stats = CorpusStats()
+    out = list(score_corpus(iter(_records()), workers=workers, chunk_size=4, stats=stats))
+
+    assert [r.id for r in out] == [rid for rid, _ in _records()]
+    for r, text in zip(out, TEXTS, strict=True):
+        expected = classify(text)
+        assert r.label == expected.label
+        assert r.score == pytest.approx(expected.score, abs=1e-6)
+    assert stats.docs == len(TEXTS)
+    assert stats.chunks == -(-len(TEXTS) // 4)
+    assert sum(w.docs for w in stats.workers.values()) == len(TEXTS)
+
+
+def test_score_corpus_unordered_returns_every_record_once():
+    out = list(score_corpus(_records(), workers=2, chunk_size=3, ordered=False, max_inflight=2))
+    assert sorted(r.id for r in out) == sorted(rid for rid, _ in _records())
+
+
+def test_read_records_csv_and_jsonl(tmp_path):
+    csv_path = tmp_path / "in.csv"
+    csv_path.write_text("id,body\na,great value\n,awful\n")
+    jsonl_path = tmp_path / "in.jsonl"
+    jsonl_path.write_text(json.dumps({"id": "x", "text": "fine"}) + "\n\n" + "{}\n")
+
+    assert list(read_records(csv_path, text_field="body")) == [("a", "great value"), ("2", "awful")]
+    assert list(read_records(jsonl_path)) == [("x", "fine"), ("2", "")]
@@ -0,0 +1,89 @@
+import uuid
+
+import pytest
+
+from src.api import booking_import
+from src.api.booking_import import aiter_lines, import_bookings, parse_records
+from src.db.models.booking import Booking
+
+
+async def _stream(*chunks: bytes):
+    for c in chunks:
+        yield c
+
+
+async def _collect(ait) -> list:
+    return [x async for x in ait]
+
+
+def _row(hour: int, **extra) -> dict:
+    return {
+        "customer_name": "Ann",
+        "customer_email": "ann@example.com",
+        "starts_at": f"2030-01-01T{hour:02d}:00:00Z",
+        "ends_at": f"2030-01-01T{hour:02d}:30:00Z",
+        **extra,
+    }
+
+
+@pytest.mark.asyncio
+async def test_lines_split_across_chunks_and_long_lines_are_dropped():
+    lines = await _collect(
+        aiter_lines(_stream(b"ab", b"c\nde", b"f\n" + b"x" * 20, b"y" * 20, b"\nlast"), 16)
+    )
+    assert lines[:2] == [b"abc", b"def"]
+    assert isinstance(lines[2], booking_import._TooLong)
+    assert lines[3] == b"last"
+
+
+@pytest.mark.asyncio
+async def test_parse_records_reports_bad_lines_by_number():
+    ndjson = b'{"a": 1}\n\nnot json\n[1]\n'
+    got = await _collect(parse_records(aiter_lines(_stream(ndjson)), "ndjson"))
+    assert got[0] == (1, {"a": 1})
+    assert got[1][0] == 3 and got[1][1].startswith("invalid JSON")
+    assert got[2] == (4, "expected a JSON object")
+
+    csv_body = b'\xef\xbb\xbfname,notes\r\n"Smith, J",\r\nonly-one-field,x,y\r\n'
+    got = await _collect(parse_records(aiter_lines(_stream(csv_body)), "csv"))
+    assert got == [(2, {"name": "Smith, J"}), (3, "expected 2 fields, got 3")]
+
+
+@pytest.mark.asyncio
+async def test_import_chunks_rows_and_reports_errors(monkeypatch):
+    loaded: list[list[dict]] = []
+
+    async def fake_load_chunk(db, rows):
+        loaded.append(rows)
+        return [r["line"] for r in rows if r["customer_name"] == "Clash"]  # "conflicts"
+
+    monkeypatch.setattr(booking_import, "_load_chunk", fake_load_chunk)
+    dup = str(uuid.uuid4())
+    records = [
+        (1, _row(9)),
+        (2, "invalid JSON: boom"),
+        (3, _row(10, ends_at="2030-01-01T09:00:00Z")),  # ends before it starts
+        (4, _row(11, id=dup, status="cancelled")),
+        (5, _row(12, id=dup)),  # same id twice in one chunk
+        (6, _row(13, customer_name="Clash")),
+        (7, _row(14)),
+    ]
+
+    async def gen():
+        for r in records:
+            yield r
+
+    result = await import_bookings(None, gen(), chunk_rows=3, max_errors=3)
+
+    assert [[r["line"] for r in chunk] for chunk in loaded] == [[1, 4, 6], [7]]
+    assert loaded[0][1]["id"] == uuid.UUID(dup) and loaded[0][1]["status"] == "cancelled"
+    assert loaded[0][0]["starts_at"].tzinfo is not None
+    assert (result.received, result.inserted, result.rejected) == (7, 3, 4)
+    assert [e.line for e in result.errors] == [2, 3, 5]  # line 6 counted, not listed
+    assert "ends_at must be after starts_at" in result.errors[1].error
+    assert result.errors_truncated
+
+
+def test_staging_columns_match_the_merge():
+    # COPY writes these columns; every one but `line` must be a bookings column
+    assert set(booking_import._COLUMNS) - {"line"} <= set(Booking.__table__.columns.keys())
@@ -2,8 +2,11 @@ from datetime import UTC, datetime, timedelta
 
 import pytest
 from pydantic import ValidationError
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import Session
 
 from src.api.schemas.booking import BookingCreate
+from src.db.models.booking import Booking
 
 
 def test_booking_create_valid():
@@ -29,3 +32,31 @@ def test_booking_create_invalid_time_order():
             starts_at=now,
             ends_at=earlier,
         )
+
+
+def test_booking_writes_return_server_timestamps_in_one_statement():
+    # eager_defaults: INSERT/UPDATE ... RETURNING, so handlers need no refresh() SELECT
+    engine = create_engine("sqlite://")
+    Booking.__table__.create(engine)
+    statements: list[str] = []
+    event.listen(engine, "before_cursor_execute", lambda *a: statements.append(a[2]))
+
+    now = datetime.now(UTC)
+    with Session(engine) as session:
+        obj = Booking(
+            customer_name="Alice",
+            customer_email="alice@example.com",
+            starts_at=now,
+            ends_at=now + timedelta(hours=1),
+        )
+        session.add(obj)
+        session.flush()
+        assert obj.created_at is not None and obj.updated_at is not None
+
+        obj.notes = "Updated"
+        session.flush()
+        assert "updated_at" in obj.__dict__  # loaded by the UPDATE, not expired
+
+    assert len(statements) == 2
+    assert statements[0].startswith("INSERT") and "RETURNING" in statements[0]
+    assert statements[1].startswith("UPDATE") and "RETURNING updated_at" in statements[1]
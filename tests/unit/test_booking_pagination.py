@@ -0,0 +1,83 @@
+import uuid
+from datetime import UTC, datetime, timedelta
+from types import SimpleNamespace
+
+import pytest
+from fastapi import HTTPException, Response
+from sqlalchemy.dialects import postgresql
+from starlette.requests import Request
+
+from src.api.routes.bookings import decode_cursor, encode_cursor, list_bookings, page_query
+
+
+def test_cursor_round_trips():
+    key = (datetime(2026, 5, 1, 12, 30, 15, 123456, tzinfo=UTC), uuid.uuid4())
+    token = encode_cursor(*key)
+    assert "=" not in token and "|" not in token
+    assert decode_cursor(token) == key
+
+
+@pytest.mark.parametrize(
+    "token", ["", "garbage!", encode_cursor(datetime(2026, 1, 1), uuid.uuid4())]
+)
+def test_bad_cursor_is_422(token):
+    # The last one carries a naive timestamp, which would compare wrongly against timestamptz
+    with pytest.raises(HTTPException) as exc:
+        decode_cursor(token)
+    assert exc.value.status_code == 422
+
+
+def test_page_query_seeks_on_created_at_and_id():
+    key = (datetime(2026, 5, 1, tzinfo=UTC), uuid.uuid4())
+    sql = str(page_query(20, key).compile(dialect=postgresql.dialect()))
+    assert "(bookings.created_at, bookings.id) <" in sql
+    assert "ORDER BY bookings.created_at DESC, bookings.id DESC" in sql
+    assert "OFFSET" not in sql
+
+
+class _Rows:
+    def __init__(self, rows):
+        self._rows = rows
+
+    def scalars(self):
+        return iter(self._rows)
+
+
+class _FakeSession:
+    def __init__(self, rows):
+        self.rows = rows
+
+    async def execute(self, stmt):
+        return _Rows(self.rows)
+
+
+@pytest.mark.asyncio
+async def test_list_body_stays_a_list_and_the_cursor_rides_in_headers():
+    t0 = datetime(2026, 5, 1, tzinfo=UTC)
+    rows = [
+        SimpleNamespace(id=uuid.uuid4(), created_at=t0 - timedelta(minutes=i)) for i in range(3)
+    ]
+    request = Request(
+        {
+            "type": "http",
+            "scheme": "http",
+            "server": ("testserver", 80),
+            "path": "/bookings",
+            "query_string": b"limit=2&offset=4&email=a%40b.c",
+            "headers": [],
+        }
+    )
+    response = Response()
+
+    body = await list_bookings(request, response, _FakeSession(rows), limit=2, offset=4)
+
+    assert body == rows[:2]  # the extra row only signals that a next page exists
+    cursor = response.headers["X-Next-Cursor"]
+    assert decode_cursor(cursor) == (rows[1].created_at, rows[1].id)
+    link = response.headers["Link"]
+    assert link.endswith('>; rel="next"') and f"cursor={cursor}" in link
+    assert "offset" not in link and "email=a%40b.c" in link
+
+    response = Response()
+    assert await list_bookings(request, response, _FakeSession(rows[:1]), limit=2) == rows[:1]
+    assert "X-Next-Cursor" not in response.headers and "Link" not in response.headers
@@ -0,0 +1,51 @@
+import asyncio
+
+import pytest
+
+from src.ai.faq.batcher import MicroBatcher
+
+
+@pytest.mark.asyncio
+async def test_concurrent_submits_are_coalesced_into_one_call():
+    calls: list[list[str]] = []
+
+    async def process(items: list[str]) -> list[str]:
+        calls.append(items)
+        return [s.upper() for s in items]
+
+    batcher = MicroBatcher(process, max_batch=8, max_wait_ms=20)
+    results = await asyncio.gather(*(batcher.submit(q) for q in ["a", "b", "c"]))
+
+    assert results == ["A", "B", "C"]
+    assert calls == [["a", "b", "c"]]
+    stats = batcher.stats()
+    assert stats["batch_size"]["count"] == 1
+    assert stats["batch_size"]["sum"] == 3
+    assert stats["queue_wait_ms"]["count"] == 3
+
+
+@pytest.mark.asyncio
+async def test_full_batch_flushes_without_waiting():
+    sizes: list[int] = []
+
+    async def process(items: list[int]) -> list[int]:
+        sizes.append(len(items))
+        return items
+
+    batcher = MicroBatcher(process, max_batch=2, max_wait_ms=10_000)
+    results = await asyncio.wait_for(
+        asyncio.gather(*(batcher.submit(i) for i in range(4))), timeout=1.0
+    )
+    assert results == [0, 1, 2, 3]
+    assert sizes == [2, 2]
+
+
+@pytest.mark.asyncio
+async def test_process_error_fails_every_caller_in_batch():
+    async def process(items):
+        raise ValueError("boom")
+
+    batcher = MicroBatcher(process, max_batch=4, max_wait_ms=1)
+    outcomes = await asyncio.gather(batcher.submit(1), batcher.submit(2), return_exceptions=True)
+    assert all(isinstance(o, ValueError) for o in outcomes)
+    await batcher.aclose()
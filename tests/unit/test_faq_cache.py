@@ -0,0 +1,46 @@
+import numpy as np
+
+from src.ai.faq.cache import LRUCache, normalize_question
+
+
+def test_normalize_question_folds_case_and_whitespace():
+    assert normalize_question("  How do I\tCANCEL\n a booking? ") == "how do i cancel a booking?"
+
+
+def test_lru_evicts_least_recently_used():
+    cache = LRUCache(max_entries=2)
+    cache.put("a", 1)
+    cache.put("b", 2)
+    assert cache.get("a") == 1  # "b" is now the oldest
+    cache.put("c", 3)
+
+    assert cache.get("b") is None
+    assert cache.get("a") == 1 and cache.get("c") == 3
+    stats = cache.stats()
+    assert stats["evictions"] == 1
+    assert stats["hits"] == 3 and stats["misses"] == 1
+
+
+def test_lru_respects_byte_cap():
+    vec = np.zeros(100, dtype="float32")  # 400 bytes
+    cache = LRUCache(max_entries=100, max_bytes=1000)
+    for key in ("q1", "q2", "q3"):
+        cache.put(key, vec.copy())
+
+    assert len(cache) == 2
+    assert cache.nbytes <= 1000
+    assert cache.get("q1") is None
+
+    cache.put("huge", np.zeros(1000, dtype="float32"))  # larger than the cap: not stored
+    assert cache.get("huge") is None and len(cache) == 2
+
+
+def test_lru_entries_expire_after_ttl():
+    now = [0.0]
+    cache = LRUCache(ttl_s=10.0, clock=lambda: now[0])
+    cache.put("a", 1)
+    now[0] = 9.9
+    assert cache.get("a") == 1
+    now[0] = 10.0
+    assert cache.get("a") is None
+    assert cache.stats()["expirations"] == 1 and len(cache) == 0
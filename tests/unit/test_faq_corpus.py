@@ -0,0 +1,56 @@
+import numpy as np
+import pytest
+
+from src.ai.faq.corpus import CorpusSnapshot, FileWatcher, corpus_version, diff_corpus
+from src.ai.faq.data_loader import FAQItem
+
+OLD = [
+    FAQItem(id="a", question="A?", answer="1"),
+    FAQItem(id="b", question="B?", answer="2"),
+    FAQItem(id="c", question="C?", answer="3"),
+]
+
+
+def test_diff_corpus_by_id_and_content():
+    new = [
+        FAQItem(id="a", question="A?", answer="1"),  # unchanged
+        FAQItem(id="b", question="B?", answer="2, updated"),  # answer-only edit
+        FAQItem(id="d", question="D?", answer="4"),  # new
+    ]
+    diff = diff_corpus(OLD, new)
+    assert diff.added == ["d"] and diff.removed == ["c"] and diff.updated == ["b"]
+    assert diff.new_questions == ["D?"]  # answer edits don't need re-embedding
+    assert diff.changed
+    assert not diff_corpus(OLD, list(OLD)).changed
+
+
+def test_corpus_version_tracks_content_and_order():
+    assert corpus_version(OLD) == corpus_version([i.model_copy() for i in OLD])
+    assert corpus_version(OLD) != corpus_version(list(reversed(OLD)))
+    edited = [OLD[0].model_copy(update={"tags": ["x"]}), *OLD[1:]]
+    assert corpus_version(OLD) != corpus_version(edited)
+
+
+def test_snapshot_bundles_index_and_tags():
+    faqs = [FAQItem(id="a", question="A?", answer="1", tags=["billing"])]
+    snap = CorpusSnapshot.build(faqs, np.array([[1.0, 0.0]], dtype="float32"))
+    assert snap.index.size == 1
+    assert snap.tag_index["billing"].tolist() == [0]
+    assert snap.info()["version"] == corpus_version(faqs)
+
+
+@pytest.mark.asyncio
+async def test_file_watcher_fires_only_on_change(tmp_path):
+    path = tmp_path / "faqs.yaml"
+    path.write_text("[]")
+    calls = []
+
+    async def on_change():
+        calls.append(path.read_text())
+
+    watcher = FileWatcher(path, on_change)
+    assert await watcher.check() is False
+    path.write_text("- id: x\n")
+    assert await watcher.check() is True
+    assert await watcher.check() is False
+    assert calls == ["- id: x\n"]
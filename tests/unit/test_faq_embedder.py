@@ -0,0 +1,132 @@
+import numpy as np
+import pytest
+
+import src.ai.faq.embedder as emb_mod
+
+
+class FakeMiniLM:
+    instances = 0
+
+    def __init__(self, model_name: str = "fake-model"):
+        FakeMiniLM.instances += 1
+        self.model_name = model_name
+        self.calls: list[list[str]] = []
+
+    def encode(self, texts):
+        self.calls.append(list(texts))
+        return np.ones((len(texts), 2), dtype="float32")
+
+
+@pytest.fixture(autouse=True)
+def _fake_model(monkeypatch):
+    FakeMiniLM.instances = 0
+    monkeypatch.setattr(emb_mod, "MiniLMEmbedder", FakeMiniLM)
+    emb_mod.reset_embedders()
+    yield
+    emb_mod.reset_embedders()
+
+
+def test_get_embedder_loads_model_once_per_process():
+    a = emb_mod.get_embedder()
+    b = emb_mod.get_embedder()
+    assert a is b
+    assert FakeMiniLM.instances == 1
+    stats = emb_mod.embedder_stats()[a.model_name]
+    assert stats["load_seconds"] is not None and stats["load_seconds"] >= 0.0
+    assert stats["warmed_up"] is False
+
+
+def test_warm_up_runs_dummy_encode_and_records_timing():
+    emb = emb_mod.get_embedder()
+    elapsed = emb_mod.warm_up_embedder(emb)
+    assert elapsed >= 0.0
+    assert len(emb.calls) == 1
+    stats = emb_mod.embedder_stats()[emb.model_name]
+    assert stats["warmed_up"] is True
+    assert stats["warmup_seconds"] == pytest.approx(elapsed)
+
+
+def test_load_or_build_embeddings_uses_shared_embedder(tmp_path):
+    vecs, used_cache = emb_mod.load_or_build_embeddings(
+        ["q1", "q2"], manifest=tmp_path / "emb.json"
+    )
+    assert used_cache is False
+    assert vecs.shape == (2, 2)
+    emb_mod.get_embedder()
+    assert FakeMiniLM.instances == 1
+
+
+def _counting_encoder(calls):
+    def encode(texts):
+        calls.append(list(texts))
+        # Distinct, deterministic vector per text so row reuse is checkable
+        return np.array([[len(t), sum(map(ord, t))] for t in texts], dtype="float32")
+
+    return encode
+
+
+def test_cache_reuses_unchanged_rows_and_embeds_only_new(tmp_path):
+    manifest = tmp_path / "emb.json"
+    calls: list[list[str]] = []
+    enc = _counting_encoder(calls)
+
+    first, used = emb_mod.load_or_build_embeddings(["a?", "b?"], manifest=manifest, encode=enc)
+    assert used is False and calls == [["a?", "b?"]]
+
+    # Same corpus -> served straight from the memory-mapped cache
+    again, used = emb_mod.load_or_build_embeddings(["a?", "b?"], manifest=manifest, encode=enc)
+    assert used is True and len(calls) == 1
+    assert isinstance(again, np.memmap)
+    np.testing.assert_array_equal(first, again)
+
+    # One edited + one new question -> only those are encoded
+    calls.clear()
+    mat, used = emb_mod.load_or_build_embeddings(
+        ["b?", "a changed?", "c?"], manifest=manifest, encode=enc
+    )
+    assert used is False
+    assert calls == [["a changed?", "c?"]]
+    np.testing.assert_array_equal(mat[0], first[1])
+    assert len(list(tmp_path.glob("emb.*.npy"))) == 1  # old generation cleaned up
+
+
+def test_cache_is_invalidated_by_model_change(tmp_path, monkeypatch):
+    manifest = tmp_path / "emb.json"
+    calls: list[list[str]] = []
+    enc = _counting_encoder(calls)
+    emb_mod.load_or_build_embeddings(["a?"], manifest=manifest, encode=enc)
+
+    monkeypatch.setattr(emb_mod, "_MODEL_REVISION", "abc123")
+    _, used = emb_mod.load_or_build_embeddings(["a?"], manifest=manifest, encode=enc)
+    assert used is False
+    assert len(calls) == 2
+
+
+def test_cache_is_keyed_by_the_model_actually_used(tmp_path):
+    manifest = tmp_path / "emb.json"
+    calls: list[list[str]] = []
+    enc = _counting_encoder(calls)
+    emb_mod.load_or_build_embeddings(["a?"], manifest=manifest, encode=enc, model_name="m-a")
+
+    # Another model sharing the manifest must not be served m-a's vectors
+    _, used = emb_mod.load_or_build_embeddings(
+        ["a?"], manifest=manifest, encode=enc, model_name="m-b"
+    )
+    assert used is False and len(calls) == 2
+
+    # Default model name goes to that model's shared embedder
+    vecs, used = emb_mod.load_or_build_embeddings(["a?"], manifest=manifest, model_name="m-c")
+    assert used is False
+    assert emb_mod.get_embedder("m-c").calls == [["a?"]]
+
+
+def test_cache_rows_of_another_dim_are_not_reused(tmp_path):
+    manifest = tmp_path / "emb.json"
+    emb_mod.load_or_build_embeddings(["a?"], manifest=manifest, encode=_counting_encoder([]))
+
+    def wider(texts):
+        return np.ones((len(texts), 3), dtype="float32")
+
+    mat, used = emb_mod.load_or_build_embeddings(["a?", "b?"], manifest=manifest, encode=wider)
+    assert used is False
+    np.testing.assert_array_equal(mat, np.ones((2, 3), dtype="float32"))
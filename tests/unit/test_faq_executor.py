@@ -0,0 +1,57 @@
+import asyncio
+import threading
+
+import pytest
+
+from src.ai.faq.executor import InferenceExecutor, InferenceSaturated, InferenceTimeout
+
+
+@pytest.mark.asyncio
+async def test_run_returns_result_off_loop():
+    ex = InferenceExecutor(max_workers=1, max_queue=0, timeout_s=2.0)
+    try:
+        caller = threading.get_ident()
+        result, worker = await ex.run(lambda x: (x * 2, threading.get_ident()), 21)
+        assert result == 42
+        assert worker != caller
+        assert ex.stats()["submitted"] == 1
+    finally:
+        ex.shutdown()
+
+
+@pytest.mark.asyncio
+async def test_run_rejects_when_saturated():
+    ex = InferenceExecutor(max_workers=1, max_queue=0, timeout_s=2.0)
+    gate = threading.Event()
+    try:
+        busy = asyncio.ensure_future(ex.run(gate.wait))
+        await asyncio.sleep(0.05)
+        with pytest.raises(InferenceSaturated):
+            await ex.run(lambda: None)
+        gate.set()
+        await busy
+        assert ex.stats()["rejected"] == 1
+    finally:
+        gate.set()
+        ex.shutdown()
+
+
+@pytest.mark.asyncio
+async def test_run_times_out_and_frees_slot_when_work_finishes():
+    ex = InferenceExecutor(max_workers=1, max_queue=0, timeout_s=0.05)
+    gate = threading.Event()
+    try:
+        with pytest.raises(InferenceTimeout):
+            await ex.run(gate.wait)
+        gate.set()
+        # Once the slow call completes the slot is released again
+        ex.timeout_s = 2.0
+        for _ in range(50):
+            if ex.stats()["in_flight"] == 0:
+                break
+            await asyncio.sleep(0.01)
+        assert await ex.run(lambda: "ok") == "ok"
+        assert ex.stats()["timed_out"] == 1
+    finally:
+        gate.set()
+        ex.shutdown()
@@ -0,0 +1,71 @@
+import numpy as np
+import pytest
+
+from src.ai.faq.index import ExactIndex, IVFIndex, make_index
+from src.ai.faq.retriever import cosine_topk
+
+
+def _corpus(n=2000, dim=16, seed=0):
+    rng = np.random.default_rng(seed)
+    centres = rng.normal(size=(40, dim))
+    docs = centres[rng.integers(0, 40, size=n)] + 0.3 * rng.normal(size=(n, dim))
+    docs /= np.linalg.norm(docs, axis=1, keepdims=True)
+    return docs.astype("float32")
+
+
+def test_exact_index_matches_cosine_topk():
+    docs = _corpus(200)
+    q = docs[:3]
+    out = ExactIndex(docs).search(q, [3, 3, 3])
+    for i in range(3):
+        expected = cosine_topk(q[i], docs, 3)
+        assert [j for j, _ in out[i]] == [j for j, _ in expected]
+        assert [c for _, c in out[i]] == pytest.approx([c for _, c in expected], abs=1e-6)
+
+
+def test_ivf_full_probe_equals_exact():
+    docs = _corpus()
+    ivf = IVFIndex.build(docs, n_lists=16)
+    q = docs[:10]
+    exact = ExactIndex(docs).search(q, [5] * 10)
+    approx = ivf.search(q, [5] * 10, n_probe=ivf.n_lists)
+    assert [[i for i, _ in h] for h in approx] == [[i for i, _ in h] for h in exact]
+
+
+def test_ivf_recall_is_high_with_modest_probe():
+    docs = _corpus()
+    ivf = IVFIndex.build(docs, n_lists=32, n_probe=8)
+    q = docs[::50]
+    exact = ExactIndex(docs).search(q, [5] * len(q))
+    approx = ivf.search(q, [5] * len(q))
+    recall = np.mean(
+        [len({i for i, _ in a} & {i for i, _ in e}) / 5 for a, e in zip(approx, exact, strict=True)]
+    )
+    assert recall >= 0.9
+
+
+def test_ivf_respects_mask():
+    docs = _corpus(500)
+    ivf = IVFIndex.build(docs, n_lists=8, n_probe=2)
+    allowed = np.arange(0, 500, 2)
+    hits = ivf.search(docs[1:2], [5], masks=[allowed])[0]
+    assert hits and all(i % 2 == 0 for i, _ in hits)
+
+
+def test_ivf_mask_outside_probed_lists_falls_back_to_exact():
+    docs = _corpus(2000)
+    ivf = IVFIndex.build(docs, n_lists=8, n_probe=1)
+    sizes = np.diff(ivf.offsets)
+    j = int(np.argmax(sizes))
+    allowed = np.sort(ivf.rows[ivf.offsets[j] : ivf.offsets[j + 1]])  # a tag in one cluster
+    assert allowed.size > ivf.size / ivf.n_lists  # big enough to take the probing path
+    q = -ivf.centroids[j : j + 1]  # list j is the last one this query would probe
+
+    hits = ivf.search(q, [5], masks=[allowed])[0]
+    assert hits == cosine_topk(q[0], docs, 5, mask=allowed)
+
+
+def test_make_index_backends():
+    docs = _corpus(100)
+    assert isinstance(make_index(docs), ExactIndex)
+    assert isinstance(make_index(docs, backend="ivf", n_lists=4), IVFIndex)
@@ -1,7 +1,7 @@
 import textwrap
 from pathlib import Path
 
-from src.ai.faq.data_loader import load_faqs
+from src.ai.faq.data_loader import FAQItem, build_tag_index, load_faqs, rows_for_tags
 
 
 def test_load_faqs_parses_yaml(tmp_path: Path):
@@ -19,3 +19,16 @@ def test_load_faqs_parses_yaml(tmp_path: Path):
     assert len(faqs) == 1
     assert faqs[0].id == "x"
     assert faqs[0].answer == "A."
+
+
+def test_build_tag_index_and_rows_for_tags():
+    faqs = [
+        FAQItem(id="a", question="Q1", answer="A1", tags=["Booking", "demo"]),
+        FAQItem(id="b", question="Q2", answer="A2", tags=["auth"]),
+        FAQItem(id="c", question="Q3", answer="A3"),
+        FAQItem(id="d", question="Q4", answer="A4", tags=["booking"]),
+    ]
+    index = build_tag_index(faqs)
+    assert index["booking"].tolist() == [0, 3]
+    assert rows_for_tags(index, ["BOOKING", "auth"]).tolist() == [0, 1, 3]
+    assert rows_for_tags(index, ["unknown"]).size == 0
@@ -1,4 +1,4 @@
-from src.ai.faq.notify import FAQContext, send_handoff_email
+from src.ai.faq.notify import FAQContext, HandoffItem, send_handoff_digest, send_handoff_email
 from src.config.settings import Settings
 
 
@@ -41,3 +41,36 @@ def test_send_handoff_email_builds_and_sends(monkeypatch):
     assert DummySMTP.last_msg["To"] == "founder@local.test"
     assert "Handoff triggered" in DummySMTP.last_msg["Subject"]
     assert "User question:" in DummySMTP.last_msg.get_content()
+
+
+def test_send_handoff_digest_sends_one_message_for_many_items(monkeypatch):
+    import smtplib
+
+    sent = []
+
+    class CountingSMTP(DummySMTP):
+        def send_message(self, msg):
+            sent.append(msg)
+
+    monkeypatch.setattr(smtplib, "SMTP", CountingSMTP)
+
+    settings = Settings(
+        smtp_host="localhost",
+        smtp_port=1025,
+        smtp_from="bot@local.test",
+        handoff_to="founder@local.test",
+    )
+    items = [
+        HandoffItem(
+            user_question=f"Question {n}?",
+            top_faq=FAQContext(id=f"faq-00{n}", question="Q?", answer="A."),
+            score=0.3,
+        )
+        for n in range(3)
+    ]
+    assert send_handoff_digest(settings, items, threshold=0.6) is True
+    assert len(sent) == 1
+    assert "3 handoffs" in sent[0]["Subject"]
+    body = sent[0].get_content()
+    assert "Question 0?" in body and "Question 2?" in body
+    assert send_handoff_digest(settings, [], threshold=0.6) is False
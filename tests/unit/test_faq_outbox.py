@@ -0,0 +1,131 @@
+import asyncio
+import smtplib
+from email.message import EmailMessage
+
+import pytest
+
+from src.ai.faq.notify import SMTPConnection
+from src.ai.faq.outbox import HandoffOutbox, MemoryOutboxStore
+from src.config.settings import Settings
+
+SETTINGS = Settings(
+    smtp_host="localhost",
+    smtp_port=1025,
+    smtp_from="bot@local.test",
+    handoff_to="founder@local.test",
+)
+
+
+def _msg(n: int) -> EmailMessage:
+    m = EmailMessage()
+    m["Subject"] = f"handoff {n}"
+    m.set_content("body")
+    return m
+
+
+class FlakySMTP:
+    """Counts sessions; fails the first `fail_first` sends."""
+
+    opened = 0
+    sent: list[str] = []
+    fail_first = 0
+
+    def __init__(self, host, port):
+        FlakySMTP.opened += 1
+
+    def send_message(self, msg):
+        if FlakySMTP.fail_first > 0:
+            FlakySMTP.fail_first -= 1
+            raise smtplib.SMTPServerDisconnected("gone")
+        FlakySMTP.sent.append(msg["Subject"])
+
+    def noop(self):
+        return (250, b"OK")
+
+    def quit(self):
+        return None
+
+
+@pytest.fixture
+def flaky_smtp(monkeypatch):
+    FlakySMTP.opened, FlakySMTP.sent, FlakySMTP.fail_first = 0, [], 0
+    monkeypatch.setattr(smtplib, "SMTP", FlakySMTP)
+    return FlakySMTP
+
+
+def test_smtp_connection_reuses_one_session_and_reconnects_after_error(flaky_smtp):
+    conn = SMTPConnection(SETTINGS)
+    assert conn.send_many([_msg(1), _msg(2), _msg(3)]) == [None, None, None]
+    assert flaky_smtp.opened == 1
+
+    flaky_smtp.fail_first = 1
+    errors = conn.send_many([_msg(4), _msg(5)])
+    assert isinstance(errors[0], smtplib.SMTPServerDisconnected) and errors[1] is None
+    assert flaky_smtp.opened == 2  # dropped the broken session, reconnected for the next
+    conn.close()
+
+
+@pytest.mark.asyncio
+async def test_outbox_sends_batches_over_one_session(flaky_smtp):
+    outbox = HandoffOutbox(MemoryOutboxStore(), SMTPConnection(SETTINGS), batch_size=10)
+    for n in range(5):
+        assert await outbox.enqueue(_msg(n)) is True
+
+    assert await outbox.drain_once(wait_s=0) == 5
+    assert flaky_smtp.sent == [f"handoff {n}" for n in range(5)]
+    assert flaky_smtp.opened == 1
+    assert outbox.snapshot()["sent"] == 5
+
+
+@pytest.mark.asyncio
+async def test_outbox_retries_with_backoff_then_gives_up(flaky_smtp):
+    store = MemoryOutboxStore()
+    outbox = HandoffOutbox(
+        store, SMTPConnection(SETTINGS), max_attempts=2, backoff_base_s=0.0, poll_interval_s=0.05
+    )
+    flaky_smtp.fail_first = 3
+    await outbox.enqueue(_msg(1))
+
+    assert await outbox.drain_once() == 1  # attempt 1 fails -> rescheduled
+    assert outbox.stats.retried == 1
+    assert await outbox.drain_once() == 1  # attempt 2 fails -> max_attempts reached
+    assert outbox.stats.failed == 1
+    assert store.depth() == 0
+    assert flaky_smtp.sent == []
+
+
+@pytest.mark.asyncio
+async def test_memory_outbox_is_bounded():
+    outbox = HandoffOutbox(MemoryOutboxStore(max_size=1), SMTPConnection(SETTINGS))
+    assert await outbox.enqueue(_msg(1)) is True
+    assert await outbox.enqueue(_msg(2)) is False
+    assert outbox.snapshot()["dropped"] == 1
+
+
+@pytest.mark.asyncio
+async def test_stop_drains_pending_messages(flaky_smtp):
+    outbox = HandoffOutbox(MemoryOutboxStore(), SMTPConnection(SETTINGS), poll_interval_s=10)
+    outbox.start()
+    await outbox.enqueue(_msg(1))
+    await outbox.stop(timeout_s=1.0)
+    assert flaky_smtp.sent == ["handoff 1"]
+
+
+def test_restarted_outbox_waits_on_the_new_loop(flaky_smtp):
+    store = MemoryOutboxStore()
+    outbox = HandoffOutbox(store, SMTPConnection(SETTINGS), poll_interval_s=10)
+
+    async def lifespan(n: int) -> None:
+        outbox.start()
+        await asyncio.sleep(0.01)  # worker is now blocked in claim()
+        await outbox.enqueue(_msg(n))
+        for _ in range(100):
+            if len(flaky_smtp.sent) == n:
+                break
+            await asyncio.sleep(0.01)
+        await outbox.stop(timeout_s=1.0)
+
+    # e.g. two TestClient lifespans: each runs on its own event loop
+    asyncio.run(lifespan(1))
+    asyncio.run(lifespan(2))
+    assert flaky_smtp.sent == ["handoff 1", "handoff 2"]
@@ -3,7 +3,13 @@ import math
 import numpy as np
 import pytest
 
-from src.ai.faq.retriever import cosine_top1, score_from_cosine
+from src.ai.faq.retriever import (
+    cosine_top1,
+    cosine_top1_batch,
+    cosine_topk,
+    cosine_topk_batch,
+    score_from_cosine,
+)
 
 
 def test_cosine_top1_perfect_match():
@@ -69,3 +75,85 @@ def test_cosine_top1_handles_many_docs_fast():
     assert 0 <= idx < docs.shape[0]
     assert -1.0 <= cos <= 1.0
     assert not math.isnan(cos)
+
+
+def test_cosine_top1_batch_matches_single_query_path():
+    rng = np.random.default_rng(7)
+    docs = rng.normal(size=(50, 8)).astype("float32")
+    docs /= np.linalg.norm(docs, axis=1, keepdims=True)
+    qs = rng.normal(size=(5, 8)).astype("float32")
+    qs /= np.linalg.norm(qs, axis=1, keepdims=True)
+
+    idx, cos = cosine_top1_batch(qs, docs)
+    for i, q in enumerate(qs):
+        j, c = cosine_top1(q, docs)
+        assert idx[i] == j
+        assert cos[i] == pytest.approx(c, rel=1e-6)
+
+
+def test_cosine_topk_orders_best_first_and_matches_top1():
+    rng = np.random.default_rng(3)
+    docs = rng.normal(size=(200, 8)).astype("float32")
+    docs /= np.linalg.norm(docs, axis=1, keepdims=True)
+    q = docs[17]
+
+    hits = cosine_topk(q, docs, k=5)
+    assert len(hits) == 5
+    assert hits[0] == cosine_top1(q, docs)
+    scores = [c for _, c in hits]
+    assert scores == sorted(scores, reverse=True)
+    expected = np.argsort(-(docs @ q), kind="stable")[:5].tolist()
+    assert [i for i, _ in hits] == expected
+
+
+def test_cosine_topk_mask_restricts_rows_and_keeps_global_indices():
+    docs = np.eye(4, dtype="float32")
+    q = np.array([1.0, 0.0, 0.0, 0.0], dtype="float32")
+    # Best row (0) excluded by the mask -> only rows 2 and 3 are eligible
+    hits = cosine_topk(q, docs, k=3, mask=np.array([2, 3]))
+    assert [i for i, _ in hits] == [2, 3]
+    bool_hits = cosine_topk(q, docs, k=3, mask=np.array([False, False, True, True]))
+    assert bool_hits == hits
+    assert cosine_topk(q, docs, k=3, mask=np.array([], dtype=int)) == []
+
+
+def test_cosine_topk_batch_uses_per_query_k_and_mask():
+    docs = np.eye(3, dtype="float32")
+    qs = np.eye(3, dtype="float32")[:2]
+    out = cosine_topk_batch(qs, docs, ks=[1, 2], masks=[None, [0, 2]])
+    assert out[0] == [(0, 1.0)]
+    assert [i for i, _ in out[1]] == [0, 2]
+
+
+class _ScoredRows:
+    """Doc matrix that records which rows get scored; scoring all of them fails."""
+
+    def __init__(self, docs: np.ndarray) -> None:
+        self.docs = docs
+        self.scored: set[int] = set()
+
+    def __getitem__(self, rows):
+        self.scored.update(np.asarray(rows).tolist())
+        return self.docs[rows]
+
+    @property
+    def T(self):
+        raise AssertionError("scored the whole matrix")
+
+
+def test_cosine_topk_batch_never_scores_masked_out_rows():
+    rng = np.random.default_rng(0)
+    docs = rng.normal(size=(50, 8)).astype("float32")
+    docs /= np.linalg.norm(docs, axis=1, keepdims=True)
+    qs = docs[[1, 7, 30]]
+    masks = [[1, 2, 3], np.arange(50) % 10 == 7, [1, 2, 3]]
+    tracked = _ScoredRows(docs)
+
+    out = cosine_topk_batch(qs, tracked, ks=[2, 3, 1], masks=masks)
+
+    assert tracked.scored == {1, 2, 3, 7, 17, 27, 37, 47}
+    for q, k, m, hits in zip(qs, [2, 3, 1], masks, out, strict=True):
+        expected = cosine_topk(q, docs, k, mask=m)
+        assert [i for i, _ in hits] == [i for i, _ in expected]
+        assert [c for _, c in hits] == pytest.approx([c for _, c in expected], abs=1e-6)
+    assert [i for i, _ in out[1]][0] == 7
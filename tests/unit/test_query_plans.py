@@ -0,0 +1,90 @@
+import uuid
+from datetime import UTC, datetime
+
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.dialects.postgresql.asyncpg import dialect as asyncpg_dialect
+
+from src.api.routes.bookings import page_query
+from src.db.models.booking import Booking, BookingStatus
+from src.db.query_plans import Explain, prepared_sql, scans, seq_scans_over
+
+# Trimmed EXPLAIN (ANALYZE, FORMAT JSON) output: a limit over a backwards index scan
+# whose inner side is a seq scan that filters most of what it reads
+PLAN = {
+    "Node Type": "Limit",
+    "Actual Rows": 51,
+    "Actual Loops": 1,
+    "Plans": [
+        {
+            "Node Type": "Nested Loop",
+            "Actual Rows": 51,
+            "Actual Loops": 1,
+            "Plans": [
+                {
+                    "Node Type": "Index Scan",
+                    "Relation Name": "bookings",
+                    "Index Name": "ix_bookings_email_created_at_id",
+                    "Actual Rows": 51,
+                    "Actual Loops": 1,
+                },
+                {
+                    "Node Type": "Seq Scan",
+                    "Relation Name": "sentiment",
+                    "Actual Rows": 1,
+                    "Rows Removed by Filter": 99,
+                    "Actual Loops": 51,
+                },
+            ],
+        }
+    ],
+}
+
+
+def test_scans_count_rows_read_across_loops():
+    found = {s.relation: s for s in scans(PLAN)}
+    assert found["bookings"].index == "ix_bookings_email_created_at_id"
+    assert found["bookings"].rows == 51
+    assert found["sentiment"].rows == 100 * 51
+
+
+def test_seq_scans_over_threshold():
+    assert [s.relation for s in seq_scans_over(PLAN, 1_000)] == ["sentiment"]
+    assert seq_scans_over(PLAN, 10_000) == []
+    # Plain EXPLAIN has no actuals: fall back to the estimate
+    assert seq_scans_over({"Node Type": "Seq Scan", "Relation Name": "t", "Plan Rows": 5}, 4)
+
+
+def test_explain_wraps_statement_and_keeps_binds():
+    compiled = Explain(page_query(10, email="a@b.c")).compile(dialect=postgresql.dialect())
+    sql = str(compiled)
+    assert sql.startswith("EXPLAIN (ANALYZE, BUFFERS, FORMAT JSON) SELECT")
+    assert "a@b.c" in compiled.params.values()
+
+
+def test_every_list_filter_has_a_composite_index_ending_in_created_at_id():
+    indexes = {ix.name: ix for ix in Booking.__table__.indexes}
+    assert [c.name for c in indexes["ix_bookings_email_created_at_id"].columns] == [
+        "customer_email",
+        "created_at",
+        "id",
+    ]
+    # Not partial: a generic plan for "status = $1" can't use per-status partial indexes
+    ix = indexes["ix_bookings_status_created_at_id"]
+    assert [str(e) for e in ix.expressions] == ["bookings.status", "created_at DESC", "id DESC"]
+    assert not ix.dialect_options["postgresql"]["where"]
+
+
+def test_prepared_sql_keeps_dollar_params_and_renders_values():
+    key = (datetime(2026, 5, 1, tzinfo=UTC), uuid.UUID(int=7))
+    sql, args = prepared_sql(
+        page_query(20, key, email="o'neil@example.com", status_=BookingStatus.pending),
+        asyncpg_dialect(),
+    )
+    assert "bookings.status = $4::booking_status" in sql
+    assert args == [
+        "'2026-05-01T00:00:00+00:00'",
+        f"'{uuid.UUID(int=7)}'",
+        "'o''neil@example.com'",
+        "'pending'",
+        "'21'",
+    ]
@@ -0,0 +1,39 @@
+from datetime import UTC, datetime, timedelta, timezone
+
+from src.config.settings import Settings
+from src.db.sentiment_rollup import align, align_up, rollup_horizon
+
+
+def test_align_floors_to_utc_hour_and_day():
+    ts = datetime(2026, 3, 4, 15, 42, 7, 123, tzinfo=UTC)
+    assert align(ts, "hour") == datetime(2026, 3, 4, 15, tzinfo=UTC)
+    assert align(ts, "day") == datetime(2026, 3, 4, tzinfo=UTC)
+
+
+def test_align_treats_naive_as_utc_and_converts_offsets():
+    assert align(datetime(2026, 3, 4, 15, 42), "hour") == datetime(2026, 3, 4, 15, tzinfo=UTC)
+    plus2 = timezone(timedelta(hours=2))
+    # 01:30 at +02:00 is 23:30 UTC the previous day
+    assert align(datetime(2026, 3, 5, 1, 30, tzinfo=plus2), "day") == datetime(
+        2026, 3, 4, tzinfo=UTC
+    )
+
+
+def test_align_up_keeps_boundaries_and_ceils_the_rest():
+    boundary = datetime(2026, 3, 4, 15, tzinfo=UTC)
+    assert align_up(boundary, "hour") == boundary
+    assert align_up(boundary + timedelta(seconds=1), "hour") == boundary + timedelta(hours=1)
+    assert align_up(boundary, "day") == datetime(2026, 3, 5, tzinfo=UTC)
+
+
+def test_rollup_horizon_stays_behind_open_transactions():
+    now = datetime(2026, 3, 4, 15, tzinfo=UTC)
+    assert rollup_horizon(now, 30, None) == now - timedelta(seconds=30)
+    # A COPY that started 10 minutes ago commits rows stamped with its start time
+    long_xact = now - timedelta(minutes=10)
+    assert rollup_horizon(now, 30, long_xact) == long_xact
+    assert rollup_horizon(now, 30, now - timedelta(seconds=5)) == now - timedelta(seconds=30)
+
+
+def test_rollup_job_is_off_in_api_processes_by_default():
+    assert Settings().sentiment_rollup_interval_s is None
@@ -0,0 +1,96 @@
+import asyncio
+
+import pytest
+
+from src.common.ttl_cache import AsyncTTLCache
+
+
+class _Clock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.mark.asyncio
+async def test_concurrent_misses_share_one_load():
+    cache: AsyncTTLCache[int] = AsyncTTLCache(ttl_s=10)
+    calls = 0
+    gate = asyncio.Event()
+
+    async def load() -> int:
+        nonlocal calls
+        calls += 1
+        await gate.wait()
+        return 42
+
+    waiters = [asyncio.create_task(cache.get_or_load("k", load)) for _ in range(10)]
+    await asyncio.sleep(0)
+    gate.set()
+    assert await asyncio.gather(*waiters) == [42] * 10
+    assert calls == 1
+    assert cache.stats()["misses"] == 1 and cache.stats()["coalesced"] == 9
+
+
+@pytest.mark.asyncio
+async def test_entries_expire_after_ttl():
+    clock = _Clock()
+    cache: AsyncTTLCache[int] = AsyncTTLCache(ttl_s=5, clock=clock)
+    values = iter([1, 2])
+
+    async def load() -> int:
+        return next(values)
+
+    assert await cache.get_or_load("k", load) == 1
+    clock.now = 4.9
+    assert await cache.get_or_load("k", load) == 1
+    clock.now = 5.0
+    assert await cache.get_or_load("k", load) == 2
+    assert cache.stats()["hits"] == 1
+
+
+@pytest.mark.asyncio
+async def test_invalidate_drops_entries_and_in_flight_results():
+    cache: AsyncTTLCache[str] = AsyncTTLCache(ttl_s=60)
+    gate = asyncio.Event()
+
+    async def stale() -> str:
+        await gate.wait()
+        return "before-write"
+
+    async def fresh() -> str:
+        return "after-write"
+
+    old = asyncio.create_task(cache.get_or_load("k", stale))
+    await asyncio.sleep(0)
+    cache.invalidate()  # a write committed while the old load was running
+    assert await cache.get_or_load("k", fresh) == "after-write"
+    gate.set()
+    assert await old == "before-write"  # its own caller still gets an answer...
+    assert await cache.get_or_load("k", stale) == "after-write"  # ...but it wasn't cached
+
+
+@pytest.mark.asyncio
+async def test_failed_load_is_not_cached_and_caller_cancel_does_not_cancel_load():
+    cache: AsyncTTLCache[int] = AsyncTTLCache(ttl_s=60)
+
+    async def boom() -> int:
+        raise RuntimeError("db down")
+
+    with pytest.raises(RuntimeError):
+        await cache.get_or_load("k", boom)
+
+    gate = asyncio.Event()
+
+    async def slow() -> int:
+        await gate.wait()
+        return 7
+
+    first = asyncio.create_task(cache.get_or_load("k", slow))
+    await asyncio.sleep(0)
+    second = asyncio.create_task(cache.get_or_load("k", slow))
+    await asyncio.sleep(0)
+    first.cancel()
+    gate.set()
+    assert await second == 7
@@ -0,0 +1,124 @@
+from __future__ import annotations
+
+import asyncio
+
+import pytest
+from pydantic import ValidationError
+
+from src.ai.sentiment.write_behind import BufferFull, WriteBehindBuffer
+from src.config.settings import Settings
+
+
+class _Sink:
+    def __init__(self, fail_times: int = 0) -> None:
+        self.batches: list[list[dict]] = []
+        self.fail_times = fail_times
+        self.release = asyncio.Event()
+        self.release.set()
+
+    async def __call__(self, rows: list[dict]) -> None:
+        await self.release.wait()
+        if self.fail_times:
+            self.fail_times -= 1
+            raise RuntimeError("db down")
+        self.batches.append(rows)
+
+    @property
+    def rows(self) -> list[dict]:
+        return [r for b in self.batches for r in b]
+
+
+def _row(i: int) -> dict:
+    return {"id": i, "text": f"t{i}", "score": 0.0, "label": "neutral"}
+
+
+@pytest.mark.asyncio
+async def test_flushes_when_flush_rows_are_waiting():
+    sink = _Sink()
+    buf = WriteBehindBuffer(sink, flush_rows=3, flush_interval_ms=10_000)
+    buf.start()
+    for i in range(3):
+        await buf.submit(_row(i))
+    await asyncio.sleep(0.01)
+
+    assert [r["id"] for r in sink.rows] == [0, 1, 2]
+    assert len(sink.batches) == 1
+    await buf.stop()
+
+
+@pytest.mark.asyncio
+async def test_flushes_on_interval_and_wait_returns_after_commit():
+    sink = _Sink()
+    buf = WriteBehindBuffer(sink, flush_rows=100, flush_interval_ms=5)
+    buf.start()
+    await asyncio.wait_for(asyncio.gather(*(buf.submit(_row(i), wait=True) for i in range(4))), 1)
+
+    assert sorted(r["id"] for r in sink.rows) == [0, 1, 2, 3]
+    snap = buf.snapshot()
+    assert snap["written"] == 4 and snap["depth"] == 0
+    assert snap["flush_ms"]["count"] >= 1
+    await buf.stop()
+
+
+@pytest.mark.asyncio
+async def test_rejects_when_full():
+    buf = WriteBehindBuffer(_Sink(), max_rows=2, flush_rows=100, flush_interval_ms=10_000)
+    await buf.submit(_row(0))
+    await buf.submit(_row(1))
+    with pytest.raises(BufferFull):
+        await buf.submit(_row(2))
+    assert buf.snapshot()["rejected"] == 1
+    assert buf.snapshot()["high_water"] == 2
+
+
+@pytest.mark.asyncio
+async def test_failed_flush_is_retried_for_fire_and_forget_rows():
+    sink = _Sink(fail_times=1)
+    buf = WriteBehindBuffer(sink, flush_rows=10, flush_interval_ms=10_000, max_attempts=3)
+    for i in range(2):
+        await buf.submit(_row(i))
+
+    await buf.flush_once()  # fails, rows go back to the front
+    assert buf.depth() == 2 and buf.stats.retried == 2
+    await buf.flush_once()
+    assert [r["id"] for r in sink.rows] == [0, 1]
+
+
+@pytest.mark.asyncio
+async def test_failed_flush_fails_waiting_callers():
+    sink = _Sink(fail_times=1)
+    buf = WriteBehindBuffer(sink, flush_rows=10, flush_interval_ms=1)
+    buf.start()
+    with pytest.raises(RuntimeError, match="db down"):
+        await asyncio.wait_for(buf.submit(_row(0), wait=True), 1)
+    assert buf.stats.failed == 1 and buf.depth() == 0
+    await buf.stop()
+
+
+@pytest.mark.asyncio
+async def test_stop_drains_queued_and_in_flight_rows():
+    sink = _Sink()
+    sink.release.clear()
+    buf = WriteBehindBuffer(sink, flush_rows=2, flush_interval_ms=10_000)
+    buf.start()
+    for i in range(5):
+        await buf.submit(_row(i))
+    await asyncio.sleep(0.01)  # first batch is now stuck in the writer
+
+    stopping = asyncio.create_task(buf.stop())
+    await asyncio.sleep(0.01)
+    with pytest.raises(BufferFull):
+        await buf.submit(_row(99))
+    sink.release.set()
+    await stopping
+
+    assert sorted(r["id"] for r in sink.rows) == [0, 1, 2, 3, 4]
+    assert buf.depth() == 0
+
+
+def test_flush_interval_must_be_positive():
+    for bad in (0, -5):
+        with pytest.raises(ValidationError, match="sentiment_buffer_flush_ms"):
+            Settings(sentiment_buffer_flush_ms=bad)
+    # Constructed directly, the buffer floors it instead of busy-looping
+    assert WriteBehindBuffer(_Sink(), flush_interval_ms=0).flush_interval_s == 0.001